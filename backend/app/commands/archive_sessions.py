@@ -0,0 +1,27 @@
+"""Move transcripts of completed discovery sessions to cold storage.
+
+    python -m app.commands.archive_sessions                  # uses ARCHIVE_MIN_AGE_DAYS
+    python -m app.commands.archive_sessions <min_age_days>
+
+Safe to run repeatedly (e.g. from a nightly cron); already archived sessions are skipped.
+"""
+
+import sys
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.services.archive import archive_completed_sessions
+
+
+def main() -> None:
+    min_age_days = int(sys.argv[1]) if len(sys.argv) > 1 else get_settings().ARCHIVE_MIN_AGE_DAYS
+    db = SessionLocal()
+    try:
+        archived = archive_completed_sessions(db, min_age_days)
+        print(f"Archived {archived} session transcript(s).")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Export discovery data as a Parquet dataset for analysis (requires pyarrow).
+
+    python -m app.commands.export_analytics OUT_DIR              # all projects
+    python -m app.commands.export_analytics OUT_DIR <project_id> # one project
+
+Writes OUT_DIR/<table>/project_id=<id>/part-0.parquet for the sessions, messages,
+phase_summaries and flagged_items tables; see app.services.analytics_export.
+Existing files for an exported project are overwritten.
+"""
+
+import sys
+from pathlib import Path
+from uuid import UUID
+
+from app.config import get_settings
+from app.database import ReadSessionLocal, SessionLocal
+from app.services import analytics_export
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    if analytics_export.pa is None:
+        sys.exit("pyarrow is not installed; pip install pyarrow")
+    out_dir = Path(sys.argv[1])
+    project_id = UUID(sys.argv[2]) if len(sys.argv) > 2 else None
+    settings = get_settings()
+    db = (ReadSessionLocal or SessionLocal)()
+    try:
+        counts = analytics_export.write_dataset(
+            db,
+            out_dir,
+            project_id,
+            settings.EXPORT_BATCH_SIZE,
+            settings.ANALYTICS_EXPORT_BATCH_ROWS,
+        )
+        print("Exported " + ", ".join(f"{rows} {table}" for table, rows in counts.items()) + f" row(s) to {out_dir}.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""Rebuild the denormalized progress counters on projects.
+
+    python -m app.commands.reconcile_progress              # all projects
+    python -m app.commands.reconcile_progress <project_id> # one project
+"""
+
+import sys
+from uuid import UUID
+
+from app.database import SessionLocal
+from app.services.project import reconcile_project_progress
+
+
+def main() -> None:
+    project_id = UUID(sys.argv[1]) if len(sys.argv) > 1 else None
+    db = SessionLocal()
+    try:
+        updated = reconcile_project_progress(db, project_id)
+        db.commit()
+        print(f"Reconciled progress counters for {updated} project(s).")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
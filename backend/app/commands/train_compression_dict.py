@@ -0,0 +1,97 @@
+"""Train a zlib preset dictionary for compressed transcript/report columns.
+
+    python -m app.commands.train_compression_dict                 # sample from the database
+    python -m app.commands.train_compression_dict FILE [FILE ...] # train from text files
+
+Writes the next ``vN.dict`` into app/models/zdicts. Commit the file: every
+dictionary that has ever been used to write rows must keep shipping, since
+those rows reference it by version.
+"""
+
+import json
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+
+from sqlalchemy import select
+
+from app.models.types import ZDICT_DIR, latest_dictionary_version
+
+# zlib only looks back 32 KiB, so anything larger is wasted.
+DICT_SIZE = 32 * 1024
+SAMPLE_SESSIONS = 500
+
+# Structural fragments of the serialized columns; placed last so they sit closest to the data.
+_SKELETON = [
+    '[{"role":"assistant","content":"',
+    '"},{"role":"user","content":"',
+    '"},{"role":"assistant","content":"',
+    '{"phase":',
+    ',"mention":"',
+    '","user_input":"',
+]
+
+
+def train_dictionary(samples: list[str], size: int = DICT_SIZE) -> bytes:
+    """Build a preset dictionary from the most valuable repeated word n-grams in samples.
+
+    Candidates are scored by frequency * length; higher-scoring fragments are placed
+    later in the dictionary because zlib encodes nearer matches more cheaply.
+    """
+    counts: Counter[str] = Counter()
+    for sample in samples:
+        words = re.findall(r"\S+\s*", sample)
+        for n in range(2, 7):
+            for i in range(len(words) - n + 1):
+                counts["".join(words[i:i + n])] += 1
+
+    budget = size - sum(len(s.encode("utf-8")) for s in _SKELETON)
+    chosen: list[tuple[int, str]] = []
+    repeated = [(fragment, freq) for fragment, freq in counts.items() if freq >= 2]
+    for fragment, freq in sorted(repeated, key=lambda kv: kv[1] * len(kv[0]), reverse=True):
+        encoded_len = len(fragment.encode("utf-8"))
+        if encoded_len > budget:
+            continue
+        if any(fragment in existing for _, existing in chosen):
+            continue
+        chosen.append((freq * len(fragment), fragment))
+        budget -= encoded_len
+        if budget < 16:
+            break
+
+    chosen.sort()
+    return ("".join(fragment for _, fragment in chosen) + "".join(_SKELETON)).encode("utf-8")
+
+
+def _samples_from_db() -> list[str]:
+    from app.database import SessionLocal
+    from app.models.session import DiscoverySession, PhaseSummary
+
+    db = SessionLocal()
+    try:
+        transcripts = db.execute(select(DiscoverySession.all_messages).limit(SAMPLE_SESSIONS)).scalars().all()
+        summaries = db.execute(select(PhaseSummary.content).limit(SAMPLE_SESSIONS * 4)).scalars().all()
+    finally:
+        db.close()
+    samples = [json.dumps(messages, separators=(",", ":"), ensure_ascii=False) for messages in transcripts]
+    samples.extend(summaries)
+    return samples
+
+
+def main() -> None:
+    paths = sys.argv[1:]
+    samples = [Path(p).read_text(encoding="utf-8") for p in paths] if paths else _samples_from_db()
+    if not samples:
+        print("No samples found; nothing to train on.")
+        return
+    zdict = train_dictionary(samples)
+    version = latest_dictionary_version() + 1
+    out = ZDICT_DIR / f"v{version}.dict"
+    ZDICT_DIR.mkdir(exist_ok=True)
+    out.write_bytes(zdict)
+    print(f"Wrote {out} ({len(zdict)} bytes from {len(samples)} samples)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Response compression: brotli (the brotli package, in requirements.txt) when the client accepts it, else gzip.
+
+Transcripts, project details and reports are large, highly repetitive JSON and
+text, so they shrink several times over. Bodies below RESPONSE_COMPRESSION_MIN_BYTES
+are sent as-is, and event streams are never compressed (starlette's default
+exclusions), so SSE frames are not held back in a compressor buffer. Already
+compressed formats (ZIP, Parquet) are sent as-is too.
+"""
+
+import anyio.to_thread
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import DEFAULT_EXCLUDED_CONTENT_TYPES, GZipMiddleware, IdentityResponder
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+EXCLUDED_CONTENT_TYPES = DEFAULT_EXCLUDED_CONTENT_TYPES + ("application/vnd.apache.parquet",)
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """GZipMiddleware that prefers brotli ("br") when available."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        thread_minimum_size: int = 128 * 1024,
+    ) -> None:
+        super().__init__(
+            app,
+            minimum_size,
+            compresslevel=gzip_level,
+            thread_minimum_size=thread_minimum_size,
+            exclude_content_types=EXCLUDED_CONTENT_TYPES,
+        )
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and brotli is not None and "br" in Headers(scope=scope).get("Accept-Encoding", ""):
+            responder = BrotliResponder(
+                self.app,
+                self.minimum_size,
+                quality=self.brotli_quality,
+                thread_minimum_size=self.thread_minimum_size,
+                exclude_content_types=self.exclude_content_types,
+            )
+            await responder(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+class BrotliResponder(IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int,
+        quality: int = 4,
+        *,
+        thread_minimum_size: int = 128 * 1024,
+        exclude_content_types: tuple[str, ...] = EXCLUDED_CONTENT_TYPES,
+    ) -> None:
+        super().__init__(app, minimum_size, exclude_content_types=exclude_content_types)
+        self.quality = quality
+        self.thread_minimum_size = thread_minimum_size
+        self._compressor = None
+
+    async def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        if len(body) >= self.thread_minimum_size:
+            # Compressing large bodies inline would block the event loop.
+            return await anyio.to_thread.run_sync(self._compress_body, body, more_body)
+        return self._compress_body(body, more_body)
+
+    def _compress_body(self, body: bytes, more_body: bool) -> bytes:
+        if self._compressor is None:
+            self._compressor = brotli.Compressor(quality=self.quality)
+        if more_body:
+            return self._compressor.process(body) + self._compressor.flush()
+        return self._compressor.process(body) + self._compressor.finish()
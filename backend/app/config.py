@@ -19,9 +19,81 @@ class Settings(BaseSettings):
     )
 
     DATABASE_URL: str = "sqlite:///./xp_architect.db"
+    # Optional read replica for SA dashboard reads (a streaming replica, or a SQLite copy locally)
+    DATABASE_READ_URL: str | None = None
+    # Max replica lag served to clients; also how long a client's own writes pin its reads to the primary
+    READ_REPLICA_MAX_STALENESS_SECONDS: float = 2.0
+    READ_REPLICA_LAG_CHECK_INTERVAL_SECONDS: float = 1.0
     ANTHROPIC_API_KEY: str = ""
     SECRET_KEY: str = ""
     SENDGRID_API_KEY: str | None = None
+    # Local development convenience; deploys run `python -m app.migrations` once instead.
+    MIGRATE_ON_STARTUP: bool = False
+    # SQLite production mode (ignored for other databases)
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024
+    SQLITE_READ_POOL_SIZE: int = 8
+    SQLITE_SERIALIZED_WRITER: bool = True
+    SQLITE_WRITER_QUEUE_TIMEOUT_SECONDS: float = 30.0
+    # Write-behind cache for active sessions (app.services.hot_sessions). Per process: only
+    # enable with a single worker or sticky routing of stakeholders to workers.
+    HOT_SESSION_STORE_ENABLED: bool = False
+    HOT_SESSION_JOURNAL_DIR: str = "./journal"
+    HOT_SESSION_CAPACITY: int = 1000
+    HOT_SESSION_TTL_SECONDS: float = 300.0
+    HOT_SESSION_FLUSH_INTERVAL_SECONDS: float = 0.5
+    HOT_SESSION_MAX_PENDING_TURNS: int = 500
+    # Idempotency-Key handling for LLM-backed endpoints (app.services.idempotency)
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
+    IDEMPOTENCY_WAIT_SECONDS: float = 120.0
+    IDEMPOTENCY_STALE_SECONDS: float = 600.0
+    # Single-flight report generation across workers (app.services.report_flight)
+    REPORT_FLIGHT_WAIT_SECONDS: float = 180.0
+    REPORT_FLIGHT_STALE_SECONDS: float = 600.0
+    REPORT_FLIGHT_RESULT_TTL_SECONDS: float = 60.0
+    # Verified-token cache for the auth dependency (app.services.auth_cache); 0 disables it
+    AUTH_CACHE_TTL_SECONDS: float = 30.0
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    # bcrypt cost for new hashes (existing hashes are upgraded on login) and its worker pool
+    BCRYPT_ROUNDS: int = 12
+    BCRYPT_POOL_SIZE: int = 4
+    BCRYPT_MAX_QUEUE: int = 32
+    # Response compression (app.compression): brotli for clients that accept it, else gzip
+    RESPONSE_COMPRESSION_MIN_BYTES: int = 1024
+    RESPONSE_GZIP_LEVEL: int = 6
+    RESPONSE_BROTLI_QUALITY: int = 4
+    # Admission control for LLM-backed endpoints (app.services.admission); a rate of 0 disables that limit
+    LLM_USER_RATE_PER_MINUTE: float = 30.0
+    LLM_USER_BURST: int = 30
+    LLM_PROJECT_RATE_PER_MINUTE: float = 30.0
+    LLM_PROJECT_BURST: int = 20
+    LLM_MAX_IN_FLIGHT: int = 16
+    LLM_QUEUE_TIMEOUT_SECONDS: float = 10.0
+    LLM_SHED_QUEUE_SECONDS: float = 15.0
+    # SSE dashboard events (app.services.project_events)
+    PROJECT_EVENTS_POLL_INTERVAL_SECONDS: float = 1.0
+    PROJECT_EVENTS_HEARTBEAT_SECONDS: float = 15.0
+    PROJECT_EVENTS_RETRY_MS: int = 3000
+    PROJECT_EVENTS_QUEUE_SIZE: int = 256
+    PROJECT_EVENTS_REPLAY_LIMIT: int = 500
+    PROJECT_EVENTS_RETENTION_HOURS: float = 24.0
+    # Rows accepted per POST /api/projects/{id}/users:bulk request
+    PROJECT_USERS_BULK_MAX_ROWS: int = 1000
+    # Stakeholders read per batch by GET /api/projects/{id}/export
+    EXPORT_BATCH_SIZE: int = 100
+    # Rows per record batch (and Parquet row group) in analytics exports (app.services.analytics_export)
+    ANALYTICS_EXPORT_BATCH_ROWS: int = 10000
+    # Discovery chat over WebSocket (/api/session/ws): time allowed for the auth message
+    WS_AUTH_TIMEOUT_SECONDS: float = 10.0
+    # Request/SQL/LLM tracing (app.tracing): "" (off), "console" or "file"; needs requirements-tracing.txt
+    TRACING_EXPORTER: str = ""
+    TRACING_FILE: str = "./traces.jsonl"
+    TRACING_SERVICE_NAME: str = "xp-architect-api"
+    # Cold storage for completed transcripts (must be a persistent volume in production)
+    ARCHIVE_DIR: str = "./archive"
+    ARCHIVE_SEGMENT_MAX_BYTES: int = 64 * 1024 * 1024
+    ARCHIVE_MIN_AGE_DAYS: int = 7
 
 
 @lru_cache
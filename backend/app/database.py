@@ -1,34 +1,248 @@
 """Database connection and session management for FastAPI."""
 
+import hashlib
+import threading
+import time
 from collections.abc import Generator
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from fastapi import Request
+from sqlalchemy import Engine, create_engine, event, text
+from sqlalchemy.orm import Session, SessionTransaction, sessionmaker
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.sql.elements import TextClause
 
-from app.config import get_settings
-from app.models import Base
+from app.config import Settings, get_settings
 
 
 settings = get_settings()
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
-    echo=False,
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def _sqlite_pragmas(settings: Settings):
+    """Return a connect listener applying the production SQLite pragmas."""
+
+    def on_connect(dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+        # Negative cache_size is in KiB rather than pages
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+        cursor.close()
+
+    return on_connect
+
+
+def build_engines(url: str, settings: Settings) -> tuple[Engine, Engine | None]:
+    """Return (engine, writer_engine).
+
+    For SQLite, engine is a pool of reader connections and writer_engine is a
+    single-connection pool that every write is routed through, so writers in this
+    process queue on the pool instead of failing with "database is locked".
+    writer_engine is None for other databases (or when SQLITE_SERIALIZED_WRITER is off).
+    """
+    if not _is_sqlite(url):
+        return create_engine(url, echo=False), None
+
+    connect_args = {
+        "check_same_thread": False,
+        "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+    }
+    engine = create_engine(
+        url,
+        connect_args=connect_args,
+        pool_size=settings.SQLITE_READ_POOL_SIZE,
+        echo=False,
+    )
+    event.listen(engine, "connect", _sqlite_pragmas(settings))
+    if not settings.SQLITE_SERIALIZED_WRITER or ":memory:" in url:
+        return engine, None
+
+    writer_engine = create_engine(
+        url,
+        connect_args=connect_args,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=settings.SQLITE_WRITER_QUEUE_TIMEOUT_SECONDS,
+        echo=False,
+    )
+    event.listen(writer_engine, "connect", _sqlite_pragmas(settings))
+    return engine, writer_engine
+
+
+class RoutingSession(Session):
+    """Session that sends writes, and every statement after the first write, to writer_engine.
+
+    Reads before the first write use the default bind. Once a transaction writes it
+    stays on the writer so it reads its own writes; the flag resets when the
+    transaction ends. Without a writer engine this behaves like a plain Session.
+    """
+
+    def __init__(self, *args, writer: Engine | None = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.writer = writer
+        self.wrote = False
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or _is_write(clause):
+            self.wrote = True
+        if self.wrote and self.writer is not None:
+            return self.writer
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+def _is_write(clause) -> bool:
+    if isinstance(clause, UpdateBase):
+        return True
+    if isinstance(clause, TextClause):
+        return not clause.text.lstrip().upper().startswith(("SELECT", "WITH", "PRAGMA", "EXPLAIN"))
+    return False
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _record_client_write(session: RoutingSession) -> None:
+    client_key = session.info.get("client_key")
+    if session.wrote and client_key:
+        _recent_writes.record(client_key)
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _reset_writer_routing(session: RoutingSession, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:
+        session.wrote = False
+
+
+class _RecentWrites:
+    """Per-client time of the last committed write, so a client's reads can follow its writes.
+
+    Process-local: a write handled by one worker does not pin reads served by another,
+    which is covered by the replica lag bound (READ_REPLICA_MAX_STALENESS_SECONDS).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._last_write: dict[str, float] = {}
+
+    def record(self, client_key: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._last_write[client_key] = now
+            if len(self._last_write) > 10_000:
+                cutoff = now - settings.READ_REPLICA_MAX_STALENESS_SECONDS
+                self._last_write = {k: t for k, t in self._last_write.items() if t >= cutoff}
+
+    def wrote_within(self, client_key: str, seconds: float) -> bool:
+        last = self._last_write.get(client_key)
+        return last is not None and time.monotonic() - last < seconds
+
+
+_recent_writes = _RecentWrites()
+
+
+class _ReplicaLag:
+    """Cached replication lag of the read replica, in seconds (inf if it cannot be measured)."""
+
+    # Zero when the replica has replayed everything it received, so an idle primary isn't reported as lag.
+    _POSTGRES_LAG_SQL = text(
+        "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+        "THEN 0 ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+    )
+
+    def __init__(self, replica: Engine, check_interval: float) -> None:
+        self.replica = replica
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._checked_at = float("-inf")
+        self._lag = float("inf")
+
+    def _measure(self) -> float:
+        if self.replica.dialect.name != "postgresql":
+            # SQLite copies for local testing have no replication to measure.
+            return 0.0
+        try:
+            with self.replica.connect() as conn:
+                return float(conn.execute(self._POSTGRES_LAG_SQL).scalar() or 0.0)
+        except Exception as e:
+            print(f"[database] replica lag check failed: {e}")
+            return float("inf")
+
+    def seconds(self) -> float:
+        with self._lock:
+            if time.monotonic() - self._checked_at >= self.check_interval:
+                self._lag = self._measure()
+                self._checked_at = time.monotonic()
+            return self._lag
+
+
+engine, writer_engine = build_engines(settings.DATABASE_URL, settings)
+replica_engine = build_engines(settings.DATABASE_READ_URL, settings)[0] if settings.DATABASE_READ_URL else None
+
+# expire_on_commit=False: handlers build responses from objects they just committed;
+# expiring them would force a SELECT per object after every commit.
+SessionLocal = sessionmaker(
+    class_=RoutingSession,
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    bind=engine,
+    writer=writer_engine,
+)
+
+# Reads go to the replica; any write in the same session still goes to the primary.
+ReadSessionLocal = sessionmaker(
+    class_=RoutingSession,
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    bind=replica_engine,
+    writer=writer_engine or engine,
+) if replica_engine is not None else None
+
+_replica_lag = (
+    _ReplicaLag(replica_engine, settings.READ_REPLICA_LAG_CHECK_INTERVAL_SECONDS)
+    if replica_engine is not None
+    else None
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def _client_key(request: Request) -> str | None:
+    authorization = request.headers.get("authorization")
+    if not authorization:
+        return None
+    return hashlib.sha256(authorization.encode("utf-8")).hexdigest()
 
 
-def get_db() -> Generator[Session, None, None]:
+def get_db(request: Request) -> Generator[Session, None, None]:
     """FastAPI dependency that yields a database session and closes it after the request."""
     db = SessionLocal()
+    db.info["client_key"] = _client_key(request)
     try:
         yield db
     finally:
         db.close()
 
 
-def create_all_tables() -> None:
-    """Create all tables defined on Base (idempotent). Call on application startup."""
-    Base.metadata.create_all(bind=engine)
+def get_read_db(request: Request) -> Generator[Session, None, None]:
+    """Like get_db, but serves reads from DATABASE_READ_URL when it is safe to.
+
+    Falls back to the primary when no replica is configured, when the replica lags
+    by more than READ_REPLICA_MAX_STALENESS_SECONDS, or when this client committed a
+    write within that window (read-your-writes).
+    """
+    client_key = _client_key(request)
+    tolerance = settings.READ_REPLICA_MAX_STALENESS_SECONDS
+    use_replica = (
+        ReadSessionLocal is not None
+        and not (client_key and _recent_writes.wrote_within(client_key, tolerance))
+        and _replica_lag.seconds() <= tolerance
+    )
+    db = ReadSessionLocal() if use_replica else SessionLocal()
+    db.info["client_key"] = client_key
+    try:
+        yield db
+    finally:
+        db.close()
@@ -1,56 +1,135 @@
-"""XP Architect API - FastAPI application."""
+"""XP Architect API - FastAPI application.
 
+create_app() builds the application; the module-level ``app`` is what uvicorn and
+gunicorn load (app.main:app). Startup is kept short so new containers take traffic
+sooner: the schema check runs before the first request, while warm-up (the first
+database connection, importing anthropic and building its client) runs in the
+background. /health answers as soon as the process is up; /ready answers 503 until
+warm-up has finished. /metrics serves Prometheus metrics (app.metrics) and requests
+are traced when TRACING_EXPORTER is set (app.tracing).
+"""
+
+import asyncio
+import time
 from contextlib import asynccontextmanager
+from pathlib import Path
 
-from fastapi import FastAPI
+import anyio.to_thread
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from sqlalchemy import text
 
-from app.database import create_all_tables, engine
+from app.compression import CompressionMiddleware
+from app.config import get_settings
+from app.database import SessionLocal, engine
+from app.metrics import MetricsMiddleware, install_db_metrics, metrics
 from app.routers import auth, projects, sessions
+from app.services.hot_sessions import get_hot_session_store
+from app.tracing import TracingMiddleware, configure_tracing
 
+_DB_RETRY_SECONDS = 1.0
 
-# Auto-migrate: add first_dashboard_visit_at column if missing
-from sqlalchemy import text
-from app.database import engine
 
-try:
-    with engine.connect() as conn:
-        conn.execute(text('ALTER TABLE users ADD COLUMN IF NOT EXISTS first_dashboard_visit_at TIMESTAMP'))
-        conn.execute(text('ALTER TABLE projects ADD COLUMN IF NOT EXISTS consolidated_report TEXT'))
-        conn.execute(text('ALTER TABLE projects ADD COLUMN IF NOT EXISTS consolidated_report_generated_at TIMESTAMP WITH TIME ZONE'))
-        conn.commit()
-    print("Migration check complete")
-except Exception as e:
-    print(f"Migration note: {e}")
+def _warm_up() -> None:
+    """Connect to the database (retrying until it answers) and build the LLM client."""
+    from app.services.discovery import warm_up_client
+
+    while True:
+        try:
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+            break
+        except Exception as e:
+            print(f"[main] Warm-up: database not reachable yet: {e}")
+            time.sleep(_DB_RETRY_SECONDS)
+    try:
+        warm_up_client()
+    except Exception as e:
+        # LLM calls report their own errors; don't keep the instance out of rotation for it.
+        print(f"[main] Warm-up: could not build the Anthropic client: {e}")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Create database tables on startup."""
-    create_all_tables()
-    yield
+    """Verify the schema version on startup (migrations run once per deploy, not per worker), then warm up."""
+    from app.migrations import ensure_schema_current, run_migrations
 
+    settings = get_settings()
+    if settings.MIGRATE_ON_STARTUP:
+        run_migrations(engine)
+    else:
+        ensure_schema_current(engine)
+    if settings.HOT_SESSION_STORE_ENABLED:
+        from app.services.hot_sessions import recover_journals
 
-app = FastAPI(
-    title="XP Architect API",
-    lifespan=lifespan,
-)
+        replayed = recover_journals(SessionLocal, Path(settings.HOT_SESSION_JOURNAL_DIR))
+        if replayed:
+            print(f"[main] Replayed {replayed} journaled turns from a previous run")
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+    started = time.monotonic()
 
-app.include_router(auth.router)
-app.include_router(projects.router)
-app.include_router(sessions.router)
+    async def warm_up() -> None:
+        await anyio.to_thread.run_sync(_warm_up)
+        app.state.ready = True
+        print(f"[main] Ready after {time.monotonic() - started:.2f}s of warm-up")
+
+    warm_up_task = asyncio.create_task(warm_up())
+    yield
+    warm_up_task.cancel()
+    hot_store = get_hot_session_store()
+    if hot_store is not None:
+        hot_store.close()
+        get_hot_session_store.cache_clear()
 
 
-@app.get("/health")
 def health():
-    """Health check endpoint."""
+    """Health check endpoint (liveness: the process is up)."""
     return {"status": "ok"}
+
+
+def ready(request: Request):
+    """Readiness endpoint: 200 once startup warm-up has finished, 503 before."""
+    if not getattr(request.app.state, "ready", False):
+        return JSONResponse({"status": "starting"}, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+    return {"status": "ready"}
+
+
+def create_app() -> FastAPI:
+    """Build the FastAPI application with its middleware and routes."""
+    settings = get_settings()
+    configure_tracing(settings)
+    install_db_metrics()
+    app = FastAPI(
+        title="XP Architect API",
+        lifespan=lifespan,
+    )
+    app.state.ready = False
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.RESPONSE_COMPRESSION_MIN_BYTES,
+        gzip_level=settings.RESPONSE_GZIP_LEVEL,
+        brotli_quality=settings.RESPONSE_BROTLI_QUALITY,
+    )
+    # Outermost, so latency includes compression and the span covers the whole request.
+    app.add_middleware(TracingMiddleware)
+    app.add_middleware(MetricsMiddleware)
+
+    app.include_router(auth.router)
+    app.include_router(projects.router)
+    app.include_router(sessions.router)
+    app.add_api_route("/health", health, methods=["GET"])
+    app.add_api_route("/ready", ready, methods=["GET"])
+    app.add_api_route("/metrics", metrics, methods=["GET"], include_in_schema=False)
+    return app
+
+
+app = create_app()
@@ -0,0 +1,258 @@
+"""Prometheus metrics, served by GET /metrics in the text exposition format.
+
+- http_request_duration_seconds{method,route,status}: histogram per route template
+  (unmatched paths share route="<unmatched>"), plus http_requests_in_flight;
+- db_statement_duration_seconds{operation}: SQL statement time by verb;
+- db_pool_connections{engine,state}: size, checked out and overflow of each pool;
+- llm_request_duration_seconds{operation,outcome} and llm_tokens_total{operation,direction};
+- the counters of the in-process caches and pools (auth cache, bcrypt pool, LLM
+  admission, SSE broker, hot session store) as <component>_<stat> gauges.
+
+Values are per process. Under gunicorn each scrape is answered by one worker, so
+run one worker per container (or scrape each) when exact numbers matter.
+Written against the exposition format directly since prometheus_client is not a
+dependency.
+"""
+
+import math
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+
+from sqlalchemy import Engine, event
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Latency histogram keyed by label values; thread-safe."""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...], buckets: tuple[float, ...]) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # label values -> [count per bucket..., count above the last bucket, sum]
+        self._series: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            snapshot = sorted((key, list(series)) for key, series in self._series.items())
+        for label_values, series in snapshot:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), series[:-1]):
+                cumulative += count
+                le = f'le="{_number(float(bound))}"'
+                yield f"{self.name}_bucket{_labels(self.labels, label_values, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labels, label_values)} {_number(series[-1])}"
+            yield f"{self.name}_count{_labels(self.labels, label_values)} {cumulative}"
+
+
+class Counter:
+    """Monotonic counter keyed by label values; thread-safe."""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...]) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float, *label_values: str) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            snapshot = sorted(self._values.items())
+        for label_values, value in snapshot:
+            yield f"{self.name}{_labels(self.labels, label_values)} {_number(value)}"
+
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Time to serve an HTTP request, until the response body is sent.",
+    ("method", "route", "status"),
+    LATENCY_BUCKETS,
+)
+db_statement_duration = Histogram(
+    "db_statement_duration_seconds",
+    "Time spent executing SQL statements.",
+    ("operation",),
+    DB_BUCKETS,
+)
+llm_request_duration = Histogram(
+    "llm_request_duration_seconds",
+    "Time spent in Anthropic API calls.",
+    ("operation", "outcome"),
+    LATENCY_BUCKETS,
+)
+llm_tokens = Counter(
+    "llm_tokens_total",
+    "Tokens used by Anthropic API calls.",
+    ("operation", "direction"),
+)
+
+_in_flight = 0
+_in_flight_lock = threading.Lock()
+_db_listeners_installed = False
+
+
+def observe_llm_usage(operation: str, usage) -> None:
+    """Count the input and output tokens of an Anthropic response's usage."""
+    if usage is None:
+        return
+    llm_tokens.inc(getattr(usage, "input_tokens", 0) or 0, operation, "input")
+    llm_tokens.inc(getattr(usage, "output_tokens", 0) or 0, operation, "output")
+
+
+def _statement_started(conn, cursor, statement, parameters, context, executemany) -> None:
+    context._metrics_started = time.perf_counter()
+
+
+def _statement_finished(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = getattr(context, "_metrics_started", None)
+    if started is not None:
+        operation = statement.lstrip()[:16].split(None, 1)[0].upper() if statement.strip() else "SQL"
+        db_statement_duration.observe(time.perf_counter() - started, operation)
+
+
+def install_db_metrics() -> None:
+    """Time every SQL statement run through any engine in this process (once)."""
+    global _db_listeners_installed
+    if _db_listeners_installed:
+        return
+    event.listen(Engine, "before_cursor_execute", _statement_started)
+    event.listen(Engine, "after_cursor_execute", _statement_finished)
+    _db_listeners_installed = True
+
+
+def _gauge(name: str, help: str, samples: list[tuple[str, float]]) -> Iterable[str]:
+    yield f"# HELP {name} {help}"
+    yield f"# TYPE {name} gauge"
+    for labels, value in samples:
+        yield f"{name}{labels} {_number(value)}"
+
+
+def _pool_samples() -> list[tuple[str, float]]:
+    from app.database import engine, replica_engine, writer_engine
+
+    samples = []
+    for label, pool_engine in (("primary", engine), ("writer", writer_engine), ("replica", replica_engine)):
+        if pool_engine is None:
+            continue
+        pool = pool_engine.pool
+        for state, method in (("size", "size"), ("checked_out", "checkedout"), ("overflow", "overflow")):
+            measure = getattr(pool, method, None)
+            if measure is not None:
+                samples.append((_labels(("engine", "state"), (label, state)), measure()))
+    return samples
+
+
+def _component_stats() -> list[tuple[str, Callable[[], dict[str, float]]]]:
+    from app.services.admission import get_llm_admission
+    from app.services.auth_cache import auth_cache
+    from app.services.hot_sessions import get_hot_session_store
+    from app.services.password_pool import get_password_pool
+    from app.services.project_events import get_event_broker
+
+    components = [
+        ("auth_cache", auth_cache.stats),
+        ("password_pool", get_password_pool().stats),
+        ("llm_admission", get_llm_admission().stats),
+        ("project_events", get_event_broker().stats),
+    ]
+    hot_store = get_hot_session_store()
+    if hot_store is not None:
+        components.append(("hot_sessions", hot_store.stats))
+    return components
+
+
+def render() -> str:
+    """All metrics of this process in the Prometheus text format."""
+    lines: list[str] = []
+    for metric in (http_request_duration, db_statement_duration, llm_request_duration, llm_tokens):
+        lines.extend(metric.render())
+    lines.extend(_gauge("http_requests_in_flight", "HTTP requests being served.", [("", _in_flight)]))
+    lines.extend(_gauge("db_pool_connections", "Connections of each database pool by state.", _pool_samples()))
+    for component, stats in _component_stats():
+        for stat, value in stats().items():
+            lines.extend(_gauge(f"{component}_{stat}", f"{component} stats()['{stat}'].", [("", value)]))
+    return "\n".join(lines) + "\n"
+
+
+def metrics() -> Response:
+    """Prometheus scrape endpoint (this worker's metrics)."""
+    return Response(render(), media_type=CONTENT_TYPE)
+
+
+class MetricsMiddleware:
+    """Record the latency of each HTTP request under its route template."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        global _in_flight
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        with _in_flight_lock:
+            _in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            with _in_flight_lock:
+                _in_flight -= 1
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "<unmatched>"
+            http_request_duration.observe(
+                time.perf_counter() - started, scope["method"], route_path, str(status_code)
+            )
@@ -0,0 +1,384 @@
+"""Versioned schema migrations.
+
+Run once per deploy, before the web workers start:
+
+    python -m app.migrations
+
+Applied versions are recorded in the ``schema_version`` table. Web workers never
+run DDL themselves; on startup they only compare the recorded version against
+LATEST_VERSION (see ensure_schema_current).
+"""
+
+import json
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    Engine,
+    Integer,
+    LargeBinary,
+    MetaData,
+    String,
+    Table,
+    Text,
+    func,
+    inspect,
+    bindparam,
+    select,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateIndex
+
+from app.models import Base
+from app.models.types import CompressedJSON, CompressedText, decompress, is_compressed
+
+# Arbitrary constant used for pg_advisory_xact_lock so concurrent deploys serialize.
+_ADVISORY_LOCK_ID = 7_406_221
+
+_version_metadata = MetaData()
+
+schema_version = Table(
+    "schema_version",
+    _version_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime(timezone=True), nullable=False),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    """A single schema migration step."""
+
+    version: int
+    description: str
+    upgrade: Callable[[Connection], None]
+
+
+MIGRATIONS: list[Migration] = []
+
+
+def migration(version: int, description: str) -> Callable[[Callable[[Connection], None]], Callable[[Connection], None]]:
+    """Register an upgrade function as the given schema version."""
+
+    def decorator(fn: Callable[[Connection], None]) -> Callable[[Connection], None]:
+        MIGRATIONS.append(Migration(version=version, description=description, upgrade=fn))
+        return fn
+
+    return decorator
+
+
+# ---------------------------------------------------------------------------
+# Helpers (idempotent so a migration can run against any pre-versioning database)
+# ---------------------------------------------------------------------------
+
+
+def _column_exists(conn: Connection, table_name: str, column_name: str) -> bool:
+    return any(col.get("name") == column_name for col in inspect(conn).get_columns(table_name))
+
+
+def _add_column(conn: Connection, table_name: str, column: Column) -> None:
+    """ALTER TABLE ... ADD COLUMN unless the column already exists."""
+    if _column_exists(conn, table_name, column.name):
+        return
+    col_type = column.type.compile(dialect=conn.dialect)
+    ddl = f"ALTER TABLE {table_name} ADD COLUMN {column.name} {col_type}"
+    if column.server_default is not None:
+        ddl += f" DEFAULT {column.server_default.arg}"
+    if not column.nullable:
+        ddl += " NOT NULL"
+    conn.execute(text(ddl))
+
+
+def _create_indexes(conn: Connection, table_name: str, names: list[str]) -> None:
+    """Create the named indexes declared on the model's table unless they already exist."""
+    table = Base.metadata.tables[table_name]
+    for index in table.indexes:
+        if index.name in names:
+            conn.execute(CreateIndex(index, if_not_exists=True))
+
+
+def _compress_column(conn: Connection, table_name: str, column_name: str, column_type) -> None:
+    """Convert a text/JSON column to compressed bytes in place, in batches keyed by id."""
+    if not _column_exists(conn, table_name, column_name):
+        return  # Dropped by a later migration (fresh database)
+    if conn.dialect.name == "postgresql":
+        col = next(c for c in inspect(conn).get_columns(table_name) if c["name"] == column_name)
+        if not isinstance(col["type"], LargeBinary):
+            conn.execute(text(
+                f"ALTER TABLE {table_name} ALTER COLUMN {column_name} TYPE BYTEA "
+                f"USING convert_to({column_name}::text, 'UTF8')"
+            ))
+
+    first_batch = text(f"SELECT id, {column_name} FROM {table_name} ORDER BY id LIMIT 200")
+    next_batch = text(
+        f"SELECT id, {column_name} FROM {table_name} WHERE id > :last_id ORDER BY id LIMIT 200"
+    )
+    update_row = text(f"UPDATE {table_name} SET {column_name} = :value WHERE id = :id").bindparams(
+        bindparam("value", type_=LargeBinary)
+    )
+    last_id = None
+    while True:
+        if last_id is None:
+            rows = conn.execute(first_batch).all()
+        else:
+            rows = conn.execute(next_batch, {"last_id": last_id}).all()
+        if not rows:
+            break
+        for row_id, raw in rows:
+            last_id = row_id
+            if raw is None or is_compressed(raw):
+                continue
+            raw_text = raw if isinstance(raw, str) else bytes(raw).decode("utf-8")
+            value = json.loads(raw_text) if isinstance(column_type, CompressedJSON) else raw_text
+            conn.execute(update_row, {"value": column_type.process_bind_param(value, conn.dialect), "id": row_id})
+
+
+def _convert_to_jsonb(conn: Connection, table_name: str, column_name: str) -> None:
+    """Postgres only: convert a JSON/text or compressed-bytes column to JSONB in place."""
+    if not _column_exists(conn, table_name, column_name):
+        return  # Dropped by a later migration (fresh database)
+    col = next(c for c in inspect(conn).get_columns(table_name) if c["name"] == column_name)
+    if isinstance(col["type"], JSONB):
+        return
+    if not isinstance(col["type"], LargeBinary):
+        conn.execute(text(
+            f"ALTER TABLE {table_name} ALTER COLUMN {column_name} TYPE JSONB USING {column_name}::text::jsonb"
+        ))
+        return
+
+    # Compressed bytes can only be decoded in Python: copy into a new column, then swap.
+    staging = f"{column_name}_jsonb"
+    _add_column(conn, table_name, Column(staging, JSONB, nullable=True))
+    first_batch = text(f"SELECT id, {column_name} FROM {table_name} ORDER BY id LIMIT 200")
+    next_batch = text(
+        f"SELECT id, {column_name} FROM {table_name} WHERE id > :last_id ORDER BY id LIMIT 200"
+    )
+    update_row = text(f"UPDATE {table_name} SET {staging} = :value WHERE id = :id").bindparams(
+        bindparam("value", type_=JSONB)
+    )
+    last_id = None
+    while True:
+        if last_id is None:
+            rows = conn.execute(first_batch).all()
+        else:
+            rows = conn.execute(next_batch, {"last_id": last_id}).all()
+        if not rows:
+            break
+        for row_id, raw in rows:
+            last_id = row_id
+            if raw is not None:
+                conn.execute(update_row, {"value": json.loads(decompress(bytes(raw))), "id": row_id})
+    conn.execute(text(f"ALTER TABLE {table_name} DROP COLUMN {column_name}"))
+    conn.execute(text(f"ALTER TABLE {table_name} RENAME COLUMN {staging} TO {column_name}"))
+    if not col["nullable"]:
+        conn.execute(text(f"ALTER TABLE {table_name} ALTER COLUMN {column_name} SET NOT NULL"))
+
+
+# ---------------------------------------------------------------------------
+# Migrations
+# ---------------------------------------------------------------------------
+
+
+@migration(1, "baseline schema")
+def _baseline(conn: Connection) -> None:
+    Base.metadata.create_all(bind=conn)
+
+
+@migration(2, "dashboard visit and consolidated report columns")
+def _dashboard_and_report_columns(conn: Connection) -> None:
+    _add_column(conn, "users", Column("first_dashboard_visit_at", DateTime(timezone=True), nullable=True))
+    _add_column(conn, "projects", Column("consolidated_report", Text, nullable=True))
+    _add_column(conn, "projects", Column("consolidated_report_generated_at", DateTime(timezone=True), nullable=True))
+
+
+@migration(3, "indexes for hot project-user, project and email lookups")
+def _hot_lookup_indexes(conn: Connection) -> None:
+    _create_indexes(conn, "project_users", [
+        "ix_project_users_project_id_user_id",
+        "ix_project_users_user_id_status",
+        "ix_project_users_project_id_invited_email_lower",
+    ])
+    _create_indexes(conn, "projects", ["ix_projects_created_by_created_at"])
+    _create_indexes(conn, "users", ["ix_users_email_lower"])
+
+
+@migration(4, "denormalized progress counters on projects")
+def _project_progress_counters(conn: Connection) -> None:
+    from app.services.project import reconcile_project_progress
+
+    for name in ("progress_total_users", "progress_not_started", "progress_in_progress", "progress_completed"):
+        _add_column(conn, "projects", Column(name, Integer, server_default="0", nullable=False))
+    reconcile_project_progress(Session(bind=conn))
+
+
+@migration(5, "compress transcript, phase summary and consolidated report columns")
+def _compress_large_columns(conn: Connection) -> None:
+    _compress_column(conn, "discovery_sessions", "all_messages", CompressedJSON())
+    _compress_column(conn, "discovery_sessions", "phase_summaries", CompressedJSON())
+    _compress_column(conn, "projects", "consolidated_report", CompressedText())
+
+
+@migration(6, "cold-storage archive pointers on discovery sessions")
+def _session_archive_columns(conn: Connection) -> None:
+    _add_column(conn, "discovery_sessions", Column("archived_at", DateTime(timezone=True), nullable=True))
+    _add_column(conn, "discovery_sessions", Column("archive_segment", String(64), nullable=True))
+    _add_column(conn, "discovery_sessions", Column("archive_offset", BigInteger, nullable=True))
+    _add_column(conn, "discovery_sessions", Column("archive_length", Integer, nullable=True))
+
+
+@migration(7, "JSONB document columns with GIN indexes on Postgres")
+def _jsonb_document_columns(conn: Connection) -> None:
+    if conn.dialect.name != "postgresql":
+        return
+    _convert_to_jsonb(conn, "discovery_sessions", "phase_summaries")
+    _convert_to_jsonb(conn, "discovery_sessions", "flagged_items")
+    _convert_to_jsonb(conn, "users", "style_profile")
+    _create_indexes(conn, "discovery_sessions", [
+        "ix_discovery_sessions_phase_summaries_gin",
+        "ix_discovery_sessions_flagged_items_gin",
+    ])
+
+
+@migration(8, "phase_summaries table replacing the phase_summaries JSON column")
+def _phase_summaries_table(conn: Connection) -> None:
+    from app.models.session import PhaseSummaryStatus
+
+    table = Base.metadata.tables["phase_summaries"]
+    table.create(bind=conn, checkfirst=True)
+    if not _column_exists(conn, "discovery_sessions", "phase_summaries"):
+        return
+
+    # Legacy layout: {"<phase>": approved text, "<phase>_pending": draft}; values may also be {"content": ...}.
+    first_batch = text("SELECT id, phase_summaries FROM discovery_sessions ORDER BY id LIMIT 200")
+    next_batch = text(
+        "SELECT id, phase_summaries FROM discovery_sessions WHERE id > :last_id ORDER BY id LIMIT 200"
+    )
+    last_id = None
+    while True:
+        if last_id is None:
+            rows = conn.execute(first_batch).all()
+        else:
+            rows = conn.execute(next_batch, {"last_id": last_id}).all()
+        if not rows:
+            break
+        inserts = []
+        for session_id, raw in rows:
+            last_id = session_id
+            if raw is None:
+                continue
+            if isinstance(raw, (dict, list)):
+                summaries = raw
+            elif isinstance(raw, str):
+                summaries = json.loads(raw)
+            else:
+                summaries = json.loads(decompress(bytes(raw)))
+            by_phase: dict[int, tuple[PhaseSummaryStatus, str]] = {}
+            for key, value in (summaries or {}).items():
+                phase_str, _, suffix = str(key).partition("_")
+                content = value.get("content") if isinstance(value, dict) else value
+                if not phase_str.isdigit() or not 1 <= int(phase_str) <= 4 or not isinstance(content, str):
+                    continue
+                phase = int(phase_str)
+                if suffix == "pending":
+                    by_phase.setdefault(phase, (PhaseSummaryStatus.PENDING, content))
+                else:
+                    by_phase[phase] = (PhaseSummaryStatus.APPROVED, content)
+            for phase, (summary_status, content) in by_phase.items():
+                inserts.append({
+                    "session_id": session_id if isinstance(session_id, uuid.UUID) else uuid.UUID(str(session_id)),
+                    "phase": phase,
+                    "status": summary_status,
+                    "version": 1,
+                    "content": content,
+                })
+        if inserts:
+            conn.execute(table.insert(), inserts)
+
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("DROP INDEX IF EXISTS ix_discovery_sessions_phase_summaries_gin"))
+    conn.execute(text("ALTER TABLE discovery_sessions DROP COLUMN phase_summaries"))
+
+
+@migration(9, "idempotency_keys table")
+def _idempotency_keys_table(conn: Connection) -> None:
+    Base.metadata.tables["idempotency_keys"].create(bind=conn, checkfirst=True)
+
+
+@migration(10, "report_generations table")
+def _report_generations_table(conn: Connection) -> None:
+    Base.metadata.tables["report_generations"].create(bind=conn, checkfirst=True)
+
+
+@migration(11, "project_events outbox table")
+def _project_events_table(conn: Connection) -> None:
+    Base.metadata.tables["project_events"].create(bind=conn, checkfirst=True)
+
+
+LATEST_VERSION = max(m.version for m in MIGRATIONS)
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+
+def get_schema_version(conn: Connection) -> int:
+    """Return the highest applied schema version, or 0 for an unversioned database."""
+    if not inspect(conn).has_table(schema_version.name):
+        return 0
+    return conn.execute(select(func.max(schema_version.c.version))).scalar() or 0
+
+
+def run_migrations(engine: Engine) -> int:
+    """Apply all pending migrations, each in its own transaction. Returns the resulting version."""
+    _version_metadata.create_all(bind=engine)
+    current = 0
+    for m in sorted(MIGRATIONS, key=lambda m: m.version):
+        with engine.begin() as conn:
+            if conn.dialect.name == "postgresql":
+                conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": _ADVISORY_LOCK_ID})
+            current = get_schema_version(conn)
+            if m.version <= current:
+                continue
+            print(f"Applying migration {m.version}: {m.description}")
+            m.upgrade(conn)
+            conn.execute(
+                schema_version.insert().values(
+                    version=m.version,
+                    description=m.description,
+                    applied_at=datetime.now(timezone.utc),
+                )
+            )
+            current = m.version
+    return current
+
+
+def ensure_schema_current(engine: Engine) -> None:
+    """Cheap startup check for web workers. Raise if migrations have not been applied."""
+    with engine.connect() as conn:
+        current = get_schema_version(conn)
+    if current < LATEST_VERSION:
+        raise RuntimeError(
+            f"Database schema is at version {current}, expected {LATEST_VERSION}. "
+            "Run `python -m app.migrations` before starting the app."
+        )
+
+
+def main() -> None:
+    from app.database import engine
+
+    version = run_migrations(engine)
+    print(f"Database schema at version {version}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,18 +5,33 @@ Import order ensures relationships resolve correctly.
 
 from app.models.base import Base
 from app.models.user import User, UserRole
-from app.models.project import Project, ProjectFile, ProjectUser, ProjectUserStatus
-from app.models.session import DiscoverySession, SessionDocument, SessionStatus
+from app.models.project import Project, ProjectEvent, ProjectFile, ProjectUser, ProjectUserStatus
+from app.models.session import (
+    DiscoverySession,
+    PhaseSummary,
+    PhaseSummaryStatus,
+    SessionDocument,
+    SessionStatus,
+)
+from app.models.idempotency import IdempotencyKey, IdempotencyKeyState
+from app.models.report_generation import ReportGeneration, ReportGenerationState
 
 __all__ = [
     "Base",
     "User",
     "UserRole",
     "Project",
+    "ProjectEvent",
     "ProjectFile",
     "ProjectUser",
     "ProjectUserStatus",
     "DiscoverySession",
+    "IdempotencyKey",
+    "IdempotencyKeyState",
+    "PhaseSummary",
+    "PhaseSummaryStatus",
+    "ReportGeneration",
+    "ReportGenerationState",
     "SessionDocument",
     "SessionStatus",
 ]
@@ -0,0 +1,78 @@
+"""IdempotencyKey model: stored outcomes of requests sent with an Idempotency-Key header."""
+
+import enum
+import uuid
+from datetime import datetime
+
+from sqlalchemy import (
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+from app.models.types import CompressedText
+
+
+class IdempotencyKeyState(str, enum.Enum):
+    """Whether the keyed request is still running or has a stored response."""
+
+    IN_PROGRESS = "IN_PROGRESS"
+    COMPLETED = "COMPLETED"
+
+
+class IdempotencyKey(Base):
+    """One client-supplied key per user and endpoint, claimed before the work runs."""
+
+    __tablename__ = "idempotency_keys"
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "endpoint", "key", name="uq_idempotency_keys_user_id_endpoint_key"),
+        Index("ix_idempotency_keys_created_at", "created_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    endpoint: Mapped[str] = mapped_column(
+        String(128),
+        nullable=False,
+    )
+    key: Mapped[str] = mapped_column(
+        String(255),
+        nullable=False,
+    )
+    # sha256 of the request payload; reusing a key with a different payload is rejected
+    request_hash: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+    )
+    state: Mapped[IdempotencyKeyState] = mapped_column(
+        Enum(IdempotencyKeyState),
+        default=IdempotencyKeyState.IN_PROGRESS,
+        nullable=False,
+    )
+    response_body: Mapped[str | None] = mapped_column(
+        CompressedText,
+        nullable=True,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+    )
+    completed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
@@ -1,4 +1,4 @@
-"""Project, ProjectFile, and ProjectUser models for discovery session application."""
+"""Project, ProjectFile, ProjectUser, and ProjectEvent models for discovery session application."""
 
 import enum
 import uuid
@@ -6,6 +6,8 @@ from datetime import date, datetime
 from typing import TYPE_CHECKING
 
 from sqlalchemy import (
+    JSON,
+    BigInteger,
     Date,
     DateTime,
     Enum,
@@ -14,11 +16,13 @@ from sqlalchemy import (
     Integer,
     String,
     Text,
+    func,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
+from app.models.types import CompressedText
 
 if TYPE_CHECKING:
     from app.models.session import DiscoverySession
@@ -39,6 +43,10 @@ class Project(Base):
 
     __tablename__ = "projects"
 
+    __table_args__ = (
+        Index("ix_projects_created_by_created_at", "created_by", "created_at"),
+    )
+
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
@@ -78,14 +86,42 @@ class Project(Base):
         default=datetime.utcnow,
         nullable=False,
     )
+    # Deferred: only the consolidated-report endpoint reads it, not project lists/details.
     consolidated_report: Mapped[str | None] = mapped_column(
-        Text,
+        CompressedText,
         nullable=True,
+        deferred=True,
     )
     consolidated_report_generated_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True),
         nullable=True,
     )
+    # Denormalized discovery progress counters, maintained transactionally by
+    # app.services.project (see reconcile_project_progress to rebuild them).
+    progress_total_users: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+    )
+    progress_not_started: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+    )
+    progress_in_progress: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+    )
+    progress_completed: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+    )
 
     # Relationships
     created_by_user: Mapped["User"] = relationship(
@@ -157,6 +193,8 @@ class ProjectUser(Base):
 
     __table_args__ = (
         Index("ix_project_users_status", "status"),
+        Index("ix_project_users_project_id_user_id", "project_id", "user_id"),
+        Index("ix_project_users_user_id_status", "user_id", "status"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -216,4 +254,52 @@ class ProjectUser(Base):
         "DiscoverySession",
         back_populates="project_user",
         uselist=False,
+        cascade="all, delete-orphan",
+    )
+
+
+# Functional index for case-insensitive invite lookups in add_user_to_project
+Index(
+    "ix_project_users_project_id_invited_email_lower",
+    ProjectUser.project_id,
+    func.lower(ProjectUser.invited_email),
+)
+
+
+class ProjectEvent(Base):
+    """Outbox of dashboard events for a project (session status changes, phase approvals, reports).
+
+    Written in the same transaction as the change it describes; ids increase, so they double
+    as the SSE event id and the cursor each worker reads from.
+    """
+
+    __tablename__ = "project_events"
+
+    __table_args__ = (
+        Index("ix_project_events_project_id_id", "project_id", "id"),
+        Index("ix_project_events_created_at", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+    )
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    type: Mapped[str] = mapped_column(
+        String(32),
+        nullable=False,
+    )
+    data: Mapped[dict] = mapped_column(
+        JSON,
+        nullable=False,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=datetime.utcnow,
+        nullable=False,
     )
@@ -0,0 +1,69 @@
+"""ReportGeneration model: cross-worker lock and short-lived result for one report generation."""
+
+import enum
+import uuid
+from datetime import datetime
+
+from sqlalchemy import (
+    DateTime,
+    Enum,
+    Index,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+from app.models.types import CompressedText
+
+
+class ReportGenerationState(str, enum.Enum):
+    """Whether the generation is still running or its report is stored."""
+
+    IN_PROGRESS = "IN_PROGRESS"
+    COMPLETED = "COMPLETED"
+
+
+class ReportGeneration(Base):
+    """One report generation per subject (e.g. a session's final report) and input hash."""
+
+    __tablename__ = "report_generations"
+
+    __table_args__ = (
+        UniqueConstraint("subject", "input_hash", name="uq_report_generations_subject_input_hash"),
+        Index("ix_report_generations_completed_at", "completed_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+    # e.g. "final-report:<session id>" or "consolidated-report:<project id>"
+    subject: Mapped[str] = mapped_column(
+        String(128),
+        nullable=False,
+    )
+    # sha256 of the generation inputs
+    input_hash: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+    )
+    state: Mapped[ReportGenerationState] = mapped_column(
+        Enum(ReportGenerationState),
+        default=ReportGenerationState.IN_PROGRESS,
+        nullable=False,
+    )
+    content: Mapped[str | None] = mapped_column(
+        CompressedText,
+        nullable=True,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+    )
+    completed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
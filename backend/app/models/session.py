@@ -6,6 +6,7 @@ from datetime import datetime
 from typing import TYPE_CHECKING, Any
 
 from sqlalchemy import (
+    BigInteger,
     CheckConstraint,
     DateTime,
     Enum,
@@ -14,11 +15,13 @@ from sqlalchemy import (
     Integer,
     JSON,
     String,
+    UniqueConstraint,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
+from app.models.types import CompressedJSON, CompressedText
 
 
 class SessionStatus(str, enum.Enum):
@@ -40,6 +43,14 @@ class DiscoverySession(Base):
             name="ck_discovery_sessions_current_phase_range",
         ),
         Index("ix_discovery_sessions_status", "status"),
+        # Postgres only: GIN index for containment (flag by phase) filters;
+        # see app.services.session_queries.
+        Index(
+            "ix_discovery_sessions_flagged_items_gin",
+            "flagged_items",
+            postgresql_using="gin",
+            postgresql_ops={"flagged_items": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -64,17 +75,12 @@ class DiscoverySession(Base):
         nullable=False,
     )
     all_messages: Mapped[list[Any]] = mapped_column(
-        JSON,
+        CompressedJSON,
         default=lambda: [],
         nullable=False,
     )
-    phase_summaries: Mapped[dict[str, Any]] = mapped_column(
-        JSON,
-        default=lambda: {},
-        nullable=False,
-    )
     flagged_items: Mapped[list[Any]] = mapped_column(
-        JSON,
+        JSON().with_variant(JSONB(), "postgresql"),
         default=lambda: [],
         nullable=False,
     )
@@ -86,6 +92,24 @@ class DiscoverySession(Base):
         DateTime(timezone=True),
         nullable=True,
     )
+    # Set when the transcript has been moved to cold storage (see app.services.archive);
+    # all_messages is then emptied and the transcript lives at segment/offset/length.
+    archived_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+    archive_segment: Mapped[str | None] = mapped_column(
+        String(64),
+        nullable=True,
+    )
+    archive_offset: Mapped[int | None] = mapped_column(
+        BigInteger,
+        nullable=True,
+    )
+    archive_length: Mapped[int | None] = mapped_column(
+        Integer,
+        nullable=True,
+    )
 
     # Relationships
     project_user: Mapped["ProjectUser"] = relationship(
@@ -95,6 +119,81 @@ class DiscoverySession(Base):
     documents: Mapped[list["SessionDocument"]] = relationship(
         "SessionDocument",
         back_populates="session",
+        cascade="all, delete-orphan",
+    )
+    summaries: Mapped[list["PhaseSummary"]] = relationship(
+        "PhaseSummary",
+        back_populates="session",
+        cascade="all, delete-orphan",
+        order_by="PhaseSummary.phase",
+    )
+
+
+class PhaseSummaryStatus(str, enum.Enum):
+    """Approval state of a phase summary."""
+
+    PENDING = "PENDING"
+    APPROVED = "APPROVED"
+
+
+class PhaseSummary(Base):
+    """Summary of one phase of a discovery session (one row per session and phase).
+
+    Starts PENDING when generated; each requested revision bumps version; approval
+    sets status to APPROVED.
+    """
+
+    __tablename__ = "phase_summaries"
+
+    __table_args__ = (
+        UniqueConstraint("session_id", "phase", name="uq_phase_summaries_session_id_phase"),
+        CheckConstraint("phase >= 1 AND phase <= 4", name="ck_phase_summaries_phase_range"),
+        # Covers "approved phases per session" without touching content
+        Index("ix_phase_summaries_session_id_status_phase", "session_id", "status", "phase"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+    session_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("discovery_sessions.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    phase: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+    )
+    status: Mapped[PhaseSummaryStatus] = mapped_column(
+        Enum(PhaseSummaryStatus),
+        default=PhaseSummaryStatus.PENDING,
+        nullable=False,
+    )
+    version: Mapped[int] = mapped_column(
+        Integer,
+        default=1,
+        nullable=False,
+    )
+    content: Mapped[str] = mapped_column(
+        CompressedText,
+        nullable=False,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=datetime.utcnow,
+        nullable=False,
+    )
+    approved_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
+    # Relationships
+    session: Mapped["DiscoverySession"] = relationship(
+        "DiscoverySession",
+        back_populates="summaries",
     )
 
 
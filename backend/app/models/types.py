@@ -0,0 +1,101 @@
+"""Custom column types: transparently compressed text and JSON.
+
+Values are stored as ``MAGIC + dictionary version + zlib stream``. The zlib stream
+is primed with a preset dictionary trained on discovery transcripts (see
+app.commands.train_compression_dict), which matters for the many short-to-medium
+transcripts where plain zlib has little history to work with. Dictionaries are
+versioned files in ``zdicts/``; new values always use the latest, and the version
+byte lets older rows keep decoding after a retrain.
+"""
+
+import json
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+_MAGIC = b"\xc5"
+_COMPRESSION_LEVEL = 6
+ZDICT_DIR = Path(__file__).resolve().parent / "zdicts"
+
+
+@lru_cache
+def _dictionaries() -> dict[int, bytes]:
+    """Return {version: preset dictionary} for every vN.dict file shipped in ZDICT_DIR."""
+    return {int(path.stem[1:]): path.read_bytes() for path in ZDICT_DIR.glob("v*.dict")}
+
+
+def latest_dictionary_version() -> int:
+    """Version used for new values (0 means no preset dictionary)."""
+    return max(_dictionaries(), default=0)
+
+
+def compress(data: bytes) -> bytes:
+    """Compress bytes with the latest preset dictionary."""
+    version = latest_dictionary_version()
+    if version:
+        compressor = zlib.compressobj(_COMPRESSION_LEVEL, zdict=_dictionaries()[version])
+    else:
+        compressor = zlib.compressobj(_COMPRESSION_LEVEL)
+    return _MAGIC + bytes([version]) + compressor.compress(data) + compressor.flush()
+
+
+def decompress(blob: bytes) -> bytes:
+    """Inverse of compress(). Bytes without the magic prefix are returned unchanged (legacy rows)."""
+    if not blob.startswith(_MAGIC):
+        return blob
+    version = blob[1]
+    if version:
+        decompressor = zlib.decompressobj(zdict=_dictionaries()[version])
+    else:
+        decompressor = zlib.decompressobj()
+    return decompressor.decompress(blob[2:]) + decompressor.flush()
+
+
+def is_compressed(value: Any) -> bool:
+    """True if a raw column value is already in compressed form."""
+    return isinstance(value, (bytes, memoryview)) and bytes(value[:1]) == _MAGIC
+
+
+def _raw_to_bytes(value: Any) -> bytes:
+    """Normalize a raw DB value (bytes, memoryview, or legacy text) to decompressed bytes."""
+    if isinstance(value, str):
+        return value.encode("utf-8")
+    return decompress(bytes(value))
+
+
+class CompressedText(TypeDecorator):
+    """Text column stored as compressed bytes."""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: str | None, dialect) -> bytes | None:
+        if value is None:
+            return None
+        return compress(value.encode("utf-8"))
+
+    def process_result_value(self, value: Any, dialect) -> str | None:
+        if value is None:
+            return None
+        return _raw_to_bytes(value).decode("utf-8")
+
+
+class CompressedJSON(TypeDecorator):
+    """JSON column stored as compressed bytes. Values must be reassigned (not mutated in place) to persist."""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect) -> bytes | None:
+        if value is None:
+            return None
+        return compress(json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+
+    def process_result_value(self, value: Any, dialect) -> Any:
+        if value is None:
+            return None
+        return json.loads(_raw_to_bytes(value))
@@ -5,8 +5,8 @@ import uuid
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import Boolean, DateTime, Enum, JSON, String
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Boolean, DateTime, Enum, Index, JSON, String, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -48,7 +48,7 @@ class User(Base):
         nullable=False,
     )
     style_profile: Mapped[dict[str, Any] | None] = mapped_column(
-        JSON,
+        JSON().with_variant(JSONB(), "postgresql"),
         nullable=True,
     )
     assessment_completed: Mapped[bool] = mapped_column(
@@ -76,3 +76,7 @@ class User(Base):
         "ProjectUser",
         back_populates="user",
     )
+
+
+# Functional index for case-insensitive email lookups (the plain email index can't serve lower(email))
+Index("ix_users_email_lower", func.lower(User.email))
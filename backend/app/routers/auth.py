@@ -1,8 +1,12 @@
 """Authentication routes: register, login, me."""
 
+import uuid
 from datetime import datetime, timezone
 
+import anyio.to_thread
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload
 
 from app.database import get_db
@@ -12,8 +16,9 @@ from app.schemas.user import TokenWithUser, UserCreate, UserLogin, UserResponse
 from app.services.auth import (
     create_access_token,
     get_current_user_dependency,
-    hash_password,
-    verify_password,
+    hash_password_async,
+    password_needs_rehash,
+    verify_password_async,
 )
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
@@ -31,37 +36,72 @@ def user_to_response(user: User) -> UserResponse:
     )
 
 
-@router.post("/register", response_model=UserResponse)
-def register(
-    body: UserCreate,
-    db: Session = Depends(get_db),
-) -> UserResponse:
-    """Create a new user. If invite_token is provided, validate it and link user to project."""
-    print(f"DEBUG register: role={body.role}, invite_token={body.invite_token}")
-    existing = db.query(User).filter(User.email == body.email).first()
-    if existing:
+def _check_registration(db: Session, email: str, invite_token: str | None) -> ProjectUser | None:
+    """The unused ProjectUser for invite_token, if given; 400 if the email is taken or the invite is unusable.
+
+    Runs before the password is hashed, so a duplicate registration costs no bcrypt work.
+    With an invite, both checks are one query.
+    """
+    email_taken = select(User.id).where(User.email == email).exists()
+    project_user = None
+    if invite_token:
+        row = db.execute(
+            select(ProjectUser, email_taken).where(ProjectUser.invite_token == invite_token)
+        ).first()
+        if row is not None:
+            project_user, taken = row
+        else:
+            taken = False
+    else:
+        taken = db.scalar(select(email_taken))
+    if taken:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
+    if invite_token and not project_user:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid or expired invite token",
+        )
+    if project_user and project_user.user_id is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invite token already used",
+        )
+    return project_user
 
-    project_user = None
-    if body.invite_token:
-        project_user = (
-            db.query(ProjectUser)
-            .filter(ProjectUser.invite_token == body.invite_token)
-            .first()
+
+def _create_user(db: Session, user: User, project_user: ProjectUser | None) -> None:
+    """Insert user, activating project_user's invite if given; 400 if the email was taken meanwhile."""
+    db.add(user)
+
+    if project_user:
+        project_user.user_id = user.id
+        project_user.status = ProjectUserStatus.ACTIVE
+        project_user.activated_at = datetime.now(timezone.utc)
+
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered",
         )
-        if not project_user:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid or expired invite token",
-            )
-        if project_user.user_id is not None:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invite token already used",
-            )
+
+
+@router.post("/register", response_model=UserResponse)
+async def register(
+    body: UserCreate,
+    db: Session = Depends(get_db),
+) -> UserResponse:
+    """Create a new user. If invite_token is provided, validate it and link user to project.
+
+    Async so that waiting for bcrypt holds no request thread; database work runs in the threadpool.
+    """
+    print(f"DEBUG register: role={body.role}, invite_token={body.invite_token}")
+    project_user = await anyio.to_thread.run_sync(_check_registration, db, body.email, body.invite_token)
 
     name = (body.name or "").strip()
     if not name and project_user and project_user.invited_name:
@@ -79,22 +119,17 @@ def register(
         else:
             role = UserRole.STAKEHOLDER
 
+    # Ids and timestamps are client-generated, so no flush/refresh round-trips are needed;
+    # a duplicate email that slips past the check in a race is caught by the unique constraint.
     user = User(
+        id=uuid.uuid4(),
         email=body.email,
-        password_hash=hash_password(body.password),
+        password_hash=await hash_password_async(body.password),
         name=name,
         role=role,
+        created_at=datetime.now(timezone.utc),
     )
-    db.add(user)
-    db.flush()
-
-    if body.invite_token and project_user:
-        project_user.user_id = user.id
-        project_user.status = ProjectUserStatus.ACTIVE
-        project_user.activated_at = datetime.now(timezone.utc)
-
-    db.commit()
-    db.refresh(user)
+    await anyio.to_thread.run_sync(_create_user, db, user, project_user)
     return user_to_response(user)
 
 
@@ -124,18 +159,29 @@ def get_invite_details(token: str, db: Session = Depends(get_db)):
     }
 
 
+def _user_by_email(db: Session, email: str) -> User | None:
+    return db.query(User).filter(User.email == email).first()
+
+
 @router.post("/login", response_model=TokenWithUser)
-def login(
+async def login(
     body: UserLogin,
     db: Session = Depends(get_db),
 ) -> TokenWithUser:
-    """Login with email and password. Returns JWT access token and user object."""
-    user = db.query(User).filter(User.email == body.email).first()
-    if not user or not verify_password(body.password, user.password_hash):
+    """Login with email and password. Returns JWT access token and user object.
+
+    Async so that waiting for bcrypt holds no request thread; database work runs in the threadpool.
+    """
+    user = await anyio.to_thread.run_sync(_user_by_email, db, body.email)
+    if not user or not await verify_password_async(body.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
         )
+    if password_needs_rehash(user.password_hash):
+        # Move the stored hash to the configured cost while we have the plain password.
+        user.password_hash = await hash_password_async(body.password)
+        await anyio.to_thread.run_sync(db.commit)
     return TokenWithUser(
         access_token=create_access_token(user.id),
         token_type="bearer",
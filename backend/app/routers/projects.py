@@ -1,18 +1,26 @@
 """Project management routes for Solution Architects. All routes require SA role."""
 
+import csv
+import io
 from datetime import datetime, timezone
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.config import get_settings
+from app.database import ReadSessionLocal, SessionLocal, get_db, get_read_db
 from app.dependencies import require_sa_role
-from app.models.project import Project, ProjectUser
+from app.models.project import Project, ProjectUser, ProjectUserStatus
 from app.models.session import DiscoverySession, SessionStatus
 from app.models.user import User
 from app.schemas.project import (
     ConsolidatedReportResponse,
+    FlaggedItemResponse,
+    PhaseApprovalsResponse,
     ProjectCreate,
     ProjectDetailResponse,
     ProjectListResponse,
@@ -21,19 +29,35 @@ from app.schemas.project import (
     ProjectUpdate,
     ProjectUserAdd,
     ProjectUserResponse,
+    ProjectUsersBulkAdd,
+    ProjectUsersBulkResponse,
     StakeholderDiscoveryResultsResponse,
 )
 from app.services.project import (
     activate_project_user,
     add_user_to_project,
+    bulk_add_users_to_project,
     create_project,
+    get_completed_project_users,
     get_project,
     get_project_progress,
+    get_project_user_responses,
+    get_project_user_with_session,
     get_user_projects,
     project_user_to_response,
+    record_project_user_removed,
     update_project,
 )
+from app.services import analytics_export
+from app.services.admission import llm_admission_dependency
 from app.services.discovery import generate_consolidated_report, generate_final_report
+from app.services.export import export_ndjson, export_zip
+from app.services.hot_sessions import get_hot_session_store
+from app.services.idempotency import run_idempotent
+from app.services.phase_summary import get_approved_summaries, get_approved_summaries_by_session
+from app.services.project_events import event_stream, record_event
+from app.services.report_flight import coalesce_generation, consolidated_report_subject, final_report_subject
+from app.services.session_queries import find_flagged_items, phase_approval_counts, users_with_phase_approved
 
 router = APIRouter(prefix="/api/projects", tags=["projects"])
 
@@ -55,7 +79,7 @@ def project_to_response(p: Project) -> ProjectResponse:
 
 @router.get("", response_model=ProjectListResponse)
 def list_projects(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_sa_role),
 ) -> ProjectListResponse:
     """List all projects created by the current SA with progress stats."""
@@ -63,7 +87,7 @@ def list_projects(
     project_responses: list[ProjectResponse] = []
 
     for p in projects:
-        progress = get_project_progress(db, p.id)
+        progress = get_project_progress(p)
         completion_percentage = (
             round(progress.completed / progress.total_users * 100, 1)
             if progress.total_users > 0
@@ -102,7 +126,7 @@ def create_project_route(
 @router.get("/{project_id}", response_model=ProjectDetailResponse)
 def get_project_detail(
     project_id: UUID,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_sa_role),
 ) -> ProjectDetailResponse:
     """Get project details including users list and completion stats."""
@@ -117,8 +141,8 @@ def get_project_detail(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found",
         )
-    users = [project_user_to_response(pu) for pu in project.project_users]
-    progress = get_project_progress(db, project_id)
+    users = get_project_user_responses(db, project_id)
+    progress = get_project_progress(project)
     return ProjectDetailResponse(
         project=project_to_response(project),
         users=users,
@@ -177,6 +201,72 @@ def add_user_to_project_route(
     return project_user_to_response(project_user)
 
 
+async def _bulk_users_body(request: Request) -> list[ProjectUserAdd]:
+    """Parse a bulk add body: JSON {"users": [{"email", "name"}, ...]} or CSV with email and name columns."""
+    body = await request.body()
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    try:
+        if content_type == "text/csv":
+            reader = csv.DictReader(io.StringIO(body.decode("utf-8-sig")))
+            columns = {(c or "").strip().lower(): c for c in reader.fieldnames or []}
+            if "email" not in columns:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="CSV must have a header row with an email column",
+                )
+            users = [
+                ProjectUserAdd(
+                    email=row.get(columns["email"]) or "",
+                    name=(row.get(columns["name"]) if "name" in columns else None) or "",
+                )
+                for row in reader
+            ]
+        else:
+            users = ProjectUsersBulkAdd.model_validate_json(body).users
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="CSV must be UTF-8")
+    except csv.Error as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid CSV: {e}")
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=jsonable_encoder(e.errors(include_url=False)),
+        )
+    max_rows = get_settings().PROJECT_USERS_BULK_MAX_ROWS
+    if len(users) > max_rows:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {max_rows} users per request",
+        )
+    return users
+
+
+@router.post("/{project_id}/users:bulk", response_model=ProjectUsersBulkResponse)
+def bulk_add_users_to_project_route(
+    project_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_sa_role),
+    users: list[ProjectUserAdd] = Depends(_bulk_users_body),
+) -> ProjectUsersBulkResponse:
+    """Add many users to the project in one transaction, from JSON or text/csv; returns a result per row.
+
+    Each row follows the rules of POST /users: existing users are linked as ACTIVE, others are
+    invited, and users already on the project are reported as "existing".
+    """
+    project = db.get(Project, project_id)
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found",
+        )
+    if project.created_by != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not the project owner",
+        )
+    return bulk_add_users_to_project(db, project_id, users)
+
+
 @router.post("/{project_id}/users/{user_id}/activate", response_model=ProjectUserResponse)
 def activate_user_route(
     project_id: UUID,
@@ -202,14 +292,13 @@ def activate_user_route(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project user not found",
         )
-    db.refresh(project_user)
     return project_user_to_response(project_user)
 
 
 @router.get("/{project_id}/progress", response_model=ProjectProgressResponse)
 def get_progress_route(
     project_id: UUID,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_sa_role),
 ) -> ProjectProgressResponse:
     """Get project progress: total_users, not_started, in_progress, completed."""
@@ -224,17 +313,172 @@ def get_progress_route(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found",
         )
-    return get_project_progress(db, project_id)
+    return get_project_progress(project)
+
+
+@router.get("/{project_id}/events")
+def get_project_events(
+    project_id: UUID,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_sa_role),
+    last_event_id: str | None = Header(None, alias="Last-Event-ID"),
+) -> StreamingResponse:
+    """Server-sent events for the dashboard: session_status, phase_approved and report_ready.
+
+    Reconnecting clients send Last-Event-ID and are replayed the events they missed.
+    """
+    project = db.get(Project, project_id)
+    if not project or project.created_by != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found",
+        )
+    # The stream may stay open for hours; don't hold a pooled connection for it.
+    db.close()
+    after_id = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+    return StreamingResponse(
+        event_stream(project_id, after_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/{project_id}/export")
+def export_project(
+    project_id: UUID,
+    format: str = Query("zip", pattern="^(zip|ndjson)$"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_sa_role),
+) -> StreamingResponse:
+    """Stream every stakeholder's transcript, approved summaries, flagged items and cached reports.
+
+    ?format=zip (default) returns a ZIP archive; ?format=ndjson one JSON object per line.
+    """
+    project = db.get(Project, project_id)
+    if not project or project.created_by != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found",
+        )
+    # The export reads with its own session for as long as the download takes.
+    db.close()
+    session_factory = ReadSessionLocal or SessionLocal
+    batch_size = get_settings().EXPORT_BATCH_SIZE
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d")
+    if format == "ndjson":
+        return StreamingResponse(
+            export_ndjson(session_factory, project_id, batch_size),
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": f'attachment; filename="project-{project_id}-{stamp}.ndjson"'},
+        )
+    return StreamingResponse(
+        export_zip(session_factory, project_id, batch_size),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="project-{project_id}-{stamp}.zip"'},
+    )
+
+
+_ANALYTICS_MEDIA_TYPES = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+@router.get("/{project_id}/analytics/{table}")
+def export_project_analytics(
+    project_id: UUID,
+    table: str,
+    format: str = Query("parquet", pattern="^(parquet|arrow)$"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_sa_role),
+) -> StreamingResponse:
+    """Stream one flattened analytics table (sessions, messages, phase_summaries, flagged_items).
+
+    ?format=parquet (default) returns a Parquet file; ?format=arrow an Arrow IPC stream.
+    """
+    if table not in analytics_export.TABLES:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown table; expected one of {', '.join(analytics_export.TABLES)}",
+        )
+    if analytics_export.pa is None:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Analytics export requires pyarrow, which is not installed",
+        )
+    project = db.get(Project, project_id)
+    if not project or project.created_by != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found",
+        )
+    db.close()
+    settings = get_settings()
+    extension = "parquet" if format == "parquet" else "arrows"
+    return StreamingResponse(
+        analytics_export.stream_table(
+            ReadSessionLocal or SessionLocal,
+            table,
+            project_id,
+            format,
+            settings.EXPORT_BATCH_SIZE,
+            settings.ANALYTICS_EXPORT_BATCH_ROWS,
+        ),
+        media_type=_ANALYTICS_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{table}-{project_id}.{extension}"'},
+    )
+
+
+@router.get("/{project_id}/phase-approvals", response_model=PhaseApprovalsResponse)
+def get_phase_approvals_route(
+    project_id: UUID,
+    phase: int | None = Query(None, ge=1, le=4),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_sa_role),
+) -> PhaseApprovalsResponse:
+    """Count stakeholders per approved phase; with ?phase=, also list who has approved that phase."""
+    project = db.get(Project, project_id)
+    if not project or project.created_by != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found",
+        )
+    return PhaseApprovalsResponse(
+        counts=phase_approval_counts(db, project_id),
+        user_ids=users_with_phase_approved(db, project_id, phase) if phase is not None else [],
+    )
+
+
+@router.get("/{project_id}/flagged-items", response_model=list[FlaggedItemResponse])
+def get_flagged_items_route(
+    project_id: UUID,
+    phase: int | None = Query(None, ge=1, le=4),
+    q: str | None = Query(None, min_length=1, max_length=200),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_sa_role),
+) -> list[FlaggedItemResponse]:
+    """List out-of-scope flags across the project's stakeholders, filtered by phase and/or mention text."""
+    project = db.get(Project, project_id)
+    if not project or project.created_by != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found",
+        )
+    return [
+        FlaggedItemResponse.model_validate(item)
+        for item in find_flagged_items(db, project_id, phase=phase, mention=q)
+    ]
 
 
 @router.get(
     "/{project_id}/stakeholders/{user_id}/discovery-results",
     response_model=StakeholderDiscoveryResultsResponse,
+    dependencies=[Depends(llm_admission_dependency)],
 )
 def get_stakeholder_discovery_results(
     project_id: UUID,
     user_id: UUID,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_sa_role),
 ) -> StakeholderDiscoveryResultsResponse:
     """Return phase summaries and final discovery report for a stakeholder on this project."""
@@ -250,17 +494,11 @@ def get_stakeholder_discovery_results(
             detail="Project not found",
         )
 
-    # Find the ProjectUser for this project/user
-    project_user = None
-    for pu in project.project_users:
-        if pu.user_id == user_id:
-            project_user = pu
-            break
+    project_user = get_project_user_with_session(db, project_id, user_id)
 
     print(
         f"[projects.get_stakeholder_discovery_results] project_id={project_id} user_id={user_id} "
-        f"project_user={'found' if project_user else 'NOT FOUND'} "
-        f"project_users_count={len(project.project_users)}"
+        f"project_user={'found' if project_user else 'NOT FOUND'}"
     )
 
     if not project_user:
@@ -274,24 +512,18 @@ def get_stakeholder_discovery_results(
         print("[projects.get_stakeholder_discovery_results] No session for project_user")
         return StakeholderDiscoveryResultsResponse(phase_summaries={}, final_report=None)
 
-    # Extract approved (non-pending) phase summaries from stored data
-    raw_summaries = session.phase_summaries or {}
-    phase_summaries: dict[str, str] = {}
-    for k, v in raw_summaries.items():
-        if str(k).endswith("_pending"):
-            continue
-        if isinstance(v, str):
-            phase_summaries[str(k)] = v
-        elif isinstance(v, dict) and isinstance(v.get("content"), str):
-            phase_summaries[str(k)] = v["content"]
+    phase_summaries = get_approved_summaries(db, session.id)
 
     # Generate final report on-the-fly (not stored in DB)
     final_report: str | None = None
     if session.status == SessionStatus.COMPLETED and phase_summaries:
         try:
             scope = project.scope
-            final_report = generate_final_report(
-                phase_summaries, scope, session.flagged_items or []
+            flagged_items = session.flagged_items or []
+            final_report = coalesce_generation(
+                final_report_subject(session.id),
+                [phase_summaries, scope, flagged_items],
+                lambda: generate_final_report(phase_summaries, scope, flagged_items),
             )
         except Exception as e:
             print(f"[projects.get_stakeholder_discovery_results] generate_final_report error: {e}")
@@ -312,18 +544,38 @@ def get_stakeholder_discovery_results(
 @router.get(
     "/{project_id}/consolidated-report",
     response_model=ConsolidatedReportResponse,
+    dependencies=[Depends(llm_admission_dependency)],
 )
 def get_consolidated_report(
     project_id: UUID,
     regenerate: bool = Query(False, description="Force regenerate the report"),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_sa_role),
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
 ) -> ConsolidatedReportResponse:
     """Get the consolidated discovery report for a project.
 
     Fetches all completed discovery sessions, synthesizes findings via Claude,
     and returns the report. Caches the result in the database unless regenerate=True.
+    With an Idempotency-Key header, a retried regenerate returns the first result.
     """
+    return run_idempotent(
+        db,
+        current_user.id,
+        f"GET /api/projects/{project_id}/consolidated-report",
+        idempotency_key,
+        f"regenerate={regenerate}",
+        ConsolidatedReportResponse,
+        lambda: _consolidated_report(db, current_user, project_id, regenerate),
+    )
+
+
+def _consolidated_report(
+    db: Session,
+    current_user: User,
+    project_id: UUID,
+    regenerate: bool,
+) -> ConsolidatedReportResponse:
     project = get_project(db, project_id)
     if not project:
         raise HTTPException(
@@ -338,25 +590,20 @@ def get_consolidated_report(
 
     # Gather completed sessions
     stakeholder_data: list[dict] = []
-    for pu in project.project_users:
-        if not pu.session or pu.session.status != SessionStatus.COMPLETED:
-            continue
+    completed = get_completed_project_users(db, project_id)
+    summaries_by_session = get_approved_summaries_by_session(db, [pu.session.id for pu in completed])
+    for pu in completed:
         session = pu.session
         name = pu.user.name if pu.user else pu.invited_name or ""
         email = pu.user.email if pu.user else pu.invited_email or ""
-        raw_summaries = session.phase_summaries or {}
-        phase_summaries: dict[str, str] = {}
-        for k, v in raw_summaries.items():
-            if str(k).endswith("_pending"):
-                continue
-            if isinstance(v, str):
-                phase_summaries[str(k)] = v
+        phase_summaries = summaries_by_session.get(session.id, {})
         final_report: str | None = None
         if phase_summaries:
-            final_report = generate_final_report(
-                phase_summaries,
-                project.scope,
-                session.flagged_items or [],
+            flagged_items = session.flagged_items or []
+            final_report = coalesce_generation(
+                final_report_subject(session.id),
+                [phase_summaries, project.scope, flagged_items],
+                lambda: generate_final_report(phase_summaries, project.scope, flagged_items),
             )
         stakeholder_data.append({
             "name": name or email or "Unknown",
@@ -380,11 +627,21 @@ def get_consolidated_report(
         )
 
     # Generate and store
-    report_content = generate_consolidated_report(project.scope, stakeholder_data)
+    report_content = coalesce_generation(
+        consolidated_report_subject(project_id),
+        [project.scope, stakeholder_data],
+        lambda: generate_consolidated_report(project.scope, stakeholder_data),
+    )
     project.consolidated_report = report_content
     project.consolidated_report_generated_at = datetime.now(timezone.utc)
+    record_event(
+        db,
+        project_id,
+        "report_ready",
+        report="consolidated",
+        generated_at=project.consolidated_report_generated_at,
+    )
     db.commit()
-    db.refresh(project)
 
     return ConsolidatedReportResponse(
         report_content=report_content,
@@ -426,7 +683,10 @@ def deactivate_stakeholder(
 
     project_user.status = ProjectUserStatus.INACTIVE
     db.commit()
-    db.refresh(project_user)
+    hot_store = get_hot_session_store()
+    if hot_store is not None:
+        # Stop serving turns from this worker's cache; other workers re-check after the TTL.
+        hot_store.evict(user_id)
     return project_user_to_response(project_user)
 
 
@@ -467,7 +727,12 @@ def delete_stakeholder(
             detail="Cannot delete a stakeholder who has completed discovery. Deactivate them instead.",
         )
 
+    hot_store = get_hot_session_store()
+    if hot_store is not None:
+        hot_store.evict(user_id)
+
     response = project_user_to_response(project_user)
+    record_project_user_removed(db, project_user)
     db.delete(project_user)
     db.commit()
     return response
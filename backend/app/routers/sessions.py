@@ -1,11 +1,22 @@
 """Discovery session routes. All routes require authentication."""
 
+import asyncio
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import datetime, timezone
-
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any
+from uuid import UUID
+
+import anyio.from_thread
+import anyio.to_thread
+from fastapi import APIRouter, Depends, Header, HTTPException, WebSocket, WebSocketDisconnect, status
+from fastapi.encoders import jsonable_encoder
+from pydantic import ValidationError
 from sqlalchemy.orm import Session, joinedload
 
-from app.database import get_db
+from app.config import get_settings
+from app.database import SessionLocal, get_db
 from app.models.project import ProjectUser, ProjectUserStatus
 from app.models.session import DiscoverySession, SessionStatus
 from app.models.user import User, UserRole
@@ -19,7 +30,9 @@ from app.schemas.session import (
     SessionResponse,
 )
 from app.schemas.user import UserResponse
-from app.services.auth import get_current_user_dependency
+from app.services.admission import get_llm_admission, llm_admission_dependency
+from app.services.archive import load_transcript
+from app.services.auth import authenticate_token, get_current_user_dependency
 from app.services.discovery import (
     calculate_style_profile,
     detect_out_of_scope,
@@ -31,7 +44,20 @@ from app.services.discovery import (
     get_phase_system_prompt,
     get_phase_transition_message,
     review_and_approve_summary,
+    stream_assistant_reply,
+)
+from app.services.hot_sessions import HotSession, HotSessionStore, get_hot_session_store
+from app.services.idempotency import run_idempotent
+from app.services.phase_summary import (
+    approve_pending_summary,
+    get_approved_summaries,
+    get_pending_summary,
+    revise_pending_summary,
+    save_pending_summary,
 )
+from app.services.project import transition_session_status
+from app.services.project_events import record_event
+from app.services.report_flight import coalesce_generation, final_report_subject
 
 router = APIRouter(prefix="/api/session", tags=["sessions"])
 
@@ -41,6 +67,10 @@ def _get_or_create_active_session(db: Session, current_user: User) -> tuple[Disc
 
     Includes COMPLETED so stakeholders can view their final report after discovery.
     Returns (session, project_user). Raises 404 if no project assignment."""
+    hot_store = get_hot_session_store()
+    if hot_store is not None:
+        # Anything beyond a regular turn works on the database row, so write back cached turns first.
+        hot_store.evict(current_user.id)
     project_user = (
         db.query(ProjectUser)
         .filter(
@@ -60,30 +90,29 @@ def _get_or_create_active_session(db: Session, current_user: User) -> tuple[Disc
     session = project_user.session
     if session is None:
         session = DiscoverySession(
-            project_user_id=project_user.id,
+            project_user=project_user,
             status=SessionStatus.NOT_STARTED,
             current_phase=1,
         )
         db.add(session)
         db.commit()
-        db.refresh(session)
-        db.refresh(project_user)
     return session, project_user
 
 
-def _session_to_response(session: DiscoverySession, is_first_visit: bool | None = None) -> SessionResponse:
-    """Build SessionResponse from DiscoverySession, including pending_phase_summary and all_messages."""
-    pending = None
-    if isinstance(session.phase_summaries, dict):
-        pending = session.phase_summaries.get(f"{session.current_phase}_pending")
-    all_messages = session.all_messages if session.all_messages is not None else []
+def _session_to_response(
+    session: DiscoverySession,
+    pending_summary: str | None,
+    is_first_visit: bool | None = None,
+) -> SessionResponse:
+    """Build SessionResponse from DiscoverySession and the current phase's pending summary (if any)."""
+    all_messages = load_transcript(session)
     return SessionResponse(
         id=session.id,
         current_phase=session.current_phase,
         status=session.status.value,
         started_at=session.started_at,
         completed_at=session.completed_at,
-        pending_phase_summary=pending,
+        pending_phase_summary=pending_summary,
         all_messages=all_messages,
         is_first_visit=is_first_visit,
     )
@@ -112,7 +141,6 @@ def post_assessment(
     current_user.style_profile = profile
     current_user.assessment_completed = True
     db.commit()
-    db.refresh(current_user)
     return _user_to_response(current_user)
 
 
@@ -133,30 +161,151 @@ def get_session(
         if getattr(current_user, "first_dashboard_visit_at", None) is None:
             current_user.first_dashboard_visit_at = datetime.now(timezone.utc)
             db.commit()
-            db.refresh(current_user)
             is_first_visit = True
 
-    return _session_to_response(session, is_first_visit=is_first_visit)
+    # Summaries only exist once the session has started; skip the lookup for a new session.
+    pending = None
+    if session.status != SessionStatus.NOT_STARTED:
+        pending = get_pending_summary(db, session.id, session.current_phase)
+    return _session_to_response(
+        session,
+        pending.content if pending else None,
+        is_first_visit=is_first_visit,
+    )
+
+
+_PHASE_COMMANDS = ["next", "next phase", "move on"]
+_SESSION_COMMANDS = ["BEGIN_SESSION", "RESUME_SESSION", "BEGIN_PHASE"]
+
+
+def _assistant_turn(
+    phase: int,
+    scope: str,
+    style_profile: dict,
+    all_messages: list,
+    user_content: str,
+    on_text: Callable[[str], None] | None = None,
+) -> tuple[str, bool, dict | None]:
+    """Get Claude's reply to a regular turn; all_messages already ends with the user's message.
+
+    With on_text, the reply is streamed to it chunk by chunk as it is generated.
+    Returns (visible_message, phase_complete_suggested, flagged_item or None)."""
+    system_prompt = get_phase_system_prompt(phase, scope, style_profile)
+
+    try:
+        if on_text is None:
+            assistant_message = get_assistant_reply(system_prompt, all_messages)
+        else:
+            assistant_message = stream_assistant_reply(system_prompt, all_messages, on_text)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Claude request failed: {str(e)}",
+        )
+
+    # Out-of-scope detection
+    flagged_item = None
+    out_of_scope = detect_out_of_scope(scope, user_content)
+    if out_of_scope:
+        flagged_item = {"phase": phase, "mention": out_of_scope, "user_input": user_content}
+
+    marker = "[PHASE_COMPLETE]"
+    hint_phrases = [
+        "compile a summary for your review",
+        "generate a summary for your review",
+        "compile a summary for you to review",
+        "generate a summary for you to review",
+    ]
+    lower_msg = assistant_message.lower()
+    phase_complete_suggested = marker in assistant_message or any(
+        phrase in lower_msg for phrase in hint_phrases
+    )
+    visible_message = assistant_message.replace(marker, "").strip()
+    return visible_message, phase_complete_suggested, flagged_item
+
+
+def _post_hot_turn(
+    hot_store: HotSessionStore,
+    hot: HotSession,
+    user_content: str,
+    style_profile: dict,
+    on_text: Callable[[str], None] | None = None,
+) -> SessionMessageResponse:
+    """Regular turn served from the hot-session store: no database reads or writes."""
+    with hot.lock:
+        all_messages = list(hot.messages)
+        phase = hot.current_phase
+    all_messages.append({"role": "user", "content": user_content})
+    visible_message, phase_complete_suggested, flagged_item = _assistant_turn(
+        phase, hot.scope, style_profile, all_messages, user_content, on_text
+    )
+    hot_store.append(
+        hot,
+        [{"role": "user", "content": user_content}, {"role": "assistant", "content": visible_message}],
+        [flagged_item] if flagged_item else [],
+    )
+    return SessionMessageResponse(
+        assistant_message=visible_message,
+        phase_completed=False,
+        summary=None,
+        message=visible_message,
+        phase_complete_suggested=phase_complete_suggested,
+    )
 
 
-@router.post("/message", response_model=SessionMessageResponse)
+@router.post("/message", response_model=SessionMessageResponse, dependencies=[Depends(llm_admission_dependency)])
 def post_message(
     body: SessionMessageRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_dependency),
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
 ) -> SessionMessageResponse:
-    """Send a message in the discovery session. Handles phase commands (next/next phase/move on) by generating summary."""
+    """Send a message in the discovery session. Handles phase commands (next/next phase/move on) by generating summary.
+
+    With an Idempotency-Key header, retries of the same message return the first response.
+    """
+    return run_idempotent(
+        db,
+        current_user.id,
+        "POST /api/session/message",
+        idempotency_key,
+        body.model_dump_json(),
+        SessionMessageResponse,
+        lambda: _post_message(db, current_user, body),
+    )
+
+
+def _is_regular_turn(user_content: str) -> bool:
+    return (
+        bool(user_content)
+        and user_content not in _SESSION_COMMANDS
+        and user_content.lower() not in _PHASE_COMMANDS
+    )
+
+
+def _post_message(
+    db: Session,
+    current_user: User,
+    body: SessionMessageRequest,
+    on_text: Callable[[str], None] | None = None,
+) -> SessionMessageResponse:
+    style_profile = current_user.style_profile if current_user.style_profile else {}
+    user_content = body.message.strip()
+    hot_store = get_hot_session_store()
+    if hot_store is not None and _is_regular_turn(user_content):
+        hot = hot_store.get(current_user.id)
+        if hot is not None:
+            return _post_hot_turn(hot_store, hot, user_content, style_profile, on_text)
+
     session, project_user = _get_or_create_active_session(db, current_user)
     if session.status == SessionStatus.COMPLETED:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Session already completed")
 
     scope = project_user.project.scope
-    style_profile = current_user.style_profile if current_user.style_profile else {}
 
     # BEGIN_SESSION: AI initiates the conversation (no user message stored)
-    user_content = body.message.strip()
     if user_content == "BEGIN_SESSION" and session.status == SessionStatus.NOT_STARTED:
-        session.status = SessionStatus.IN_PROGRESS
+        transition_session_status(db, session, project_user.project_id, SessionStatus.IN_PROGRESS)
         session.started_at = datetime.now(timezone.utc)
         initial_question = get_phase_initial_question(1)
         greeting = (
@@ -166,7 +315,6 @@ def post_message(
         )
         session.all_messages = [{"role": "assistant", "content": greeting}]
         db.commit()
-        db.refresh(session)
         return SessionMessageResponse(
             assistant_message=greeting,
             phase_completed=False,
@@ -206,7 +354,6 @@ def post_message(
         all_messages.append({"role": "assistant", "content": visible_message})
         session.all_messages = all_messages
         db.commit()
-        db.refresh(session)
         return SessionMessageResponse(
             assistant_message=visible_message,
             phase_completed=False,
@@ -245,7 +392,6 @@ def post_message(
         all_messages.append({"role": "assistant", "content": visible_message})
         session.all_messages = all_messages
         db.commit()
-        db.refresh(session)
 
         # Debug logging: phase intro sent explicitly via BEGIN_PHASE
         print(
@@ -262,7 +408,7 @@ def post_message(
 
     # Start session on first activity (for any other first message)
     if session.status == SessionStatus.NOT_STARTED:
-        session.status = SessionStatus.IN_PROGRESS
+        transition_session_status(db, session, project_user.project_id, SessionStatus.IN_PROGRESS)
         session.started_at = datetime.now(timezone.utc)
         transition = get_phase_transition_message(session.current_phase)
         initial_q = get_phase_initial_question(session.current_phase)
@@ -270,16 +416,16 @@ def post_message(
             {"role": "assistant", "content": transition.strip()},
             {"role": "assistant", "content": initial_q},
         ]
-        db.flush()
+        # Commit before calling Claude so the write lock isn't held for the whole LLM round-trip
+        db.commit()
 
     # Copy JSON fields for mutation
     all_messages = list(session.all_messages or [])
-    user_content = body.message.strip()
     if not user_content:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Message cannot be empty")
 
     # Phase completion commands
-    if user_content.lower() in ["next", "next phase", "move on"]:
+    if user_content.lower() in _PHASE_COMMANDS:
         summary = generate_phase_summary(
             session.current_phase,
             all_messages,
@@ -293,18 +439,12 @@ def post_message(
                 detail="Failed to generate phase summary",
             )
         # Store pending summary for approve-summary
-        phase_summaries = dict(session.phase_summaries or {})
-        phase_summaries[f"{session.current_phase}_pending"] = summary
-        session.phase_summaries = phase_summaries
+        save_pending_summary(db, session, session.current_phase, summary)
         session.all_messages = all_messages
         db.commit()
-        db.refresh(session)
         summary_message = "Summary generated. Please approve or request changes via POST /api/session/approve-summary."
         # Debug logging: phase summary generated and pending approval
-        print(
-            f"[sessions.post_message] Phase summary generated for phase {session.current_phase}; "
-            f"pending_key={session.current_phase}_pending"
-        )
+        print(f"[sessions.post_message] Phase summary generated for phase {session.current_phase}; pending approval")
         return SessionMessageResponse(
             assistant_message=summary_message,
             phase_completed=True,
@@ -313,43 +453,34 @@ def post_message(
             phase_complete_suggested=False,
         )
 
-    all_messages.append({"role": "user", "content": user_content})
-    system_prompt = get_phase_system_prompt(session.current_phase, scope, style_profile)
+    return _regular_turn(db, session, project_user, user_content, style_profile, on_text)
 
-    try:
-        assistant_message = get_assistant_reply(system_prompt, all_messages)
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=f"Claude request failed: {str(e)}",
-        )
 
-    # Out-of-scope detection
-    out_of_scope = detect_out_of_scope(scope, user_content)
-    if out_of_scope:
+def _regular_turn(
+    db: Session,
+    session: DiscoverySession,
+    project_user: ProjectUser,
+    user_content: str,
+    style_profile: dict,
+    on_text: Callable[[str], None] | None = None,
+) -> SessionMessageResponse:
+    """Answer a regular chat turn in an IN_PROGRESS session and append it to the transcript."""
+    hot_store = get_hot_session_store()
+    all_messages = list(session.all_messages or [])
+    all_messages.append({"role": "user", "content": user_content})
+    visible_message, phase_complete_suggested, flagged_item = _assistant_turn(
+        session.current_phase, project_user.project.scope, style_profile, all_messages, user_content, on_text
+    )
+    if flagged_item:
         flagged = list(session.flagged_items or [])
-        flagged.append(
-            {"phase": session.current_phase, "mention": out_of_scope, "user_input": user_content}
-        )
+        flagged.append(flagged_item)
         session.flagged_items = flagged
 
-    marker = "[PHASE_COMPLETE]"
-    hint_phrases = [
-        "compile a summary for your review",
-        "generate a summary for your review",
-        "compile a summary for you to review",
-        "generate a summary for you to review",
-    ]
-    lower_msg = assistant_message.lower()
-    phase_complete_suggested = marker in assistant_message or any(
-        phrase in lower_msg for phrase in hint_phrases
-    )
-    visible_message = assistant_message.replace(marker, "").strip()
-
     all_messages.append({"role": "assistant", "content": visible_message})
     session.all_messages = all_messages
     db.commit()
-    db.refresh(session)
+    if hot_store is not None and session.status == SessionStatus.IN_PROGRESS:
+        hot_store.load(session, project_user)
 
     # Debug logging: regular assistant reply (may include phase-complete suggestion)
     print(
@@ -370,42 +501,66 @@ def post_message(
     )
 
 
-@router.post("/approve-summary", response_model=SessionResponse)
+@router.post("/approve-summary", response_model=SessionResponse, dependencies=[Depends(llm_admission_dependency)])
 def post_approve_summary(
     body: PhaseSummaryApproval,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_dependency),
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
 ) -> SessionResponse:
-    """Approve, request changes, or add details to the pending phase summary."""
+    """Approve, request changes, or add details to the pending phase summary.
+
+    With an Idempotency-Key header, retries return the first response instead of acting again.
+    """
+    return run_idempotent(
+        db,
+        current_user.id,
+        "POST /api/session/approve-summary",
+        idempotency_key,
+        body.model_dump_json(),
+        SessionResponse,
+        lambda: _approve_summary(db, current_user, body),
+    )
+
+
+def _approve_summary(db: Session, current_user: User, body: PhaseSummaryApproval) -> SessionResponse:
     session, project_user = _get_or_create_active_session(db, current_user)
     if session.status == SessionStatus.COMPLETED:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Session already completed")
 
     phase_num = session.current_phase
-    phase_summaries = dict(session.phase_summaries or {})
-    pending_key = f"{phase_num}_pending"
-    pending_summary = phase_summaries.get(pending_key)
 
     if body.action == PhaseSummaryAction.approve:
-        if not pending_summary:
+        # Read with a plain SELECT and approve only after the LLM call, so the write
+        # transaction (and SQLite's writer) is not held for the whole round-trip.
+        pending = get_pending_summary(db, session.id, phase_num)
+        if not pending:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="No pending summary to approve",
             )
-        phase_summaries[str(phase_num)] = pending_summary
-        if pending_key in phase_summaries:
-            del phase_summaries[pending_key]
-        session.phase_summaries = phase_summaries
         # Add a break-offer transition message based on the approved summary
         next_phase_num: int | None = None if phase_num >= 4 else phase_num + 1
         break_message = generate_phase_break_offer_message(
             phase_num=phase_num,
-            approved_summary=pending_summary,
+            approved_summary=pending.content,
             next_phase_num=next_phase_num,
         )
+        if approve_pending_summary(db, session.id, phase_num, pending.version) is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="The summary was approved or revised by another request",
+            )
+        record_event(
+            db,
+            project_user.project_id,
+            "phase_approved",
+            session_id=session.id,
+            project_user_id=project_user.id,
+            phase=phase_num,
+        )
         all_messages = list(session.all_messages or [])
         all_messages.append({"role": "assistant", "content": break_message})
-        session.all_messages = all_messages
 
         # Debug logging: break-offer message sent after summary approval
         print(
@@ -417,19 +572,27 @@ def post_approve_summary(
             },
         )
         if phase_num >= 4:
-            session.status = SessionStatus.COMPLETED
-            session.completed_at = datetime.now(timezone.utc)
+            # The transcript and completed_at go in the status UPDATE itself, not a second one.
+            transition_session_status(
+                db,
+                session,
+                project_user.project_id,
+                SessionStatus.COMPLETED,
+                all_messages=all_messages,
+                completed_at=datetime.now(timezone.utc),
+            )
             # Mark the stakeholder's project participation as COMPLETED
             if project_user.status != ProjectUserStatus.COMPLETED:
                 project_user.status = ProjectUserStatus.COMPLETED
         else:
+            session.all_messages = all_messages
             session.current_phase = phase_num + 1
         db.commit()
-        db.refresh(session)
-        return _session_to_response(session)
+        return _session_to_response(session, None)
 
     # request_changes or add_details
-    if not pending_summary:
+    pending = get_pending_summary(db, session.id, phase_num)
+    if not pending:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No pending summary to revise",
@@ -438,21 +601,19 @@ def post_approve_summary(
     style_profile = current_user.style_profile if current_user.style_profile else {}
     revised = review_and_approve_summary(
         phase_num,
-        pending_summary,
+        pending.content,
         scope,
         style_profile,
         body.action.value,
         body.feedback,
     )
     if revised:
-        phase_summaries[pending_key] = revised
-        session.phase_summaries = phase_summaries
+        revise_pending_summary(pending, revised)
         db.commit()
-        db.refresh(session)
-    return _session_to_response(session)
+    return _session_to_response(session, pending.content)
 
 
-@router.get("/report", response_model=SessionReportResponse)
+@router.get("/report", response_model=SessionReportResponse, dependencies=[Depends(llm_admission_dependency)])
 def get_report(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_dependency),
@@ -465,6 +626,168 @@ def get_report(
             detail="Session not completed",
         )
     scope = project_user.project.scope
-    phase_summaries = {k: v for k, v in (session.phase_summaries or {}).items() if not str(k).endswith("_pending")}
-    report_content = generate_final_report(phase_summaries, scope, session.flagged_items or [])
+    phase_summaries = get_approved_summaries(db, session.id)
+    flagged_items = session.flagged_items or []
+    report_content = coalesce_generation(
+        final_report_subject(session.id),
+        [phase_summaries, scope, flagged_items],
+        lambda: generate_final_report(phase_summaries, scope, flagged_items),
+    )
     return SessionReportResponse(report_content=report_content)
+
+
+@dataclass
+class _ChatConnection:
+    """Context resolved once when a chat WebSocket connects and reused for every message on it."""
+
+    user: User
+    token_expires_at: float
+    session_id: UUID
+    project_user: ProjectUser
+    style_profile: dict
+
+
+def _open_chat(token: str) -> tuple[_ChatConnection, DiscoverySession] | None:
+    db = SessionLocal()
+    try:
+        authenticated = authenticate_token(db, token)
+        if authenticated is None:
+            return None
+        user, token_expires_at = authenticated
+        session, project_user = _get_or_create_active_session(db, user)
+        chat = _ChatConnection(
+            user=user,
+            token_expires_at=token_expires_at,
+            session_id=session.id,
+            project_user=project_user,
+            style_profile=user.style_profile or {},
+        )
+        return chat, session
+    finally:
+        db.close()
+
+
+def _chat_message(
+    chat: _ChatConnection,
+    body: SessionMessageRequest,
+    on_text: Callable[[str], None],
+) -> SessionMessageResponse:
+    """One chat message: regular turns use the pinned context, everything else goes through _post_message."""
+    user_content = body.message.strip()
+    with get_llm_admission().admit(chat.user.id):
+        if _is_regular_turn(user_content):
+            hot_store = get_hot_session_store()
+            hot = hot_store.get(chat.user.id) if hot_store is not None else None
+            if hot is not None:
+                return _post_hot_turn(hot_store, hot, user_content, chat.style_profile, on_text)
+        db = SessionLocal()
+        try:
+            if _is_regular_turn(user_content):
+                session = db.get(DiscoverySession, chat.session_id)
+                if session is not None and session.status == SessionStatus.IN_PROGRESS:
+                    return _regular_turn(db, session, chat.project_user, user_content, chat.style_profile, on_text)
+            return _post_message(db, chat.user, body, on_text)
+        finally:
+            db.close()
+
+
+def _chat_approve(chat: _ChatConnection, body: PhaseSummaryApproval) -> SessionResponse:
+    with get_llm_admission().admit(chat.user.id):
+        db = SessionLocal()
+        try:
+            return _approve_summary(db, chat.user, body)
+        finally:
+            db.close()
+
+
+async def _chat_reply(websocket: WebSocket, chat: _ChatConnection, data: Any) -> dict:
+    if not isinstance(data, dict):
+        data = {}
+    request_id = data.get("request_id")
+
+    def on_text(text: str) -> None:
+        try:
+            anyio.from_thread.run(websocket.send_json, {"type": "token", "request_id": request_id, "text": text})
+        except Exception:
+            # The client went away mid-reply; finish the turn anyway so it is saved.
+            pass
+
+    try:
+        if data.get("type") == "message":
+            body = SessionMessageRequest.model_validate({"message": data.get("message")})
+            response = await anyio.to_thread.run_sync(_chat_message, chat, body, on_text)
+            return {"type": "message", "request_id": request_id, **response.model_dump(mode="json")}
+        if data.get("type") == "approve":
+            body = PhaseSummaryApproval.model_validate({"action": data.get("action"), "feedback": data.get("feedback")})
+            response = await anyio.to_thread.run_sync(_chat_approve, chat, body)
+            return {"type": "session", "request_id": request_id, **response.model_dump(mode="json")}
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unknown message type")
+    except ValidationError as e:
+        return {
+            "type": "error",
+            "request_id": request_id,
+            "status": status.HTTP_422_UNPROCESSABLE_CONTENT,
+            "detail": jsonable_encoder(e.errors(include_url=False)),
+        }
+    except HTTPException as e:
+        return {"type": "error", "request_id": request_id, "status": e.status_code, "detail": e.detail}
+
+
+@router.websocket("/ws")
+async def session_websocket(websocket: WebSocket) -> None:
+    """Discovery chat over one WebSocket: authenticate and resolve the session once, then chat.
+
+    Authenticate with an Authorization: Bearer header or, from browsers, a first message
+    {"type": "auth", "token": ...} within WS_AUTH_TIMEOUT_SECONDS. The server then sends
+    {"type": "ready", ...} and accepts, one at a time:
+    - {"type": "message", "message": ...}: a chat turn or a command (BEGIN_SESSION,
+      RESUME_SESSION, BEGIN_PHASE, next), as POST /message. Regular turns stream
+      {"type": "token", "text": ...} chunks, then end with {"type": "message", ...}.
+    - {"type": "approve", "action": ..., "feedback": ...}: as POST /approve-summary;
+      answered with {"type": "session", ...}.
+    Failures are answered with {"type": "error", "status": ..., "detail": ...} and the
+    connection stays open. An optional "request_id" on a message is echoed on its replies.
+    The connection is closed (1008) when the token expires.
+    """
+    await websocket.accept()
+    try:
+        token = None
+        scheme, _, credentials = websocket.headers.get("authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and credentials:
+            token = credentials
+        else:
+            try:
+                first = await asyncio.wait_for(websocket.receive_json(), get_settings().WS_AUTH_TIMEOUT_SECONDS)
+            except (asyncio.TimeoutError, ValueError):
+                first = None
+            if isinstance(first, dict) and first.get("type") == "auth" and isinstance(first.get("token"), str):
+                token = first["token"]
+        try:
+            opened = await anyio.to_thread.run_sync(_open_chat, token) if token else None
+        except HTTPException as e:
+            await websocket.send_json({"type": "error", "status": e.status_code, "detail": e.detail})
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e.detail))
+            return
+        if opened is None:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Invalid or expired token")
+            return
+        chat, session = opened
+        await websocket.send_json({
+            "type": "ready",
+            "session_id": str(session.id),
+            "status": session.status.value,
+            "current_phase": session.current_phase,
+        })
+
+        while True:
+            try:
+                data = await websocket.receive_json()
+            except ValueError:
+                await websocket.send_json({"type": "error", "status": status.HTTP_400_BAD_REQUEST, "detail": "Invalid JSON"})
+                continue
+            if time.time() >= chat.token_expires_at:
+                await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Token expired")
+                return
+            await websocket.send_json(await _chat_reply(websocket, chat, data))
+    except WebSocketDisconnect:
+        return
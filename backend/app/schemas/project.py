@@ -82,6 +82,32 @@ class ProjectUserResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class ProjectUsersBulkAdd(BaseModel):
+    """Schema for adding many users to a project in one request."""
+
+    users: list[ProjectUserAdd]
+
+
+class ProjectUserBulkResult(BaseModel):
+    """Outcome for one row of a bulk add."""
+
+    row: int  # 1-based position in the request (for CSV, data rows after the header)
+    email: str
+    result: str  # "added", "invited", "existing", "duplicate" or "invalid"
+    detail: str | None = None
+    project_user: ProjectUserResponse | None = None
+
+
+class ProjectUsersBulkResponse(BaseModel):
+    """Per-row results of a bulk add, with counts by outcome."""
+
+    added: int
+    invited: int
+    existing: int
+    failed: int
+    results: list[ProjectUserBulkResult]
+
+
 class ProjectProgressResponse(BaseModel):
     """Schema for project progress stats."""
 
@@ -112,3 +138,23 @@ class ConsolidatedReportResponse(BaseModel):
     report_content: str
     generated_at: datetime
     stakeholder_count: int
+
+
+class FlaggedItemResponse(BaseModel):
+    """An out-of-scope mention flagged in a stakeholder's discovery session."""
+
+    user_id: UUID | None
+    name: str
+    email: str
+    phase: int | None
+    mention: str
+    user_input: str
+
+    model_config = {"from_attributes": True}
+
+
+class PhaseApprovalsResponse(BaseModel):
+    """Per-phase count of stakeholders with an approved summary."""
+
+    counts: dict[int, int]  # phase number -> stakeholders with that phase approved
+    user_ids: list[UUID] = []  # Stakeholders with the requested phase approved (when ?phase= is given)
@@ -0,0 +1,190 @@
+"""Admission control for LLM-backed endpoints.
+
+Each request to an endpoint that may call the LLM passes three checks before
+its handler runs:
+
+1. Rate limits: a token bucket per user and, on project-scoped routes
+   (/api/projects/{project_id}/...), per project. An empty bucket answers 429
+   with Retry-After set to when the next token is due. Stakeholder chat routes
+   are limited per user only: their project is not known until the handler
+   loads the assignment.
+2. Load shedding: the expected wait for an LLM slot is estimated from the
+   queue length and recent handler latency (an EWMA). Above
+   LLM_SHED_QUEUE_SECONDS the request is refused at once with 503 rather than
+   joining a queue it would time out in.
+3. A global cap of LLM_MAX_IN_FLIGHT concurrent LLM-backed requests. Requests
+   beyond it wait up to LLM_QUEUE_TIMEOUT_SECONDS for a slot, then get 503.
+
+All state is per process; with several workers the effective limits are the
+configured ones times the worker count.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Generator, Hashable
+from contextlib import contextmanager
+from functools import lru_cache
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, Request, status
+
+from app.config import get_settings
+from app.models.user import User
+from app.services.auth import get_current_user_dependency
+
+_LATENCY_EWMA_ALPHA = 0.2
+
+
+class TokenBuckets:
+    """Token bucket per key: rate_per_minute refill, up to burst tokens. Oldest idle keys are dropped."""
+
+    def __init__(self, rate_per_minute: float, burst: int, max_keys: int = 10_000) -> None:
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[Hashable, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0 and self.burst > 0
+
+    def take(self, key: Hashable) -> float:
+        """Take a token for key. Returns 0 if one was available, else seconds until one is."""
+        if not self.enabled:
+            return 0.0
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / self.rate
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return wait
+
+
+class LLMAdmission:
+    """Per-user/per-project rate limits, latency-based shedding and a global in-flight cap."""
+
+    def __init__(
+        self,
+        user_buckets: TokenBuckets,
+        project_buckets: TokenBuckets,
+        max_in_flight: int,
+        queue_timeout: float,
+        shed_queue_seconds: float,
+    ) -> None:
+        self.user_buckets = user_buckets
+        self.project_buckets = project_buckets
+        self.max_in_flight = max_in_flight
+        self.queue_timeout = queue_timeout
+        self.shed_queue_seconds = shed_queue_seconds
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._in_flight = 0
+        self._latency_ewma = 0.0
+        self._admitted = 0
+        self._rate_limited = 0
+        self._shed = 0
+
+    @contextmanager
+    def admit(self, user_id: UUID, project_id: UUID | str | None = None) -> Generator[None, None, None]:
+        """Hold an LLM slot for the duration of the block, or raise 429/503."""
+        retry_after = self.user_buckets.take(user_id)
+        if project_id is not None:
+            retry_after = max(retry_after, self.project_buckets.take(project_id))
+        if retry_after > 0:
+            with self._lock:
+                self._rate_limited += 1
+            raise _refusal(status.HTTP_429_TOO_MANY_REQUESTS, "Too many requests; please slow down", retry_after)
+
+        with self._lock:
+            expected_wait = self._expected_wait()
+            if expected_wait > self.shed_queue_seconds:
+                self._shed += 1
+                shed = True
+            else:
+                self._waiting += 1
+                shed = False
+        if shed:
+            raise _refusal(status.HTTP_503_SERVICE_UNAVAILABLE, "The assistant is busy; please retry shortly", expected_wait)
+
+        acquired = self._slots.acquire(timeout=self.queue_timeout)
+        with self._lock:
+            self._waiting -= 1
+            if acquired:
+                self._in_flight += 1
+                self._admitted += 1
+            else:
+                self._shed += 1
+        if not acquired:
+            raise _refusal(
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                "The assistant is busy; please retry shortly",
+                self._expected_wait(),
+            )
+
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            with self._lock:
+                self._in_flight -= 1
+                self._latency_ewma += _LATENCY_EWMA_ALPHA * (elapsed - self._latency_ewma)
+            self._slots.release()
+
+    def _expected_wait(self) -> float:
+        """Rough wait for a slot: the queue ahead, served max_in_flight at a time at recent latency."""
+        if self._in_flight < self.max_in_flight:
+            return 0.0
+        return (self._waiting + 1) / self.max_in_flight * self._latency_ewma
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "in_flight": self._in_flight,
+                "waiting": self._waiting,
+                "latency_ewma_seconds": self._latency_ewma,
+                "expected_wait_seconds": self._expected_wait(),
+                "admitted": self._admitted,
+                "rate_limited": self._rate_limited,
+                "shed": self._shed,
+            }
+
+
+def _refusal(status_code: int, detail: str, retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=status_code,
+        detail=detail,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+@lru_cache
+def get_llm_admission() -> LLMAdmission:
+    settings = get_settings()
+    return LLMAdmission(
+        TokenBuckets(settings.LLM_USER_RATE_PER_MINUTE, settings.LLM_USER_BURST),
+        TokenBuckets(settings.LLM_PROJECT_RATE_PER_MINUTE, settings.LLM_PROJECT_BURST),
+        max_in_flight=settings.LLM_MAX_IN_FLIGHT,
+        queue_timeout=settings.LLM_QUEUE_TIMEOUT_SECONDS,
+        shed_queue_seconds=settings.LLM_SHED_QUEUE_SECONDS,
+    )
+
+
+def llm_admission_dependency(
+    request: Request,
+    current_user: User = Depends(get_current_user_dependency),
+) -> Generator[None, None, None]:
+    """FastAPI dependency for LLM-backed routes: admit the request or raise 429/503."""
+    with get_llm_admission().admit(current_user.id, request.path_params.get("project_id")):
+        yield
@@ -0,0 +1,311 @@
+"""Columnar (Parquet / Arrow IPC) export of discovery data for analysis.
+
+The nested JSON columns are flattened into four tables:
+
+- sessions: one row per discovery session with status, phase, timestamps and
+  message, turn, flag and approved-phase counts;
+- messages: one row per transcript message (seq, role, content, length);
+- phase_summaries: one row per session and phase with its current summary
+  (status, revision count, first-drafted and approved times, so phase durations
+  can be derived; earlier revisions are not kept);
+- flagged_items: one row per out-of-scope flag.
+
+Sessions are read with yield_per in batches of EXPORT_BATCH_SIZE and rows are
+written in record batches of ANALYTICS_EXPORT_BATCH_ROWS, so memory stays at
+about one batch per table however many messages there are. The command writes a
+hive-partitioned dataset (<table>/project_id=<id>/part-0.parquet, read with
+pq.read_table(out_dir / "sessions")), where project_id comes from the directory
+rather than a column; the API streams one table of one project, with project_id
+as a column.
+
+Requires pyarrow (in requirements.txt); without it the export reports that it is
+unavailable.
+"""
+
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.project import ProjectUser
+from app.models.session import DiscoverySession, PhaseSummary, PhaseSummaryStatus
+from app.services.archive import load_transcript
+from app.services.export import ChunkSink
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+TABLES = ("sessions", "messages", "phase_summaries", "flagged_items")
+FORMATS = ("parquet", "arrow")
+
+
+def table_schemas() -> dict[str, "pa.Schema"]:
+    timestamp = pa.timestamp("us", tz="UTC")
+    return {
+        "sessions": pa.schema([
+            ("project_id", pa.string()),
+            ("session_id", pa.string()),
+            ("project_user_id", pa.string()),
+            ("status", pa.string()),
+            ("current_phase", pa.int8()),
+            ("started_at", timestamp),
+            ("completed_at", timestamp),
+            ("message_count", pa.int32()),
+            ("user_turns", pa.int32()),
+            ("assistant_turns", pa.int32()),
+            ("flagged_count", pa.int32()),
+            ("phases_approved", pa.int8()),
+        ]),
+        "messages": pa.schema([
+            ("project_id", pa.string()),
+            ("session_id", pa.string()),
+            ("seq", pa.int32()),
+            ("role", pa.string()),
+            ("content", pa.large_string()),
+            ("content_chars", pa.int32()),
+        ]),
+        "phase_summaries": pa.schema([
+            ("project_id", pa.string()),
+            ("session_id", pa.string()),
+            ("phase", pa.int8()),
+            ("status", pa.string()),
+            ("version", pa.int32()),
+            ("created_at", timestamp),
+            ("approved_at", timestamp),
+            ("content", pa.large_string()),
+        ]),
+        "flagged_items": pa.schema([
+            ("project_id", pa.string()),
+            ("session_id", pa.string()),
+            ("seq", pa.int32()),
+            ("phase", pa.int8()),
+            ("mention", pa.string()),
+            ("user_input", pa.large_string()),
+        ]),
+    }
+
+
+def _session_rows(
+    db: Session,
+    tables: set[str],
+    project_id: UUID | None,
+    read_batch: int,
+) -> Iterator[tuple[str, str, dict[str, Any]]]:
+    """Yield (table, project_id, row) for the sessions, messages and flagged_items tables."""
+    phases_approved = (
+        select(func.count())
+        .where(
+            PhaseSummary.session_id == DiscoverySession.id,
+            PhaseSummary.status == PhaseSummaryStatus.APPROVED,
+        )
+        .correlate(DiscoverySession)
+        .scalar_subquery()
+    )
+    stmt = select(ProjectUser.project_id, DiscoverySession, phases_approved).join(
+        ProjectUser, ProjectUser.id == DiscoverySession.project_user_id
+    )
+    if project_id is not None:
+        stmt = stmt.where(ProjectUser.project_id == project_id)
+    stmt = stmt.order_by(ProjectUser.project_id, DiscoverySession.id).execution_options(yield_per=read_batch)
+    for row_project_id, session, approved_count in db.execute(stmt):
+        pid, sid = str(row_project_id), str(session.id)
+        flags = session.flagged_items or []
+        # Archived transcripts are only read when a table needs them.
+        transcript = load_transcript(session) if tables & {"sessions", "messages"} else []
+        if "sessions" in tables:
+            roles = [m.get("role") for m in transcript if isinstance(m, dict)]
+            yield "sessions", pid, {
+                "project_id": pid,
+                "session_id": sid,
+                "project_user_id": str(session.project_user_id),
+                "status": session.status.value,
+                "current_phase": session.current_phase,
+                "started_at": session.started_at,
+                "completed_at": session.completed_at,
+                "message_count": len(transcript),
+                "user_turns": roles.count("user"),
+                "assistant_turns": roles.count("assistant"),
+                "flagged_count": len(flags),
+                "phases_approved": approved_count,
+            }
+        if "messages" in tables:
+            for seq, message in enumerate(transcript):
+                content = message.get("content") if isinstance(message, dict) else None
+                if not isinstance(content, str):
+                    content = None if content is None else str(content)
+                yield "messages", pid, {
+                    "project_id": pid,
+                    "session_id": sid,
+                    "seq": seq,
+                    "role": message.get("role") if isinstance(message, dict) else None,
+                    "content": content,
+                    "content_chars": len(content) if content is not None else 0,
+                }
+        if "flagged_items" in tables:
+            for seq, item in enumerate(flags):
+                item = item if isinstance(item, dict) else {}
+                yield "flagged_items", pid, {
+                    "project_id": pid,
+                    "session_id": sid,
+                    "seq": seq,
+                    "phase": item.get("phase"),
+                    "mention": item.get("mention"),
+                    "user_input": item.get("user_input"),
+                }
+
+
+def _summary_rows(
+    db: Session,
+    project_id: UUID | None,
+    read_batch: int,
+) -> Iterator[tuple[str, str, dict[str, Any]]]:
+    stmt = (
+        select(
+            ProjectUser.project_id,
+            PhaseSummary.session_id,
+            PhaseSummary.phase,
+            PhaseSummary.status,
+            PhaseSummary.version,
+            PhaseSummary.created_at,
+            PhaseSummary.approved_at,
+            PhaseSummary.content,
+        )
+        .join(DiscoverySession, DiscoverySession.id == PhaseSummary.session_id)
+        .join(ProjectUser, ProjectUser.id == DiscoverySession.project_user_id)
+    )
+    if project_id is not None:
+        stmt = stmt.where(ProjectUser.project_id == project_id)
+    stmt = stmt.order_by(ProjectUser.project_id, PhaseSummary.session_id, PhaseSummary.phase, PhaseSummary.version)
+    for row in db.execute(stmt.execution_options(yield_per=read_batch)):
+        pid = str(row.project_id)
+        yield "phase_summaries", pid, {
+            "project_id": pid,
+            "session_id": str(row.session_id),
+            "phase": row.phase,
+            "status": row.status.value,
+            "version": row.version,
+            "created_at": row.created_at,
+            "approved_at": row.approved_at,
+            "content": row.content,
+        }
+
+
+def iter_rows(
+    db: Session,
+    tables: set[str],
+    project_id: UUID | None,
+    read_batch: int,
+) -> Iterator[tuple[str, str, dict[str, Any]]]:
+    """Yield (table, project_id, row) for the requested tables, grouped by project within each scan."""
+    if tables & {"sessions", "messages", "flagged_items"}:
+        yield from _session_rows(db, tables, project_id, read_batch)
+    if "phase_summaries" in tables:
+        # Summaries are small rows; read them in larger batches than sessions.
+        yield from _summary_rows(db, project_id, read_batch * 10)
+
+
+class _BatchWriter:
+    """Buffers one table's rows and writes them as record batches to a Parquet or Arrow IPC writer."""
+
+    def __init__(self, writer: Any, schema: "pa.Schema", batch_size: int) -> None:
+        self.writer = writer
+        self.schema = schema
+        self.batch_size = batch_size
+        self.rows: list[dict[str, Any]] = []
+        self.written = 0
+
+    def add(self, row: dict[str, Any]) -> bool:
+        """Buffer row; returns True when a batch was written."""
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+            return True
+        return False
+
+    def flush(self) -> None:
+        if self.rows:
+            self.writer.write_batch(pa.RecordBatch.from_pylist(self.rows, schema=self.schema))
+            self.written += len(self.rows)
+            self.rows.clear()
+
+    def close(self) -> None:
+        self.flush()
+        self.writer.close()
+
+
+def _open_writer(sink: Any, schema: "pa.Schema", format: str) -> Any:
+    if format == "arrow":
+        return pa.ipc.new_stream(sink, schema)
+    return pq.ParquetWriter(sink, schema, compression="zstd")
+
+
+def write_dataset(
+    db: Session,
+    out_dir: Path,
+    project_id: UUID | None,
+    read_batch: int,
+    batch_rows: int,
+    tables: tuple[str, ...] = TABLES,
+    log: Callable[[str], None] = print,
+) -> dict[str, int]:
+    """Write the tables as Parquet under out_dir, one file per table and project. Returns rows per table."""
+    # project_id is the partition key; also writing it as a column would clash with the
+    # dictionary-typed column readers derive from the directory names.
+    schemas = {
+        table: schema.remove(schema.get_field_index("project_id"))
+        for table, schema in table_schemas().items()
+    }
+    open_writers: dict[str, tuple[str, _BatchWriter]] = {}
+    counts = dict.fromkeys(tables, 0)
+
+    def close(table: str) -> None:
+        pid, writer = open_writers.pop(table)
+        writer.close()
+        counts[table] += writer.written
+        log(f"{table}/project_id={pid}: {writer.written} rows")
+
+    try:
+        for table, pid, row in iter_rows(db, set(tables), project_id, read_batch):
+            current = open_writers.get(table)
+            if current is not None and current[0] != pid:
+                close(table)
+                current = None
+            if current is None:
+                path = out_dir / table / f"project_id={pid}" / "part-0.parquet"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                writer = _BatchWriter(_open_writer(path, schemas[table], "parquet"), schemas[table], batch_rows)
+                current = open_writers[table] = (pid, writer)
+            current[1].add(row)
+    finally:
+        for table in list(open_writers):
+            close(table)
+    return counts
+
+
+def stream_table(
+    session_factory: Callable[[], Session],
+    table: str,
+    project_id: UUID,
+    format: str,
+    read_batch: int,
+    batch_rows: int,
+) -> Iterator[bytes]:
+    """Body of one table for one project as a Parquet file or an Arrow IPC stream, batch by batch."""
+    schema = table_schemas()[table]
+    sink = ChunkSink()
+    db = session_factory()
+    try:
+        writer = _BatchWriter(_open_writer(sink, schema, format), schema, batch_rows)
+        for _, _, row in iter_rows(db, {table}, project_id, read_batch):
+            if writer.add(row) and sink.size:
+                yield sink.drain()
+        writer.close()
+        yield sink.drain()
+    finally:
+        db.close()
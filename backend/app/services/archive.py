@@ -0,0 +1,138 @@
+"""Cold-storage archive for transcripts of completed discovery sessions.
+
+Completed transcripts are moved out of discovery_sessions into append-only
+segment files under ARCHIVE_DIR. Each record is::
+
+    16-byte session id | 4-byte big-endian payload length | payload
+
+where payload is the transcript JSON compressed with app.models.types.compress.
+The session row keeps its summaries and metadata plus a pointer
+(archive_segment, archive_offset, archive_length) to the payload, so reads are a
+single slice of a memory-mapped segment. Records are self-describing, so the
+pointers can be rebuilt by scanning segments if ever needed.
+
+ARCHIVE_DIR must be on persistent storage shared by every worker.
+"""
+
+import fcntl
+import json
+import mmap
+import os
+import struct
+import threading
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.session import DiscoverySession, SessionStatus
+from app.models.types import compress, decompress
+
+_RECORD_HEADER = struct.Struct(">16sI")
+_SEGMENT_PATTERN = "segment-*.seg"
+
+
+class SegmentStore:
+    """Append-only segment files with memory-mapped reads."""
+
+    def __init__(self, root: Path, max_segment_bytes: int) -> None:
+        self.root = root
+        self.max_segment_bytes = max_segment_bytes
+        self._lock = threading.Lock()
+        self._maps: dict[str, mmap.mmap] = {}
+
+    def _segments(self) -> list[Path]:
+        return sorted(self.root.glob(_SEGMENT_PATTERN))
+
+    def _writable_segment(self) -> Path:
+        segments = self._segments()
+        if segments and segments[-1].stat().st_size < self.max_segment_bytes:
+            return segments[-1]
+        next_num = int(segments[-1].stem.split("-")[1]) + 1 if segments else 1
+        return self.root / f"segment-{next_num:06d}.seg"
+
+    def append(self, session_id: UUID, payload: bytes) -> tuple[str, int, int]:
+        """Durably append a record. Returns (segment name, payload offset, payload length)."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            path = self._writable_segment()
+            with open(path, "ab") as f:
+                # Cross-process guard: the archive job and an ad-hoc run must not interleave records.
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    offset = f.seek(0, os.SEEK_END)
+                    f.write(_RECORD_HEADER.pack(session_id.bytes, len(payload)))
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+        return path.name, offset + _RECORD_HEADER.size, len(payload)
+
+    def read(self, segment: str, offset: int, length: int) -> bytes:
+        """Return the payload stored at offset in segment."""
+        with self._lock:
+            mapped = self._maps.get(segment)
+            if mapped is None or offset + length > len(mapped):
+                # Not mapped yet, or the segment has grown since it was mapped
+                if mapped is not None:
+                    mapped.close()
+                with open(self.root / segment, "rb") as f:
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._maps[segment] = mapped
+            return mapped[offset:offset + length]
+
+
+@lru_cache
+def get_archive_store() -> SegmentStore:
+    """Return the process-wide segment store for ARCHIVE_DIR."""
+    settings = get_settings()
+    return SegmentStore(Path(settings.ARCHIVE_DIR), settings.ARCHIVE_SEGMENT_MAX_BYTES)
+
+
+def load_transcript(session: DiscoverySession) -> list[Any]:
+    """Return the session's messages, reading them from the archive if the session was archived."""
+    if session.archived_at is None:
+        return session.all_messages if session.all_messages is not None else []
+    payload = get_archive_store().read(session.archive_segment, session.archive_offset, session.archive_length)
+    return json.loads(decompress(payload))
+
+
+def archive_completed_sessions(db: Session, min_age_days: int, limit: int | None = None) -> int:
+    """Move transcripts of sessions completed at least min_age_days ago into the archive.
+
+    Each session is committed individually after its record is fsync'd, so a crash
+    leaves at most one orphaned (unreferenced) record in a segment. Returns count archived.
+    """
+    store = get_archive_store()
+    cutoff = datetime.now(timezone.utc) - timedelta(days=min_age_days)
+    stmt = (
+        select(DiscoverySession)
+        .where(
+            DiscoverySession.status == SessionStatus.COMPLETED,
+            DiscoverySession.archived_at.is_(None),
+            DiscoverySession.completed_at <= cutoff,
+        )
+        .order_by(DiscoverySession.completed_at)
+    )
+    if limit is not None:
+        stmt = stmt.limit(limit)
+
+    archived = 0
+    for session in db.execute(stmt).scalars().all():
+        messages = session.all_messages or []
+        payload = compress(json.dumps(messages, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+        segment, offset, length = store.append(session.id, payload)
+        session.archive_segment = segment
+        session.archive_offset = offset
+        session.archive_length = length
+        session.archived_at = datetime.now(timezone.utc)
+        session.all_messages = []
+        db.commit()
+        archived += 1
+    return archived
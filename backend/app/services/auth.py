@@ -12,6 +12,8 @@ from sqlalchemy.orm import Session
 from app.config import get_settings
 from app.database import get_db
 from app.models.user import User
+from app.services.auth_cache import auth_cache
+from app.services.password_pool import get_password_pool
 
 oauth2_scheme = HTTPBearer()
 
@@ -29,33 +31,87 @@ def create_access_token(user_id: UUID) -> str:
 
 def verify_token(token: str) -> UUID | None:
     """Validate JWT and return user_id if valid, else None."""
+    claims = _decode_token(token)
+    return claims[0] if claims else None
+
+
+def _decode_token(token: str) -> tuple[UUID, float] | None:
+    """Validate JWT and return (user_id, expiry as a unix timestamp) if valid, else None."""
     settings = get_settings()
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
         sub = payload.get("sub")
         if sub is None:
             return None
-        return UUID(sub)
-    except (JWTError, ValueError):
+        return UUID(sub), float(payload.get("exp", 0))
+    except (JWTError, ValueError, TypeError):
         return None
 
 
 def hash_password(password: str) -> str:
-    """Hash password with bcrypt."""
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    """Hash password with bcrypt at BCRYPT_ROUNDS, on the password pool."""
+    salt = bcrypt.gensalt(rounds=get_settings().BCRYPT_ROUNDS)
+    return get_password_pool().run(bcrypt.hashpw, password.encode("utf-8"), salt).decode("utf-8")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify plain password against bcrypt hash."""
-    return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
+    """Verify plain password against bcrypt hash, on the password pool."""
+    return get_password_pool().run(bcrypt.checkpw, plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password for async handlers: awaits the pool instead of blocking a thread."""
+    salt = bcrypt.gensalt(rounds=get_settings().BCRYPT_ROUNDS)
+    hashed = await get_password_pool().run_async(bcrypt.hashpw, password.encode("utf-8"), salt)
+    return hashed.decode("utf-8")
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password for async handlers: awaits the pool instead of blocking a thread."""
+    return await get_password_pool().run_async(
+        bcrypt.checkpw, plain_password.encode("utf-8"), hashed_password.encode("utf-8")
+    )
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True if the hash was made with a cost other than BCRYPT_ROUNDS (hashes look like $2b$12$...)."""
+    try:
+        rounds = int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return True
+    return rounds != get_settings().BCRYPT_ROUNDS
 
 
 def get_current_user(db: Session, token: str) -> User | None:
-    """Return User for valid token, else None. Used by dependency."""
-    user_id = verify_token(token)
-    if user_id is None:
+    """Return User for valid token, else None. Used by dependency.
+
+    Recently verified tokens are answered from auth_cache without decoding or querying.
+    """
+    cached = auth_cache.get(token)
+    if cached is not None:
+        return db.merge(cached, load=False)
+    claims = _decode_token(token)
+    if claims is None:
+        return None
+    user_id, expires_at = claims
+    generation = auth_cache.generation()
+    user = db.get(User, user_id)
+    if user is not None:
+        auth_cache.put(token, user, expires_at, generation)
+    return user
+
+
+def authenticate_token(db: Session, token: str) -> tuple[User, float] | None:
+    """Return (User, token expiry as a unix timestamp) for a valid token, else None.
+
+    For long-lived connections, which authenticate once and must stop at the expiry."""
+    claims = _decode_token(token)
+    if claims is None:
+        return None
+    user = get_current_user(db, token)
+    if user is None:
         return None
-    return db.get(User, user_id)
+    return user, claims[1]
 
 
 def get_current_user_dependency(
@@ -0,0 +1,142 @@
+"""Cache of verified bearer tokens for the auth dependency.
+
+Every authenticated request decodes its JWT and loads the user before the
+handler runs. The cache maps a token to a detached snapshot of its user's
+columns; a hit skips both, and the snapshot is attached to the request's
+session with merge(load=False), which emits no SQL.
+
+Entries live for AUTH_CACHE_TTL_SECONDS (never past the token's own expiry).
+Any committed change to a User drops that user's entries in this process; other
+workers keep theirs until the TTL runs out, which bounds how stale a user's
+role, profile or assessment flag can be. AUTH_CACHE_TTL_SECONDS=0 disables it.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.config import get_settings
+from app.database import RoutingSession
+from app.models.user import User
+
+
+@dataclass
+class _Entry:
+    user: User
+    expires_at: float
+
+
+class AuthCache:
+    """Bounded LRU of token -> detached User snapshot, with hit/miss counters."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation, so a user loaded before one is not cached after it.
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, token: str) -> User | None:
+        """Return the cached snapshot for token, or None. Attach it with db.merge(user, load=False)."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None and entry.expires_at <= time.time():
+                del self._entries[token]
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self._hits += 1
+            return entry.user
+
+    def put(self, token: str, user: User, token_expires_at: float, generation: int) -> None:
+        """Cache a snapshot of user, loaded while generation() was generation."""
+        if not self.enabled:
+            return
+        entry = _Entry(
+            user=_snapshot(user),
+            expires_at=min(time.time() + self.ttl_seconds, token_expires_at),
+        )
+        with self._lock:
+            if generation != self._generation:
+                return  # The user may have changed since it was loaded
+            self._entries[token] = entry
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_users(self, user_ids: set[UUID]) -> None:
+        """Drop every cached token of the given users."""
+        with self._lock:
+            self._generation += 1
+            self._invalidations += 1
+            stale = [token for token, entry in self._entries.items() if entry.user.id in user_ids]
+            for token in stale:
+                del self._entries[token]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "invalidations": self._invalidations,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+
+
+def _snapshot(user: User) -> User:
+    """Detached copy of user's column values, safe to share between sessions and threads."""
+    copy = User(**{attr.key: getattr(user, attr.key) for attr in User.__mapper__.column_attrs})
+    make_transient_to_detached(copy)
+    return copy
+
+
+_settings = get_settings()
+auth_cache = AuthCache(_settings.AUTH_CACHE_TTL_SECONDS, _settings.AUTH_CACHE_MAX_ENTRIES)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _collect_changed_users(session: Session, flush_context) -> None:
+    changed = {obj.id for obj in (*session.dirty, *session.deleted) if isinstance(obj, User)}
+    if changed:
+        session.info.setdefault("auth_changed_users", set()).update(changed)
+        # Also drop them now, so the window before commit can't re-cache the old row.
+        auth_cache.invalidate_users(changed)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _invalidate_changed_users(session: Session) -> None:
+    changed = session.info.pop("auth_changed_users", None)
+    if changed:
+        auth_cache.invalidate_users(changed)
+
+
+@event.listens_for(RoutingSession, "after_soft_rollback")
+def _forget_changed_users(session: Session, previous_transaction) -> None:
+    session.info.pop("auth_changed_users", None)
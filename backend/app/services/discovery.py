@@ -3,11 +3,18 @@
 Refactored from backend/discovery_session.py to work with database models and API.
 """
 
-from typing import Any
-
-from anthropic import Anthropic
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 
 from app.config import get_settings
+from app.metrics import llm_request_duration, observe_llm_usage
+from app.tracing import span
+
+if TYPE_CHECKING:
+    from anthropic import Anthropic
 
 # Communication style dimensions (option order A,B,C,D in assessment)
 STYLE_DIMENSIONS = ["Detail-oriented", "Big-picture", "Story-driven", "Problem-focused"]
@@ -166,12 +173,52 @@ PHASE_COMPLETION_INSTRUCTION = (
 )
 
 
-def _get_client() -> Anthropic:
-    """Return Anthropic client using config API key."""
+@lru_cache
+def _get_client() -> "Anthropic":
+    """Return the process-wide Anthropic client, built on first use.
+
+    anthropic takes over a second to import, so it is imported here rather than at
+    startup; sharing one client also reuses its connection pool across requests.
+    """
+    from anthropic import Anthropic
+
     settings = get_settings()
     return Anthropic(api_key=settings.ANTHROPIC_API_KEY)
 
 
+def warm_up_client() -> None:
+    """Import anthropic and build the client ahead of the first LLM call."""
+    _get_client()
+
+
+@contextmanager
+def _llm_call(operation: str, model: str) -> Iterator[Any]:
+    """Trace and time one Anthropic call; yields the span (None when tracing is off)."""
+    started = time.perf_counter()
+    outcome = "error"
+    with span(f"anthropic {operation}", **{"gen_ai.system": "anthropic", "gen_ai.request.model": model}) as llm_span:
+        try:
+            yield llm_span
+            outcome = "ok"
+        finally:
+            llm_request_duration.observe(time.perf_counter() - started, operation, outcome)
+
+
+def _record_usage(llm_span: Any, operation: str, usage: Any) -> None:
+    observe_llm_usage(operation, usage)
+    if llm_span is not None and usage is not None:
+        llm_span.set_attribute("gen_ai.usage.input_tokens", usage.input_tokens)
+        llm_span.set_attribute("gen_ai.usage.output_tokens", usage.output_tokens)
+
+
+def _create_message(operation: str, **kwargs: Any) -> Any:
+    """client.messages.create(**kwargs), traced and timed under operation."""
+    with _llm_call(operation, kwargs["model"]) as llm_span:
+        response = _get_client().messages.create(**kwargs)
+        _record_usage(llm_span, operation, getattr(response, "usage", None))
+    return response
+
+
 def calculate_style_profile(responses: list[dict]) -> dict[str, Any]:
     """Compute scores and primary/secondary style from assessment responses.
 
@@ -312,8 +359,8 @@ Do NOT create a comprehensive narrative. Keep it brief and scannable.
 Summary (5-10 bullet points):"""
 
     try:
-        client = _get_client()
-        response = client.messages.create(
+        response = _create_message(
+            "generate_phase_summary",
             model="claude-sonnet-4-5",
             max_tokens=800,
             messages=[{"role": "user", "content": prompt}],
@@ -336,7 +383,6 @@ def review_and_approve_summary(
     if action == "approve":
         return None  # caller stores initial_summary as approved
 
-    client = _get_client()
     if action == "request_changes" and feedback:
         prompt = f"""The user requested changes to this brief summary:
 
@@ -371,7 +417,8 @@ Updated Summary:"""
         return initial_summary
 
     try:
-        response = client.messages.create(
+        response = _create_message(
+            "review_and_approve_summary",
             model="claude-sonnet-4-5",
             max_tokens=1200,
             messages=[{"role": "user", "content": prompt}],
@@ -450,8 +497,8 @@ In your analysis of flagged items, be thoughtful and selective. Only recommend s
 Format this as a clear, professional document. Use bullet points and clear headings."""
 
     try:
-        client = _get_client()
-        response = client.messages.create(
+        response = _create_message(
+            "generate_final_report",
             model="claude-sonnet-4-5",
             max_tokens=4096,
             messages=[{"role": "user", "content": prompt}],
@@ -540,8 +587,8 @@ Create a consolidated discovery report with the following structure. Be specific
 Format as a clear, professional document with markdown headings and bullet points. Be concise but comprehensive."""
 
     try:
-        client = _get_client()
-        response = client.messages.create(
+        response = _create_message(
+            "generate_consolidated_report",
             model="claude-sonnet-4-5",
             max_tokens=8192,
             messages=[{"role": "user", "content": prompt}],
@@ -603,8 +650,8 @@ Important style guidelines:
 """
 
     try:
-        client = _get_client()
-        response = client.messages.create(
+        response = _create_message(
+            "generate_phase_break_offer_message",
             model="claude-sonnet-4-5",
             max_tokens=400,
             messages=[{"role": "user", "content": prompt}],
@@ -628,8 +675,43 @@ Important style guidelines:
 
 def get_assistant_reply(system_prompt: str, messages: list[dict]) -> str:
     """Single turn: send messages to Claude with system prompt, return assistant reply text."""
-    client = _get_client()
+    response = _create_message(
+        "get_assistant_reply",
+        model="claude-sonnet-4-5",
+        max_tokens=1024,
+        system=system_prompt,
+        messages=_conversation_turns(messages),
+    )
+
+    # Handle empty response
+    if not response.content:
+        return _EMPTY_REPLY
+
+    return response.content[0].text
+
+
+def stream_assistant_reply(system_prompt: str, messages: list[dict], on_text: Callable[[str], None]) -> str:
+    """Like get_assistant_reply, but calls on_text with each chunk of the reply as it is generated."""
+    model = "claude-sonnet-4-5"
+    with _llm_call("stream_assistant_reply", model) as llm_span:
+        with _get_client().messages.stream(
+            model=model,
+            max_tokens=1024,
+            system=system_prompt,
+            messages=_conversation_turns(messages),
+        ) as stream:
+            for text in stream.text_stream:
+                on_text(text)
+            reply = stream.get_final_text()
+            _record_usage(llm_span, "stream_assistant_reply", getattr(stream.get_final_message(), "usage", None))
+    return reply or _EMPTY_REPLY
+
+
+_EMPTY_REPLY = "I'm ready to continue our conversation. Where would you like to pick up?"
+
 
+def _conversation_turns(messages: list[dict]) -> list[dict]:
+    """Transcript messages as alternating user/assistant turns starting and ending with the user."""
     # Filter to valid messages and ensure proper alternation
     valid_messages = []
     last_role = None
@@ -660,18 +742,7 @@ def get_assistant_reply(system_prompt: str, messages: list[dict]) -> str:
     if valid_messages and valid_messages[-1]["role"] == "assistant":
         valid_messages.append({"role": "user", "content": "Please continue."})
 
-    response = client.messages.create(
-        model="claude-sonnet-4-5",
-        max_tokens=1024,
-        system=system_prompt,
-        messages=valid_messages,
-    )
-
-    # Handle empty response
-    if not response.content:
-        return "I'm ready to continue our conversation. Where would you like to pick up?"
-
-    return response.content[0].text
+    return valid_messages
 
 
 def detect_out_of_scope(scope: str, message: str) -> str | None:
@@ -691,8 +762,8 @@ IN_SCOPE
 Be conservative - only flag things that are clearly outside the stated scope."""
 
     try:
-        client = _get_client()
-        response = client.messages.create(
+        response = _create_message(
+            "detect_out_of_scope",
             model="claude-sonnet-4-5",
             max_tokens=200,
             messages=[{"role": "user", "content": detection_prompt}],
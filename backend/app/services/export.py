@@ -0,0 +1,213 @@
+"""Bulk export of a project's discovery data as a streamed ZIP archive or NDJSON.
+
+Stakeholders are read with a server-side cursor (yield_per) in batches of
+EXPORT_BATCH_SIZE; each batch's approved summaries and cached final reports are
+fetched with one query apiece. Output is produced as it is read: the ZIP is
+written by zipfile to an unseekable sink (entries carry data descriptors, so
+nothing is seeked back to) and drained after every chunk. Memory therefore stays
+at about one batch and one transcript, whatever the size of the project.
+
+ZIP layout::
+
+    project.json
+    consolidated_report.md                    (if one was generated)
+    stakeholders/<email>/stakeholder.json     status, phase, flagged items, approved summaries
+    stakeholders/<email>/transcript.json
+    stakeholders/<email>/final_report.md      (if one is cached)
+
+NDJSON has one {"type": "project", ...} line, then one {"type": "stakeholder", ...}
+line per stakeholder with the same fields plus transcript and final_report.
+"""
+
+import io
+import json
+import re
+import zipfile
+from collections.abc import Iterator
+from datetime import date, datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, sessionmaker, undefer
+
+from app.models.project import Project, ProjectUser
+from app.models.report_generation import ReportGeneration, ReportGenerationState
+from app.models.session import DiscoverySession
+from app.models.user import User
+from app.services.archive import load_transcript
+from app.services.phase_summary import get_approved_summaries_by_session
+from app.services.report_flight import final_report_subject
+
+_FLUSH_BYTES = 64 * 1024
+
+
+class ChunkSink(io.RawIOBase):
+    """Write-only, unseekable file that buffers what a writer (zipfile, pyarrow) produces until drained."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: list[bytes] = []
+        self.size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        self.size = 0
+        return data
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _dumps(value: Any, indent: int | None = None) -> str:
+    return json.dumps(value, default=_json_default, ensure_ascii=False, indent=indent)
+
+
+def _project_record(project: Project) -> dict[str, Any]:
+    return {
+        "id": project.id,
+        "name": project.name,
+        "description": project.description,
+        "scope": project.scope,
+        "start_date": project.start_date,
+        "end_date": project.end_date,
+        "created_at": project.created_at,
+        "consolidated_report_generated_at": project.consolidated_report_generated_at,
+    }
+
+
+def _final_reports(db: Session, session_ids: list[UUID]) -> dict[UUID, str]:
+    """Latest cached final report per session, from completed single-flight generations."""
+    if not session_ids:
+        return {}
+    subjects = {final_report_subject(session_id): session_id for session_id in session_ids}
+    rows = db.execute(
+        select(ReportGeneration.subject, ReportGeneration.content)
+        .where(
+            ReportGeneration.subject.in_(subjects),
+            ReportGeneration.state == ReportGenerationState.COMPLETED,
+        )
+        .order_by(ReportGeneration.completed_at)
+    )
+    return {subjects[subject]: content for subject, content in rows if content is not None}
+
+
+def iter_stakeholders(db: Session, project_id: UUID, batch_size: int) -> Iterator[dict[str, Any]]:
+    """Yield one record per stakeholder, with transcript, summaries, flags and cached final report."""
+    stmt = (
+        select(ProjectUser, User.email, User.name, DiscoverySession)
+        .outerjoin(User, User.id == ProjectUser.user_id)
+        .outerjoin(DiscoverySession, DiscoverySession.project_user_id == ProjectUser.id)
+        .where(ProjectUser.project_id == project_id)
+        .order_by(ProjectUser.invited_at, ProjectUser.id)
+        .execution_options(yield_per=batch_size)
+    )
+    for batch in db.execute(stmt).partitions():
+        session_ids = [session.id for _, _, _, session in batch if session is not None]
+        summaries = get_approved_summaries_by_session(db, session_ids)
+        final_reports = _final_reports(db, session_ids)
+        for project_user, email, name, session in batch:
+            record: dict[str, Any] = {
+                "project_user_id": project_user.id,
+                "user_id": project_user.user_id,
+                "email": email if project_user.user_id else project_user.invited_email or "",
+                "name": name if project_user.user_id else project_user.invited_name or "",
+                "status": project_user.status.value,
+                "invited_at": project_user.invited_at,
+                "activated_at": project_user.activated_at,
+                "session_id": None,
+                "discovery_status": None,
+                "current_phase": None,
+                "started_at": None,
+                "completed_at": None,
+                "flagged_items": [],
+                "phase_summaries": {},
+                "transcript": [],
+                "final_report": None,
+            }
+            if session is not None:
+                record.update(
+                    session_id=session.id,
+                    discovery_status=session.status.value,
+                    current_phase=session.current_phase,
+                    started_at=session.started_at,
+                    completed_at=session.completed_at,
+                    flagged_items=session.flagged_items or [],
+                    phase_summaries=summaries.get(session.id, {}),
+                    transcript=load_transcript(session),
+                    final_report=final_reports.get(session.id),
+                )
+            yield record
+
+
+def export_ndjson(session_factory: sessionmaker, project_id: UUID, batch_size: int) -> Iterator[bytes]:
+    db = session_factory()
+    try:
+        project = db.get(Project, project_id, options=[undefer(Project.consolidated_report)])
+        if project is None:
+            return
+        header = {"type": "project", **_project_record(project), "consolidated_report": project.consolidated_report}
+        yield (_dumps(header) + "\n").encode("utf-8")
+        for record in iter_stakeholders(db, project_id, batch_size):
+            yield (_dumps({"type": "stakeholder", **record}) + "\n").encode("utf-8")
+    finally:
+        db.close()
+
+
+def _entry_dir(record: dict[str, Any], used: set[str]) -> str:
+    name = re.sub(r"[^A-Za-z0-9@._-]+", "_", record["email"]).strip("._") or str(record["project_user_id"])
+    if name in used:
+        name = f"{name}-{record['project_user_id']}"
+    used.add(name)
+    return f"stakeholders/{name}"
+
+
+def export_zip(session_factory: sessionmaker, project_id: UUID, batch_size: int) -> Iterator[bytes]:
+    db = session_factory()
+    sink = ChunkSink()
+    try:
+        project = db.get(Project, project_id, options=[undefer(Project.consolidated_report)])
+        if project is None:
+            return
+        with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+
+            def write(name: str, text: str) -> Iterator[bytes]:
+                with archive.open(name, "w", force_zip64=True) as entry:
+                    data = text.encode("utf-8")
+                    for start in range(0, len(data), _FLUSH_BYTES):
+                        entry.write(data[start:start + _FLUSH_BYTES])
+                        if sink.size >= _FLUSH_BYTES:
+                            yield sink.drain()
+                if sink.size:
+                    yield sink.drain()
+
+            yield from write("project.json", _dumps(_project_record(project), indent=2))
+            if project.consolidated_report:
+                yield from write("consolidated_report.md", project.consolidated_report)
+            used: set[str] = set()
+            for record in iter_stakeholders(db, project_id, batch_size):
+                directory = _entry_dir(record, used)
+                transcript = record.pop("transcript")
+                final_report = record.pop("final_report")
+                yield from write(f"{directory}/stakeholder.json", _dumps(record, indent=2))
+                yield from write(f"{directory}/transcript.json", _dumps(transcript, indent=2))
+                if final_report:
+                    yield from write(f"{directory}/final_report.md", final_report)
+        # Central directory, written on close.
+        yield sink.drain()
+    finally:
+        db.close()
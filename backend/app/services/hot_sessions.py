@@ -0,0 +1,326 @@
+"""Write-behind in-memory store for active discovery sessions.
+
+Regular chat turns are the hot path: they only append to a session's transcript
+(and occasionally its flagged items). With HOT_SESSION_STORE_ENABLED, an
+IN_PROGRESS session is cached in process memory after its first DB-backed turn;
+later turns read the cached state, append to it, and return without touching the
+database. Appends are made durable first in a per-worker journal (one fsync'd
+JSON line per turn) and written to discovery_sessions by a background flusher,
+coalescing several turns into one UPDATE.
+
+Everything else (phase commands, summaries, GET /api/session, SA changes to the
+stakeholder) evicts the user's entry first, flushing pending turns, and then
+works on the database as before. The cache is per process, so it is only
+coherent when a stakeholder's requests reach the same process (a single worker
+or sticky routing); leave it disabled otherwise.
+
+Journal files are named journal-<pid>-<random>.log, so a worker that reuses a dead
+worker's pid never takes over its file, and are exclusively flock'ed by their
+worker. On startup, recover_journals() replays any unlocked (orphaned) journal.
+Each entry records the transcript length it was appended at, so replay is
+idempotent.
+"""
+
+import fcntl
+import json
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, BinaryIO
+from uuid import UUID
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config import get_settings
+from app.models.project import ProjectUser
+from app.models.session import DiscoverySession
+
+_JOURNAL_PATTERN = "journal-*.log"
+
+
+@dataclass
+class HotSession:
+    """Cached state of one IN_PROGRESS session, as needed by a regular turn."""
+
+    session_id: UUID
+    user_id: UUID
+    scope: str
+    current_phase: int
+    messages: list[Any]
+    flagged_items: list[Any]
+    loaded_at: float = field(default_factory=time.monotonic)
+    pending_turns: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    # Serializes DB writes for this session so an older snapshot never lands after a newer one
+    flush_lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class HotSessionStore:
+    """LRU cache of hot sessions keyed by user id, with a journaled write-behind flusher."""
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        journal_dir: Path,
+        capacity: int,
+        ttl_seconds: float,
+        flush_interval: float,
+        max_pending_turns: int,
+    ) -> None:
+        self.session_factory = session_factory
+        self.capacity = capacity
+        self.ttl_seconds = ttl_seconds
+        self.flush_interval = flush_interval
+        self.max_pending_turns = max_pending_turns
+        self._sessions: OrderedDict[UUID, HotSession] = OrderedDict()
+        self._lock = threading.Lock()
+        self._journal_lock = threading.Lock()
+        self._pending_turns = 0
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._journal, self._journal_path = _open_own_journal(journal_dir)
+        self._flusher = threading.Thread(target=self._flush_loop, name="hot-session-flusher", daemon=True)
+        self._flusher.start()
+
+    # -- cache -----------------------------------------------------------------
+
+    def get(self, user_id: UUID) -> HotSession | None:
+        """Return the user's cached session, or None if absent or older than the TTL."""
+        with self._lock:
+            hot = self._sessions.get(user_id)
+            if hot is not None:
+                self._sessions.move_to_end(user_id)
+        if hot is not None and time.monotonic() - hot.loaded_at > self.ttl_seconds:
+            # Re-read from the database now and then so SA-side changes are picked up.
+            self.evict(user_id)
+            return None
+        return hot
+
+    def load(self, session: DiscoverySession, project_user: ProjectUser) -> HotSession:
+        """Cache a session read from the database and return its entry."""
+        hot = HotSession(
+            session_id=session.id,
+            user_id=project_user.user_id,
+            scope=project_user.project.scope,
+            current_phase=session.current_phase,
+            messages=list(session.all_messages or []),
+            flagged_items=list(session.flagged_items or []),
+        )
+        with self._lock:
+            self._sessions[hot.user_id] = hot
+            overflow = []
+            while len(self._sessions) > self.capacity:
+                overflow.append(self._sessions.popitem(last=False)[1])
+        for old in overflow:
+            self._flush_session(old)
+        return hot
+
+    def evict(self, user_id: UUID) -> None:
+        """Drop the user's entry after writing its pending turns to the database."""
+        with self._lock:
+            hot = self._sessions.pop(user_id, None)
+        if hot is None:
+            return
+        try:
+            self._flush_session(hot)
+        except Exception:
+            # Keep serving the cached state rather than letting callers read a stale row.
+            with self._lock:
+                self._sessions.setdefault(user_id, hot)
+            raise
+
+    # -- writes ----------------------------------------------------------------
+
+    def append(self, hot: HotSession, messages: list[Any], flagged_items: list[Any]) -> None:
+        """Durably append a turn's messages and flags. Returns once the journal entry is fsync'd."""
+        with hot.lock:
+            entry = {
+                "session_id": str(hot.session_id),
+                "message_base": len(hot.messages),
+                "messages": messages,
+                "flag_base": len(hot.flagged_items),
+                "flagged_items": flagged_items,
+            }
+            backlog = self._write_journal(entry)
+            hot.messages = hot.messages + messages
+            if flagged_items:
+                hot.flagged_items = hot.flagged_items + flagged_items
+            hot.pending_turns += 1
+        if backlog >= self.max_pending_turns:
+            # Bounded write-behind: the caller pays for a flush rather than letting the log grow.
+            self.flush()
+        else:
+            self._wakeup.set()
+
+    def _write_journal(self, entry: dict[str, Any]) -> int:
+        """Append and fsync an entry; returns the number of turns pending a flush, including it."""
+        line = json.dumps(entry, separators=(",", ":"), ensure_ascii=False).encode("utf-8") + b"\n"
+        with self._journal_lock:
+            self._journal.write(line)
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            # Counted under the journal lock so a concurrent truncate can't drop this entry.
+            with self._lock:
+                self._pending_turns += 1
+                return self._pending_turns
+
+    def flush(self) -> None:
+        """Write every session with pending turns to the database."""
+        with self._lock:
+            dirty = [hot for hot in self._sessions.values() if hot.pending_turns]
+        for hot in dirty:
+            self._flush_session(hot)
+
+    def _flush_session(self, hot: HotSession) -> None:
+        with hot.flush_lock:
+            with hot.lock:
+                if not hot.pending_turns:
+                    return
+                flushed = hot.pending_turns
+                messages = list(hot.messages)
+                flagged_items = list(hot.flagged_items)
+            db: Session = self.session_factory()
+            try:
+                result = db.execute(
+                    update(DiscoverySession)
+                    .where(DiscoverySession.id == hot.session_id)
+                    .values(all_messages=messages, flagged_items=flagged_items)
+                )
+                db.commit()
+            finally:
+                db.close()
+            with hot.lock:
+                hot.pending_turns -= flushed
+        if result.rowcount == 0:
+            # The session was deleted underneath us; stop serving it.
+            with self._lock:
+                if self._sessions.get(hot.user_id) is hot:
+                    del self._sessions[hot.user_id]
+        with self._lock:
+            self._pending_turns -= flushed
+            drained = self._pending_turns == 0
+        if drained:
+            with self._journal_lock:
+                # Everything journaled so far is in the database.
+                with self._lock:
+                    if self._pending_turns == 0:
+                        self._journal.truncate(0)
+
+    def _flush_loop(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                # Turns stay journaled and pending; the next pass retries.
+                print(f"[hot_sessions] flush failed: {e}")
+
+    def close(self) -> None:
+        """Stop the flusher, flush everything, and release the journal."""
+        self._stopped.set()
+        self._wakeup.set()
+        self._flusher.join(timeout=self.flush_interval + 5)
+        self.flush()
+        if self._pending_turns == 0:
+            self._journal_path.unlink(missing_ok=True)
+        self._journal.close()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"sessions": len(self._sessions), "pending_turns": self._pending_turns}
+
+
+def _open_own_journal(journal_dir: Path) -> tuple[BinaryIO, Path]:
+    """Create and lock this worker's journal. It is created under a temp name and renamed once
+    locked, so recover_journals() in another worker never mistakes it for an orphan."""
+    journal_dir.mkdir(parents=True, exist_ok=True)
+    name = f"journal-{os.getpid()}-{secrets.token_hex(4)}"
+    tmp = journal_dir / f"{name}.tmp"
+    f = open(tmp, "ab")
+    fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    path = journal_dir / f"{name}.log"
+    os.replace(tmp, path)
+    return f, path
+
+
+def _replay_entries(db: Session, entries: list[dict[str, Any]]) -> int:
+    """Apply journal entries not yet reflected in the database. Returns entries applied."""
+    applied = 0
+    sessions: dict[str, DiscoverySession | None] = {}
+    for entry in entries:
+        sid = entry["session_id"]
+        if sid not in sessions:
+            sessions[sid] = db.get(DiscoverySession, UUID(sid))
+        session = sessions[sid]
+        if session is None:
+            continue
+        messages = list(session.all_messages or [])
+        flagged_items = list(session.flagged_items or [])
+        if len(messages) == entry["message_base"]:
+            session.all_messages = messages + entry["messages"]
+            applied += 1
+        elif len(messages) < entry["message_base"] + len(entry["messages"]):
+            print(f"[hot_sessions] journal entry for session {sid} does not match the stored transcript; skipped")
+            continue
+        if entry["flagged_items"] and len(flagged_items) == entry["flag_base"]:
+            session.flagged_items = flagged_items + entry["flagged_items"]
+    db.commit()
+    return applied
+
+
+def recover_journals(session_factory: sessionmaker, journal_dir: Path) -> int:
+    """Replay journals left behind by workers that exited without flushing. Returns entries applied."""
+    if not journal_dir.is_dir():
+        return 0
+    applied = 0
+    for path in sorted(journal_dir.glob(_JOURNAL_PATTERN)):
+        with open(path, "rb") as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                continue  # Owned by a live worker
+            entries = []
+            for line in f.read().split(b"\n"):
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue  # Empty line, or a torn write at the tail
+            db = session_factory()
+            try:
+                applied += _replay_entries(db, entries)
+            finally:
+                db.close()
+            # Only delete the file we hold the lock on: if the name now points at another
+            # (live) journal, leave that one alone.
+            try:
+                held, current = os.fstat(f.fileno()), os.stat(path)
+            except FileNotFoundError:
+                continue
+            if (held.st_dev, held.st_ino) == (current.st_dev, current.st_ino):
+                path.unlink()
+    return applied
+
+
+@lru_cache
+def get_hot_session_store() -> HotSessionStore | None:
+    """Return this process's store, or None when HOT_SESSION_STORE_ENABLED is off."""
+    settings = get_settings()
+    if not settings.HOT_SESSION_STORE_ENABLED:
+        return None
+    from app.database import SessionLocal
+
+    return HotSessionStore(
+        SessionLocal,
+        Path(settings.HOT_SESSION_JOURNAL_DIR),
+        capacity=settings.HOT_SESSION_CAPACITY,
+        ttl_seconds=settings.HOT_SESSION_TTL_SECONDS,
+        flush_interval=settings.HOT_SESSION_FLUSH_INTERVAL_SECONDS,
+        max_pending_turns=settings.HOT_SESSION_MAX_PENDING_TURNS,
+    )
@@ -0,0 +1,198 @@
+"""Idempotency-Key support for LLM-backed endpoints.
+
+A request carrying an Idempotency-Key runs at most once per (user, endpoint,
+key). The key is claimed by inserting an IN_PROGRESS row before the work
+starts; the response is stored on the row when it finishes, and later requests
+with the same key get the stored response without calling the LLM again.
+
+Duplicates that arrive while the first request is still running wait for it:
+within a process they share the leader's result directly (SingleFlight); across
+workers they poll the row until it completes. Failed requests release their
+claim, so a retry runs again. Claims left IN_PROGRESS by a crashed worker can be
+taken over after IDEMPOTENCY_STALE_SECONDS; stored responses expire after
+IDEMPOTENCY_KEY_TTL_HOURS.
+"""
+
+import hashlib
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from typing import TypeVar
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.idempotency import IdempotencyKey, IdempotencyKeyState
+from app.services.inflight import SingleFlight
+
+M = TypeVar("M", bound=BaseModel)
+
+_POLL_INTERVAL_SECONDS = 0.25
+_MAX_KEY_LENGTH = 255
+
+_inflight = SingleFlight()
+
+
+def run_idempotent(
+    db: Session,
+    user_id: UUID,
+    endpoint: str,
+    key: str | None,
+    payload: str,
+    response_model: type[M],
+    compute: Callable[[], M],
+) -> M:
+    """Return compute()'s response, running it at most once for this user, endpoint and key.
+
+    db is the request's session, the one compute() works in. payload identifies the
+    request contents; reusing a key with a different payload is rejected with 422.
+    Without a key, compute() simply runs.
+    """
+    if key is None:
+        return compute()
+    if not key or len(key) > _MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Idempotency-Key must be 1-{_MAX_KEY_LENGTH} characters",
+        )
+    request_hash = hashlib.sha256(f"{endpoint}\n{payload}".encode("utf-8")).hexdigest()
+    return _inflight.do(
+        (user_id, endpoint, key, request_hash),
+        lambda: _run_with_claim(db, user_id, endpoint, key, request_hash, response_model, compute),
+    )
+
+
+def _run_with_claim(
+    request_db: Session,
+    user_id: UUID,
+    endpoint: str,
+    key: str,
+    request_hash: str,
+    response_model: type[M],
+    compute: Callable[[], M],
+) -> M:
+    db = SessionLocal()
+    try:
+        claim_id, stored = _claim_or_wait(db, user_id, endpoint, key, request_hash)
+        if stored is not None:
+            return response_model.model_validate_json(stored)
+
+        try:
+            response = compute()
+        except BaseException:
+            # compute() may have left the request's transaction holding the SQLite writer;
+            # release it first, or deleting the claim would wait on it until the pool times out.
+            request_db.rollback()
+            db.execute(delete(IdempotencyKey).where(IdempotencyKey.id == claim_id))
+            db.commit()
+            raise
+
+        db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.id == claim_id)
+            .values(
+                state=IdempotencyKeyState.COMPLETED,
+                response_body=response.model_dump_json(),
+                completed_at=datetime.now(timezone.utc),
+            )
+        )
+        db.commit()
+        return response
+    finally:
+        db.close()
+
+
+def _claim_or_wait(
+    db: Session,
+    user_id: UUID,
+    endpoint: str,
+    key: str,
+    request_hash: str,
+) -> tuple[UUID | None, str | None]:
+    """Claim the key, or wait for whoever holds it.
+
+    Returns (claim id, None) when this request should do the work, or
+    (None, stored response JSON) when another request already did.
+    """
+    settings = get_settings()
+    deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+    while True:
+        now = datetime.now(timezone.utc)
+        row = db.execute(
+            select(
+                IdempotencyKey,
+                (IdempotencyKey.created_at < now - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)).label("expired"),
+                (IdempotencyKey.created_at < now - timedelta(seconds=settings.IDEMPOTENCY_STALE_SECONDS)).label("stale"),
+            ).where(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.endpoint == endpoint,
+                IdempotencyKey.key == key,
+            )
+        ).first()
+
+        if row is None:
+            claim = IdempotencyKey(
+                user_id=user_id,
+                endpoint=endpoint,
+                key=key,
+                request_hash=request_hash,
+                state=IdempotencyKeyState.IN_PROGRESS,
+                created_at=now,
+            )
+            db.add(claim)
+            try:
+                db.commit()
+                return claim.id, None
+            except IntegrityError:
+                db.rollback()  # Lost the race to another request; look again
+                continue
+
+        existing, expired, stale = row
+        if expired:
+            # Past its TTL: forget it and treat the key as new (conditional, so only one request does)
+            db.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.id == existing.id,
+                    IdempotencyKey.created_at == existing.created_at,
+                )
+            )
+            db.commit()
+            continue
+        if existing.request_hash != request_hash:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail="Idempotency-Key was already used with a different request",
+            )
+        if existing.state == IdempotencyKeyState.COMPLETED:
+            return None, existing.response_body
+
+        if stale:
+            # Claim abandoned by a crashed worker: take it over (conditional, so only one request does)
+            taken_over = db.execute(
+                update(IdempotencyKey)
+                .where(
+                    IdempotencyKey.id == existing.id,
+                    IdempotencyKey.state == IdempotencyKeyState.IN_PROGRESS,
+                    IdempotencyKey.created_at == existing.created_at,
+                )
+                .values(created_at=now)
+            ).rowcount
+            db.commit()
+            if taken_over:
+                return existing.id, None
+            continue
+
+        # Still running in another request: wait for it to finish.
+        if time.monotonic() >= deadline:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still being processed",
+            )
+        time.sleep(_POLL_INTERVAL_SECONDS)
+        db.expire_all()
@@ -0,0 +1,106 @@
+"""Bounded worker pool for bcrypt.
+
+bcrypt is deliberately slow (~250 ms at cost 12). Run inline, a burst of logins
+or invite registrations occupies the request threadpool and stalls chat
+requests queued behind it. Hashing instead runs on BCRYPT_POOL_SIZE dedicated
+threads (bcrypt releases the GIL, so they run in parallel), and at most
+BCRYPT_MAX_QUEUE further requests may wait for one. Beyond that, callers are
+turned away with 503 and Retry-After instead of tying up another request thread.
+The login and register handlers are async and await the hash (run_async), so a
+sign-in waiting on bcrypt holds no request thread at all.
+"""
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import TypeVar
+
+from fastapi import HTTPException, status
+
+from app.config import get_settings
+
+T = TypeVar("T")
+
+
+class PasswordPool:
+    """Thread pool with an admission limit and queue metrics."""
+
+    def __init__(self, workers: int, max_queue: int) -> None:
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._admission = threading.BoundedSemaphore(workers + max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_seconds_total = 0.0
+
+    def run(self, fn: Callable[..., T], *args) -> T:
+        """Run fn(*args) on the pool and return its result; 503 if the pool is saturated.
+
+        Blocks the calling thread until done; async handlers use run_async instead.
+        """
+        return self._submit(fn, *args).result()
+
+    async def run_async(self, fn: Callable[..., T], *args) -> T:
+        """Like run, but awaits the result, so no request thread is held while bcrypt runs."""
+        return await asyncio.wrap_future(self._submit(fn, *args))
+
+    def _submit(self, fn: Callable[..., T], *args) -> Future:
+        """Admit and queue fn(*args). The slot is released when the job finishes, even if the
+        caller stopped waiting (a cancelled request), so admission tracks the work actually queued."""
+        if not self._admission.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many sign-in requests right now; please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        with self._lock:
+            self._in_flight += 1
+        try:
+            future = self._executor.submit(self._timed, time.monotonic(), fn, *args)
+        except BaseException:
+            self._done()
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future: Future | None = None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += 1
+        self._admission.release()
+
+    def _timed(self, submitted: float, fn: Callable[..., T], *args) -> T:
+        with self._lock:
+            self._running += 1
+            self._wait_seconds_total += time.monotonic() - submitted
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "running": self._running,
+                "queued": self._in_flight - self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_queue_wait_ms": 1000 * self._wait_seconds_total / self._completed if self._completed else 0.0,
+            }
+
+
+@lru_cache
+def get_password_pool() -> PasswordPool:
+    settings = get_settings()
+    return PasswordPool(settings.BCRYPT_POOL_SIZE, settings.BCRYPT_MAX_QUEUE)
@@ -0,0 +1,100 @@
+"""Phase summary service: pending/approved summaries per discovery session and phase."""
+
+from datetime import datetime, timezone
+from uuid import UUID
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.models.session import DiscoverySession, PhaseSummary, PhaseSummaryStatus
+
+
+def get_pending_summary(db: Session, session_id: UUID, phase: int) -> PhaseSummary | None:
+    """Return the phase's summary if it is awaiting approval."""
+    stmt = select(PhaseSummary).where(
+        PhaseSummary.session_id == session_id,
+        PhaseSummary.phase == phase,
+        PhaseSummary.status == PhaseSummaryStatus.PENDING,
+    )
+    return db.execute(stmt).scalars().first()
+
+
+def save_pending_summary(db: Session, session: DiscoverySession, phase: int, content: str) -> PhaseSummary:
+    """Store a newly generated summary for phase as PENDING, replacing any earlier draft. Does not commit."""
+    summary = db.execute(
+        select(PhaseSummary).where(PhaseSummary.session_id == session.id, PhaseSummary.phase == phase)
+    ).scalars().first()
+    if summary is None:
+        summary = PhaseSummary(session_id=session.id, phase=phase, content=content)
+        db.add(summary)
+    else:
+        summary.content = content
+        summary.status = PhaseSummaryStatus.PENDING
+        summary.version += 1
+        summary.approved_at = None
+    return summary
+
+
+def revise_pending_summary(summary: PhaseSummary, content: str) -> None:
+    """Replace a pending summary's content with a revision. Does not commit."""
+    summary.content = content
+    summary.version += 1
+
+
+def approve_pending_summary(db: Session, session_id: UUID, phase: int, version: int | None = None) -> str | None:
+    """Mark the phase's pending summary APPROVED and return its content, or None if none is pending.
+
+    One conditional UPDATE ... RETURNING. With version, only that revision is approved, so a
+    summary revised since it was read stays pending. Does not commit.
+    """
+    conditions = [
+        PhaseSummary.session_id == session_id,
+        PhaseSummary.phase == phase,
+        PhaseSummary.status == PhaseSummaryStatus.PENDING,
+    ]
+    if version is not None:
+        conditions.append(PhaseSummary.version == version)
+    stmt = (
+        update(PhaseSummary)
+        .where(*conditions)
+        .values(status=PhaseSummaryStatus.APPROVED, approved_at=datetime.now(timezone.utc))
+        .returning(PhaseSummary.content)
+        .execution_options(synchronize_session=False)
+    )
+    return db.execute(stmt).scalar()
+
+
+def get_approved_summaries(db: Session, session_id: UUID) -> dict[str, str]:
+    """Return {"<phase>": content} for the session's approved phases, in phase order."""
+    return get_approved_summaries_by_session(db, [session_id]).get(session_id, {})
+
+
+def get_approved_summaries_by_session(db: Session, session_ids: list[UUID]) -> dict[UUID, dict[str, str]]:
+    """Return {session_id: {"<phase>": content}} for approved summaries of the given sessions."""
+    if not session_ids:
+        return {}
+    stmt = (
+        select(PhaseSummary.session_id, PhaseSummary.phase, PhaseSummary.content)
+        .where(
+            PhaseSummary.session_id.in_(session_ids),
+            PhaseSummary.status == PhaseSummaryStatus.APPROVED,
+        )
+        .order_by(PhaseSummary.session_id, PhaseSummary.phase)
+    )
+    summaries: dict[UUID, dict[str, str]] = {}
+    for session_id, phase, content in db.execute(stmt):
+        summaries.setdefault(session_id, {})[str(phase)] = content
+    return summaries
+
+
+def get_phases_approved(db: Session, session_id: UUID) -> list[int]:
+    """Return the session's approved phase numbers, answered from the index alone."""
+    stmt = (
+        select(PhaseSummary.phase)
+        .where(
+            PhaseSummary.session_id == session_id,
+            PhaseSummary.status == PhaseSummaryStatus.APPROVED,
+        )
+        .order_by(PhaseSummary.phase)
+    )
+    return list(db.execute(stmt).scalars())
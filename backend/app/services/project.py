@@ -2,21 +2,28 @@
 
 import uuid
 from datetime import datetime, timezone
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import func, select
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import and_, case, func, select, update
+from sqlalchemy.orm import Session, object_session, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.models.project import Project, ProjectUser, ProjectUserStatus
-from app.models.session import DiscoverySession, SessionStatus
+from app.models.session import DiscoverySession, PhaseSummary, PhaseSummaryStatus, SessionStatus
 from app.models.user import User, UserRole
 from app.schemas.project import (
     ProjectCreate,
     ProjectProgressResponse,
     ProjectUpdate,
+    ProjectUserAdd,
+    ProjectUserBulkResult,
     ProjectUserResponse,
+    ProjectUsersBulkResponse,
 )
 from app.services.auth import hash_password
+from app.services.phase_summary import get_phases_approved
+from app.services.project_events import record_event
 
 
 def create_project(db: Session, user_id: UUID, project_data: ProjectCreate) -> Project:
@@ -32,7 +39,6 @@ def create_project(db: Session, user_id: UUID, project_data: ProjectCreate) -> P
     )
     db.add(project)
     db.commit()
-    db.refresh(project)
     return project
 
 
@@ -43,16 +49,100 @@ def get_user_projects(db: Session, user_id: UUID) -> list[Project]:
 
 
 def get_project(db: Session, project_id: UUID) -> Project | None:
-    """Return project by id, with project_users, user, and discovery session loaded."""
+    """Return project by id without loading its stakeholders (use the query helpers below for those)."""
+    return db.get(Project, project_id)
+
+
+# Session columns needed by dashboards and reports; transcripts are never loaded here.
+_SESSION_SUMMARY_COLUMNS = (
+    DiscoverySession.status,
+    DiscoverySession.current_phase,
+    DiscoverySession.flagged_items,
+)
+
+
+def get_project_user_responses(db: Session, project_id: UUID) -> list[ProjectUserResponse]:
+    """Return the project's stakeholders as response DTOs via a single column-projected query.
+
+    Approved phases come from an outer join on the phase_summaries index (one row per
+    approved phase), folded per stakeholder here; summary content is never read.
+    """
     stmt = (
-        select(Project)
-        .where(Project.id == project_id)
+        select(
+            ProjectUser.id,
+            ProjectUser.user_id,
+            ProjectUser.status,
+            ProjectUser.invited_at,
+            ProjectUser.activated_at,
+            ProjectUser.invite_token,
+            ProjectUser.invited_email,
+            ProjectUser.invited_name,
+            User.email,
+            User.name,
+            DiscoverySession.status.label("session_status"),
+            DiscoverySession.current_phase,
+            PhaseSummary.phase.label("approved_phase"),
+        )
+        .outerjoin(User, User.id == ProjectUser.user_id)
+        .outerjoin(DiscoverySession, DiscoverySession.project_user_id == ProjectUser.id)
+        .outerjoin(
+            PhaseSummary,
+            and_(
+                PhaseSummary.session_id == DiscoverySession.id,
+                PhaseSummary.status == PhaseSummaryStatus.APPROVED,
+            ),
+        )
+        .where(ProjectUser.project_id == project_id)
+        .order_by(ProjectUser.invited_at, ProjectUser.id, PhaseSummary.phase)
+    )
+    responses: dict[UUID, ProjectUserResponse] = {}
+    for row in db.execute(stmt):
+        response = responses.get(row.id)
+        if response is None:
+            response = responses[row.id] = ProjectUserResponse(
+                id=row.id,
+                user_id=row.user_id,
+                email=row.email if row.user_id else row.invited_email or "",
+                name=row.name if row.user_id else row.invited_name or "",
+                status=row.status,
+                invited_at=row.invited_at,
+                activated_at=row.activated_at,
+                invite_token=row.invite_token,
+                discovery_status=row.session_status.value if row.session_status else None,
+                current_phase=row.current_phase,
+                phases_approved=[],
+            )
+        if row.approved_phase is not None:
+            response.phases_approved.append(row.approved_phase)
+    return list(responses.values())
+
+
+def get_project_user_with_session(db: Session, project_id: UUID, user_id: UUID) -> ProjectUser | None:
+    """Return one stakeholder with their session's summary columns loaded (no transcript)."""
+    stmt = (
+        select(ProjectUser)
+        .where(ProjectUser.project_id == project_id, ProjectUser.user_id == user_id)
+        .options(selectinload(ProjectUser.session).load_only(*_SESSION_SUMMARY_COLUMNS))
+    )
+    return db.execute(stmt).scalars().first()
+
+
+def get_completed_project_users(db: Session, project_id: UUID) -> list[ProjectUser]:
+    """Return stakeholders whose discovery is COMPLETED, with user and session summary columns loaded."""
+    stmt = (
+        select(ProjectUser)
+        .join(DiscoverySession, DiscoverySession.project_user_id == ProjectUser.id)
+        .where(
+            ProjectUser.project_id == project_id,
+            DiscoverySession.status == SessionStatus.COMPLETED,
+        )
+        .order_by(ProjectUser.invited_at)
         .options(
-            joinedload(Project.project_users).joinedload(ProjectUser.user),
-            joinedload(Project.project_users).joinedload(ProjectUser.session),
+            selectinload(ProjectUser.user),
+            selectinload(ProjectUser.session).load_only(*_SESSION_SUMMARY_COLUMNS),
         )
     )
-    return db.execute(stmt).unique().scalars().first()
+    return db.execute(stmt).scalars().all()
 
 
 def update_project(
@@ -68,7 +158,6 @@ def update_project(
     for key, value in data.items():
         setattr(project, key, value)
     db.commit()
-    db.refresh(project)
     return project
 
 
@@ -97,7 +186,8 @@ def add_user_to_project(
             return existing
         project_user = ProjectUser(
             project_id=project_id,
-            user_id=user.id,
+            user=user,
+            session=None,
             status=ProjectUserStatus.ACTIVE,
             invite_token=None,
             invited_email=None,
@@ -116,18 +206,130 @@ def add_user_to_project(
             return existing
         project_user = ProjectUser(
             project_id=project_id,
-            user_id=None,
+            user=None,
+            session=None,
             status=ProjectUserStatus.INVITED,
             invite_token=str(uuid.uuid4()),
             invited_email=email_clean,
             invited_name=(name or "").strip() or None,
         )
     db.add(project_user)
+    record_project_users_added(db, project_id)
     db.commit()
-    db.refresh(project_user)
     return project_user
 
 
+def bulk_add_users_to_project(
+    db: Session,
+    project_id: UUID,
+    users: list[ProjectUserAdd],
+) -> ProjectUsersBulkResponse:
+    """Add many users to the project with the same rules as add_user_to_project, in one transaction.
+
+    Existing users and existing memberships/invites are resolved with one query each,
+    whatever the number of rows; every new ProjectUser is inserted in a single commit.
+    Rows with a blank or malformed email, or repeating an earlier row's email, are
+    reported and skipped without failing the rest.
+    """
+    emails = [(u.email or "").strip().lower() for u in users]
+    wanted = {e for e in emails if "@" in e}
+
+    users_by_email: dict[str, User] = {}
+    if wanted:
+        for user in db.execute(select(User).where(func.lower(User.email).in_(wanted))).scalars():
+            users_by_email[user.email.lower()] = user
+    invite_emails = wanted - users_by_email.keys()
+    user_ids = [u.id for u in users_by_email.values()]
+
+    members_by_user: dict[UUID, ProjectUser] = {}
+    invites_by_email: dict[str, ProjectUser] = {}
+    if user_ids:
+        for pu in db.execute(
+            select(ProjectUser).where(ProjectUser.project_id == project_id, ProjectUser.user_id.in_(user_ids))
+        ).scalars():
+            members_by_user.setdefault(pu.user_id, pu)
+    if invite_emails:
+        for pu in db.execute(
+            select(ProjectUser).where(
+                ProjectUser.project_id == project_id,
+                func.lower(ProjectUser.invited_email).in_(invite_emails),
+            )
+        ).scalars():
+            invites_by_email.setdefault(pu.invited_email.lower(), pu)
+
+    now = datetime.now(timezone.utc)
+    outcomes: list[tuple[int, str, str, str | None, ProjectUser | None]] = []
+    new_project_users: list[ProjectUser] = []
+    first_row: dict[str, int] = {}
+    for row, (body, email) in enumerate(zip(users, emails), start=1):
+        if "@" not in email:
+            outcomes.append((row, email, "invalid", "A valid email is required", None))
+            continue
+        if email in first_row:
+            outcomes.append((row, email, "duplicate", f"Same email as row {first_row[email]}", None))
+            continue
+        first_row[email] = row
+        user = users_by_email.get(email)
+        if user:
+            # User exists: link directly as ACTIVE (no invite)
+            existing = members_by_user.get(user.id)
+            if existing:
+                outcomes.append((row, email, "existing", None, existing))
+                continue
+            project_user = ProjectUser(
+                project_id=project_id,
+                user=user,
+                session=None,
+                status=ProjectUserStatus.ACTIVE,
+                invite_token=None,
+                invited_email=None,
+                invited_name=None,
+                activated_at=now,
+            )
+            outcomes.append((row, email, "added", None, project_user))
+        else:
+            existing = invites_by_email.get(email)
+            if existing:
+                outcomes.append((row, email, "existing", None, existing))
+                continue
+            project_user = ProjectUser(
+                project_id=project_id,
+                user=None,
+                session=None,
+                status=ProjectUserStatus.INVITED,
+                invite_token=str(uuid.uuid4()),
+                invited_email=email,
+                invited_name=(body.name or "").strip() or None,
+            )
+            outcomes.append((row, email, "invited", None, project_user))
+        new_project_users.append(project_user)
+
+    if new_project_users:
+        db.add_all(new_project_users)
+        record_project_users_added(db, project_id, len(new_project_users))
+        db.commit()
+
+    responses: dict[UUID, ProjectUserResponse] = {}
+    if any(pu is not None for *_, pu in outcomes):
+        responses = {r.id: r for r in get_project_user_responses(db, project_id)}
+    results = [
+        ProjectUserBulkResult(
+            row=row,
+            email=email,
+            result=result,
+            detail=detail,
+            project_user=responses.get(pu.id) if pu is not None else None,
+        )
+        for row, email, result, detail, pu in outcomes
+    ]
+    counts = {result: sum(1 for r in results if r.result == result) for result in ("added", "invited", "existing")}
+    return ProjectUsersBulkResponse(
+        **counts,
+        failed=sum(1 for r in results if r.result in ("invalid", "duplicate")),
+        results=results,
+    )
+
+
 def activate_project_user(
     db: Session,
     project_id: UUID,
@@ -145,44 +347,139 @@ def activate_project_user(
     project_user.status = ProjectUserStatus.ACTIVE
     project_user.activated_at = datetime.now(timezone.utc)
     db.commit()
-    db.refresh(project_user)
     return project_user
 
 
-def get_project_progress(db: Session, project_id: UUID) -> ProjectProgressResponse:
-    """Return progress counts for the project."""
+def _progress_column(session_status: SessionStatus | None):
+    """Return the Project counter column that a stakeholder with this session status counts toward."""
+    if session_status == SessionStatus.IN_PROGRESS:
+        return Project.progress_in_progress
+    if session_status == SessionStatus.COMPLETED:
+        return Project.progress_completed
+    # No session yet, or session created but not started
+    return Project.progress_not_started
 
-    # Get all project users with their sessions
-    project_users = db.execute(
-        select(ProjectUser)
-        .options(joinedload(ProjectUser.session))
-        .where(ProjectUser.project_id == project_id)
-    ).unique().scalars().all()
 
-    total = len(project_users)
-    not_started = 0
-    in_progress = 0
-    completed = 0
+def record_project_users_added(db: Session, project_id: UUID, count: int = 1) -> None:
+    """Bump progress counters for newly added project users (they start as not started)."""
+    db.execute(
+        update(Project)
+        .where(Project.id == project_id)
+        .values(
+            progress_total_users=Project.progress_total_users + count,
+            progress_not_started=Project.progress_not_started + count,
+        )
+    )
+
 
-    for pu in project_users:
-        # No session yet (not registered or hasn't started discovery)
-        if not pu.session:
-            not_started += 1
-            continue
+def record_project_user_removed(db: Session, project_user: ProjectUser) -> None:
+    """Decrement progress counters for a project user about to be deleted."""
+    column = _progress_column(project_user.session.status if project_user.session else None)
+    db.execute(
+        update(Project)
+        .where(Project.id == project_user.project_id)
+        .values({
+            Project.progress_total_users: Project.progress_total_users - 1,
+            column: column - 1,
+        })
+    )
+
+
+def transition_session_status(
+    db: Session,
+    session: DiscoverySession,
+    project_id: UUID,
+    new_status: SessionStatus,
+    **values: Any,
+) -> bool:
+    """Move a session to new_status and shift the project's progress counters in the same transaction.
+
+    The status change is a conditional UPDATE on the current status, so concurrent requests
+    making the same transition only count it once. values are further columns to set in that
+    UPDATE (e.g. completed_at), applied only if this call made the change. Returns True if it did.
+    """
+    old_status = session.status
+    if old_status == new_status:
+        return False
+    result = db.execute(
+        update(DiscoverySession)
+        .where(DiscoverySession.id == session.id, DiscoverySession.status == old_status)
+        .values(status=new_status, **values)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        # Another request moved the session first; reload its status rather than assume one.
+        db.expire(session, ["status"])
+        return False
+    set_committed_value(session, "status", new_status)
+    for key, value in values.items():
+        set_committed_value(session, key, value)
+    old_column = _progress_column(old_status)
+    new_column = _progress_column(new_status)
+    if old_column is not new_column:
+        db.execute(
+            update(Project)
+            .where(Project.id == project_id)
+            .values({old_column: old_column - 1, new_column: new_column + 1})
+        )
+    record_event(
+        db,
+        project_id,
+        "session_status",
+        session_id=session.id,
+        project_user_id=session.project_user_id,
+        status=new_status.value,
+        previous_status=old_status.value,
+    )
+    return True
+
+
+def reconcile_project_progress(db: Session, project_id: UUID | None = None) -> int:
+    """Rebuild progress counters from project_users and discovery_sessions. Returns projects updated."""
+    status = DiscoverySession.status
+    counts = (
+        select(
+            ProjectUser.project_id,
+            func.count(ProjectUser.id).label("total"),
+            func.sum(case((status == SessionStatus.IN_PROGRESS, 1), else_=0)).label("in_progress"),
+            func.sum(case((status == SessionStatus.COMPLETED, 1), else_=0)).label("completed"),
+        )
+        .outerjoin(DiscoverySession, DiscoverySession.project_user_id == ProjectUser.id)
+        .group_by(ProjectUser.project_id)
+    )
+    project_ids = select(Project.id)
+    if project_id is not None:
+        counts = counts.where(ProjectUser.project_id == project_id)
+        project_ids = project_ids.where(Project.id == project_id)
+    by_project = {row.project_id: row for row in db.execute(counts)}
+
+    updated = 0
+    for pid in db.execute(project_ids).scalars():
+        row = by_project.get(pid)
+        total = row.total if row else 0
+        in_progress = (row.in_progress or 0) if row else 0
+        completed = (row.completed or 0) if row else 0
+        db.execute(
+            update(Project)
+            .where(Project.id == pid)
+            .values(
+                progress_total_users=total,
+                progress_not_started=total - in_progress - completed,
+                progress_in_progress=in_progress,
+                progress_completed=completed,
+            )
+        )
+        updated += 1
+    return updated
 
-        status = pu.session.status
-        if status == SessionStatus.NOT_STARTED:
-            not_started += 1
-        elif status == SessionStatus.COMPLETED:
-            completed += 1
-        else:  # IN_PROGRESS
-            in_progress += 1
 
+def get_project_progress(project: Project) -> ProjectProgressResponse:
+    """Return progress counts for the project from its denormalized counters."""
     return ProjectProgressResponse(
-        total_users=total,
-        not_started=not_started,
-        in_progress=in_progress,
-        completed=completed,
+        total_users=project.progress_total_users,
+        not_started=project.progress_not_started,
+        in_progress=project.progress_in_progress,
+        completed=project.progress_completed,
     )
 
 
@@ -203,9 +500,7 @@ def project_user_to_response(pu: ProjectUser) -> ProjectUserResponse:
     if pu.session:
         discovery_status = pu.session.status.value if pu.session.status else None
         current_phase = pu.session.current_phase
-        # phase_summaries is a dict like {"1": "summary text", "2": "summary text"}
-        if pu.session.phase_summaries:
-            phases_approved = [int(k) for k in pu.session.phase_summaries.keys()]
+        phases_approved = get_phases_approved(object_session(pu), pu.session.id)
 
     return ProjectUserResponse(
         id=pu.id,
@@ -0,0 +1,314 @@
+"""Push feed of project events for the SA dashboard.
+
+Routers record events (session status changes, phase approvals, reports ready)
+with record_event(); the transaction's events are inserted into the
+project_events outbox in one statement as it commits, so an event is published
+exactly when its change commits. Each worker runs one poller thread, only while
+it has subscribers, that reads new outbox rows for the subscribed projects and
+fans them out to the SSE streams (GET /api/projects/{id}/events) connected to it. A commit in the
+same worker wakes the poller at once; events from other workers arrive within
+PROJECT_EVENTS_POLL_INTERVAL_SECONDS. A dashboard therefore costs one indexed
+query per poll interval per worker, not a progress rescan per poll.
+
+Row ids increase and serve as SSE event ids. A client reconnecting with
+Last-Event-ID is replayed what it missed from the outbox; rows are kept for
+PROJECT_EVENTS_RETENTION_HOURS.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any
+from uuid import UUID
+
+import anyio.to_thread
+from sqlalchemy import delete, event, func, insert, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config import get_settings
+from app.database import RoutingSession
+from app.models.project import ProjectEvent
+
+# Rows younger than this are read again on the next poll: with concurrent writers, a row
+# with a lower id can commit after one with a higher id has already been seen.
+_SETTLE_SECONDS = 5.0
+_POLL_BATCH = 500
+_CLEANUP_INTERVAL_SECONDS = 3600.0
+
+
+def record_event(db: Session, project_id: UUID, type: str, **data: Any) -> None:
+    """Add an event to the outbox; it is written and published when db commits. Does not commit.
+
+    Events recorded in one transaction are written with a single INSERT at commit, however many
+    there are, so a change that emits several events costs one statement.
+    """
+    if not db.in_transaction():
+        # So that a rollback ends a transaction and discards the event with it.
+        db.begin()
+    db.info.setdefault("project_events", []).append({
+        "project_id": project_id,
+        "type": type,
+        "data": {k: str(v) if isinstance(v, (UUID, datetime)) else v for k, v in data.items()},
+        "created_at": datetime.now(timezone.utc),
+    })
+
+
+@dataclass
+class Event:
+    id: int
+    project_id: UUID
+    type: str
+    data: dict[str, Any]
+    created_at: datetime
+
+    def to_sse(self) -> str:
+        payload = json.dumps(
+            {
+                "type": self.type,
+                "project_id": str(self.project_id),
+                "created_at": self.created_at.isoformat(),
+                **self.data,
+            },
+            separators=(",", ":"),
+        )
+        return f"id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n"
+
+
+@dataclass(eq=False)
+class Subscriber:
+    """One connected stream. Closed (and the client left to reconnect) if it falls too far behind."""
+
+    project_id: UUID
+    loop: asyncio.AbstractEventLoop
+    queue: asyncio.Queue
+    closed: bool = False
+    # Ids at or below this were already sent from the replay
+    replayed_up_to: int = 0
+
+
+def _to_event(row: ProjectEvent) -> Event:
+    # SQLite hands timestamps back naive; they were written in UTC.
+    created_at = row.created_at if row.created_at.tzinfo else row.created_at.replace(tzinfo=timezone.utc)
+    return Event(id=row.id, project_id=row.project_id, type=row.type, data=row.data or {}, created_at=created_at)
+
+
+class ProjectEventBroker:
+    """Per-process fan-out of outbox rows to subscribed streams."""
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        poll_interval: float,
+        queue_size: int,
+        retention_hours: float,
+    ) -> None:
+        self.session_factory = session_factory
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        self.retention = timedelta(hours=retention_hours)
+        self._subscribers: dict[UUID, set[Subscriber]] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._cursor: int | None = None
+        self._delivered: set[int] = set()
+        self._cleaned_at = 0.0
+        self._published = 0
+        self._dropped = 0
+
+    def subscribe(self, project_id: UUID) -> Subscriber:
+        subscriber = Subscriber(project_id, asyncio.get_running_loop(), asyncio.Queue(self.queue_size))
+        with self._lock:
+            self._subscribers.setdefault(project_id, set()).add(subscriber)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="project-events", daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscriber.project_id)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[subscriber.project_id]
+
+    def wake(self) -> None:
+        """Poll now instead of at the next interval (called after a commit that recorded events)."""
+        self._wakeup.set()
+
+    def replay(self, project_id: UUID, after_id: int, limit: int) -> list[Event]:
+        """Events for project_id with id > after_id, oldest first."""
+        db = self.session_factory()
+        try:
+            rows = db.execute(
+                select(ProjectEvent)
+                .where(ProjectEvent.project_id == project_id, ProjectEvent.id > after_id)
+                .order_by(ProjectEvent.id)
+                .limit(limit)
+            ).scalars()
+            return [_to_event(row) for row in rows]
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            with self._lock:
+                project_ids = list(self._subscribers)
+            if not project_ids:
+                continue
+            try:
+                self._poll(project_ids)
+            except Exception as e:
+                print(f"[project_events] poll failed: {e}")
+
+    def _poll(self, project_ids: list[UUID]) -> None:
+        db = self.session_factory()
+        try:
+            if self._cursor is None:
+                settled_before = datetime.now(timezone.utc) - timedelta(seconds=_SETTLE_SECONDS)
+                self._cursor = db.execute(
+                    select(func.coalesce(func.max(ProjectEvent.id), 0)).where(ProjectEvent.created_at < settled_before)
+                ).scalar()
+            rows = db.execute(
+                select(ProjectEvent)
+                .where(ProjectEvent.project_id.in_(project_ids), ProjectEvent.id > self._cursor)
+                .order_by(ProjectEvent.id)
+                .limit(_POLL_BATCH)
+            ).scalars().all()
+        finally:
+            db.close()
+
+        now = datetime.now(timezone.utc)
+        settle_before = now - timedelta(seconds=_SETTLE_SECONDS)
+        settled = True
+        for project_event in map(_to_event, rows):
+            if project_event.id not in self._delivered:
+                self._delivered.add(project_event.id)
+                self._publish(project_event)
+            # The cursor only moves past settled rows, so a late commit behind them is still seen.
+            settled = settled and (project_event.created_at < settle_before or len(rows) == _POLL_BATCH)
+            if settled:
+                self._cursor = project_event.id
+        self._delivered = {i for i in self._delivered if i > self._cursor}
+
+        if time.monotonic() - self._cleaned_at >= _CLEANUP_INTERVAL_SECONDS:
+            # After delivery and on its own: a failed cleanup is retried next interval, never blocks events.
+            self._cleaned_at = time.monotonic()
+            self._delete_expired(now - self.retention)
+
+    def _delete_expired(self, before: datetime) -> None:
+        db = self.session_factory()
+        try:
+            # synchronize_session=False: nothing to sync in this fresh session, and the default
+            # "evaluate" compares Python datetimes, which fails on SQLite's naive timestamps.
+            db.execute(
+                delete(ProjectEvent)
+                .where(ProjectEvent.created_at < before)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"[project_events] cleanup failed: {e}")
+        finally:
+            db.close()
+
+    def _publish(self, project_event: Event) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(project_event.project_id, ()))
+        for subscriber in subscribers:
+            subscriber.loop.call_soon_threadsafe(self._offer, subscriber, project_event)
+        self._published += 1
+
+    def _offer(self, subscriber: Subscriber, project_event: Event) -> None:
+        if subscriber.closed or project_event.id <= subscriber.replayed_up_to:
+            return
+        try:
+            subscriber.queue.put_nowait(project_event)
+        except asyncio.QueueFull:
+            # Too far behind: end the stream; the client reconnects and replays from the outbox.
+            subscriber.closed = True
+            while not subscriber.queue.empty():
+                subscriber.queue.get_nowait()
+            subscriber.queue.put_nowait(None)
+            self._dropped += 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "projects": len(self._subscribers),
+                "subscribers": sum(len(s) for s in self._subscribers.values()),
+                "published": self._published,
+                "dropped_subscribers": self._dropped,
+            }
+
+
+@lru_cache
+def get_event_broker() -> ProjectEventBroker:
+    from app.database import SessionLocal
+
+    settings = get_settings()
+    return ProjectEventBroker(
+        SessionLocal,
+        poll_interval=settings.PROJECT_EVENTS_POLL_INTERVAL_SECONDS,
+        queue_size=settings.PROJECT_EVENTS_QUEUE_SIZE,
+        retention_hours=settings.PROJECT_EVENTS_RETENTION_HOURS,
+    )
+
+
+async def event_stream(project_id: UUID, last_event_id: int | None) -> AsyncIterator[str]:
+    """SSE body for a project: replay after last_event_id, then live events and keepalives."""
+    settings = get_settings()
+    broker = get_event_broker()
+    subscriber = broker.subscribe(project_id)
+    try:
+        yield f"retry: {int(settings.PROJECT_EVENTS_RETRY_MS)}\n\n"
+        if last_event_id is not None:
+            missed = await anyio.to_thread.run_sync(
+                broker.replay, project_id, last_event_id, settings.PROJECT_EVENTS_REPLAY_LIMIT
+            )
+            for project_event in missed:
+                subscriber.replayed_up_to = project_event.id
+                yield project_event.to_sse()
+        while True:
+            try:
+                project_event = await asyncio.wait_for(subscriber.queue.get(), settings.PROJECT_EVENTS_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if project_event is None:
+                break
+            if project_event.id > subscriber.replayed_up_to:
+                yield project_event.to_sse()
+    finally:
+        broker.unsubscribe(subscriber)
+
+
+@event.listens_for(RoutingSession, "before_commit")
+def _write_recorded_events(session: Session) -> None:
+    rows = session.info.pop("project_events", None)
+    if rows:
+        session.execute(insert(ProjectEvent), rows)
+        session.info["project_events_written"] = True
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _discard_recorded_events(session: Session, transaction) -> None:
+    # Events recorded in a transaction that rolled back must not leak into the next one.
+    if transaction.parent is None:
+        session.info.pop("project_events", None)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _wake_broker(session: Session) -> None:
+    if session.info.pop("project_events_written", False):
+        get_event_broker().wake()
@@ -0,0 +1,189 @@
+"""Single-flight report generation.
+
+Opening the consolidated report or a stakeholder's discovery results generates
+reports with the LLM from data that rarely changes between two requests. When
+several requests (two SAs, two tabs, or any number of workers) ask for the same
+report with the same inputs at once, only one generation runs and the others
+wait for its result.
+
+Within a process, concurrent callers share the leader's result (SingleFlight).
+Across workers, the leader holds a row in report_generations keyed by (subject,
+input hash) and stores the report on it; other workers poll the row. Finished
+reports are kept for REPORT_FLIGHT_RESULT_TTL_SECONDS so requests arriving just
+after the leader finished also reuse them. If the leader fails, its row is
+removed and the next caller generates instead. A waiter that gives up after
+REPORT_FLIGHT_WAIT_SECONDS generates on its own rather than failing the request.
+"""
+
+import hashlib
+import json
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.report_generation import ReportGeneration, ReportGenerationState
+from app.services.inflight import SingleFlight
+
+_POLL_INTERVAL_SECONDS = 0.25
+
+_inflight = SingleFlight()
+
+
+def final_report_subject(session_id: UUID) -> str:
+    return f"final-report:{session_id}"
+
+
+def consolidated_report_subject(project_id: UUID) -> str:
+    return f"consolidated-report:{project_id}"
+
+
+def coalesce_generation(subject: str, inputs: Any, generate: Callable[[], str]) -> str:
+    """Return generate()'s report, sharing one generation among concurrent callers with equal inputs.
+
+    inputs must be JSON-serializable and determine the report: callers with the same
+    subject and inputs get the same report.
+    """
+    encoded = json.dumps(inputs, sort_keys=True, default=str, ensure_ascii=False)
+    input_hash = hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+    return _inflight.do(
+        (subject, input_hash),
+        lambda: _generate_with_lock(subject, input_hash, generate),
+    )
+
+
+def _generate_with_lock(subject: str, input_hash: str, generate: Callable[[], str]) -> str:
+    db = SessionLocal()
+    try:
+        claim_id, stored = _claim_or_wait(db, subject, input_hash)
+        if stored is not None:
+            return stored
+
+        try:
+            content = generate()
+        except BaseException:
+            if claim_id is not None:
+                db.execute(delete(ReportGeneration).where(ReportGeneration.id == claim_id))
+                db.commit()
+            raise
+
+        if claim_id is not None:
+            now = datetime.now(timezone.utc)
+            db.execute(
+                update(ReportGeneration)
+                .where(ReportGeneration.id == claim_id)
+                .values(
+                    state=ReportGenerationState.COMPLETED,
+                    content=content,
+                    completed_at=now,
+                )
+            )
+            # Drop finished reports nobody can reuse anymore.
+            ttl = timedelta(seconds=get_settings().REPORT_FLIGHT_RESULT_TTL_SECONDS)
+            db.execute(
+                delete(ReportGeneration).where(
+                    ReportGeneration.state == ReportGenerationState.COMPLETED,
+                    ReportGeneration.completed_at < now - ttl,
+                )
+            )
+            db.commit()
+        return content
+    finally:
+        db.close()
+
+
+def _claim_or_wait(db: Session, subject: str, input_hash: str) -> tuple[UUID | None, str | None]:
+    """Claim the generation, or wait for whoever holds it.
+
+    Returns (claim id, None) when this caller should generate, (None, report) when
+    another caller already did, or (None, None) when waiting timed out and this
+    caller should generate without a claim.
+    """
+    settings = get_settings()
+    result_ttl = timedelta(seconds=settings.REPORT_FLIGHT_RESULT_TTL_SECONDS)
+    stale_after = timedelta(seconds=settings.REPORT_FLIGHT_STALE_SECONDS)
+    deadline = time.monotonic() + settings.REPORT_FLIGHT_WAIT_SECONDS
+    waited = False
+    while True:
+        now = datetime.now(timezone.utc)
+        row = db.execute(
+            select(
+                ReportGeneration,
+                (ReportGeneration.completed_at < now - result_ttl).label("expired"),
+                (ReportGeneration.created_at < now - stale_after).label("stale"),
+            ).where(
+                ReportGeneration.subject == subject,
+                ReportGeneration.input_hash == input_hash,
+            )
+        ).first()
+
+        if row is None:
+            claim = ReportGeneration(
+                subject=subject,
+                input_hash=input_hash,
+                state=ReportGenerationState.IN_PROGRESS,
+                created_at=now,
+            )
+            db.add(claim)
+            try:
+                db.commit()
+                return claim.id, None
+            except IntegrityError:
+                db.rollback()  # Another worker claimed it first; look again
+                continue
+
+        existing, expired, stale = row
+        if existing.state == ReportGenerationState.COMPLETED:
+            if waited or not expired:
+                # A result we waited for is used however old it is
+                return None, existing.content
+            # Too old to reuse: take the row over and generate afresh (conditional, so only one caller does)
+            claimed = db.execute(
+                update(ReportGeneration)
+                .where(
+                    ReportGeneration.id == existing.id,
+                    ReportGeneration.state == ReportGenerationState.COMPLETED,
+                    ReportGeneration.completed_at == existing.completed_at,
+                )
+                .values(
+                    state=ReportGenerationState.IN_PROGRESS,
+                    content=None,
+                    created_at=now,
+                    completed_at=None,
+                )
+            ).rowcount
+            db.commit()
+            if claimed:
+                return existing.id, None
+            continue
+
+        if stale:
+            # Left behind by a crashed worker: take it over (conditional, so only one caller does)
+            claimed = db.execute(
+                update(ReportGeneration)
+                .where(
+                    ReportGeneration.id == existing.id,
+                    ReportGeneration.state == ReportGenerationState.IN_PROGRESS,
+                    ReportGeneration.created_at == existing.created_at,
+                )
+                .values(created_at=now)
+            ).rowcount
+            db.commit()
+            if claimed:
+                return existing.id, None
+            continue
+
+        # Being generated by another worker: wait for it.
+        if time.monotonic() >= deadline:
+            print(f"[report_flight] gave up waiting for {subject}; generating without the lock")
+            return None, None
+        time.sleep(_POLL_INTERVAL_SECONDS)
+        waited = True
+        db.expire_all()
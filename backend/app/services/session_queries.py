@@ -0,0 +1,124 @@
+"""SA-side analytics over discovery sessions (phase approvals, flagged items).
+
+Phase approvals are plain SQL over the phase_summaries table on every database.
+
+flagged_items is JSONB with a GIN index on Postgres, so filters run in the
+database: flag-by-phase is a containment test (``@>``) that uses the index, and
+mention search expands the array with jsonb_array_elements and matches with
+ILIKE (in SQL, but not index-assisted). Other databases (SQLite in local
+development) fall back to filtering the project's rows in Python.
+"""
+
+from dataclasses import dataclass
+from uuid import UUID
+
+from sqlalchemy import column, func, select, true, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+
+from app.models.project import ProjectUser
+from app.models.session import DiscoverySession, PhaseSummary, PhaseSummaryStatus
+from app.models.user import User
+
+
+@dataclass(frozen=True)
+class FlaggedItem:
+    """One out-of-scope flag raised in a stakeholder's session."""
+
+    user_id: UUID | None
+    name: str
+    email: str
+    phase: int | None
+    mention: str
+    user_input: str
+
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _flagged_items():
+    return type_coerce(DiscoverySession.flagged_items, JSONB)
+
+
+def _approved_phases(project_id: UUID):
+    return (
+        select(PhaseSummary.phase)
+        .join(DiscoverySession, DiscoverySession.id == PhaseSummary.session_id)
+        .join(ProjectUser, ProjectUser.id == DiscoverySession.project_user_id)
+        .where(
+            ProjectUser.project_id == project_id,
+            PhaseSummary.status == PhaseSummaryStatus.APPROVED,
+        )
+    )
+
+
+def users_with_phase_approved(db: Session, project_id: UUID, phase: int) -> list[UUID]:
+    """Return user ids of the project's stakeholders with an approved summary for phase."""
+    stmt = _approved_phases(project_id).with_only_columns(ProjectUser.user_id).where(PhaseSummary.phase == phase)
+    return list(db.execute(stmt).scalars())
+
+
+def phase_approval_counts(db: Session, project_id: UUID) -> dict[int, int]:
+    """Return {phase: number of stakeholders with that phase approved} for the project."""
+    stmt = (
+        _approved_phases(project_id)
+        .add_columns(func.count())
+        .group_by(PhaseSummary.phase)
+        .order_by(PhaseSummary.phase)
+    )
+    return {phase: count for phase, count in db.execute(stmt)}
+
+
+def find_flagged_items(
+    db: Session,
+    project_id: UUID,
+    phase: int | None = None,
+    mention: str | None = None,
+) -> list[FlaggedItem]:
+    """Return the project's flagged items, optionally limited to a phase and/or a mention substring."""
+    base = (
+        select(
+            ProjectUser.user_id,
+            ProjectUser.invited_name,
+            ProjectUser.invited_email,
+            User.name,
+            User.email,
+        )
+        .join(DiscoverySession, DiscoverySession.project_user_id == ProjectUser.id)
+        .outerjoin(User, User.id == ProjectUser.user_id)
+        .where(ProjectUser.project_id == project_id)
+        .order_by(ProjectUser.invited_at)
+    )
+
+    def to_item(row, item: dict) -> FlaggedItem:
+        return FlaggedItem(
+            user_id=row.user_id,
+            name=row.name if row.user_id else row.invited_name or "",
+            email=row.email if row.user_id else row.invited_email or "",
+            phase=item.get("phase"),
+            mention=item.get("mention") or "",
+            user_input=item.get("user_input") or "",
+        )
+
+    if _is_postgres(db):
+        element = func.jsonb_array_elements(_flagged_items()).table_valued(column("value", JSONB)).lateral()
+        stmt = base.add_columns(element.c.value).join(element, true())
+        if phase is not None:
+            # Row-level prefilter on the GIN index before expanding the array
+            stmt = stmt.where(_flagged_items().contains([{"phase": phase}]))
+            stmt = stmt.where(element.c.value.contains({"phase": phase}))
+        if mention:
+            stmt = stmt.where(element.c.value["mention"].astext.icontains(mention, autoescape=True))
+        return [to_item(row, row.value) for row in db.execute(stmt)]
+
+    needle = mention.lower() if mention else None
+    items = []
+    for row in db.execute(base.add_columns(DiscoverySession.flagged_items)):
+        for item in row.flagged_items or []:
+            if phase is not None and item.get("phase") != phase:
+                continue
+            if needle and needle not in (item.get("mention") or "").lower():
+                continue
+            items.append(to_item(row, item))
+    return items
@@ -0,0 +1,144 @@
+"""OpenTelemetry tracing: a span per request, per SQL statement and per LLM call.
+
+Enabled by TRACING_EXPORTER:
+
+- "console": spans are printed to stdout as JSON;
+- "file": spans are appended to TRACING_FILE, one JSON object per line;
+- "" (default): tracing is off and span() costs a function call.
+
+Spans nest: SQL statements and Claude calls made while serving a request are
+children of its span (the request's context follows it into the threadpool), so
+a slow chat turn shows how its time splits between queries and the LLM.
+Requires opentelemetry-sdk, which is optional: install requirements-tracing.txt
+in images that set TRACING_EXPORTER. Without it tracing stays off and a warning
+is printed at startup.
+"""
+
+import re
+import sys
+from contextlib import nullcontext
+from typing import Any
+
+from sqlalchemy import Engine, event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import Settings
+
+_STATEMENT_MAX_CHARS = 2000
+_SQL_TARGET = re.compile(r"^\s*(SELECT\b.*?\bFROM|INSERT\s+INTO|UPDATE|DELETE\s+FROM)\s+\"?(\w+)", re.I | re.S)
+
+# Set by configure_tracing(); opentelemetry is only imported when tracing is on.
+trace = None
+_tracer = None
+
+
+def configure_tracing(settings: Settings) -> None:
+    """Install the span exporter chosen by TRACING_EXPORTER (once per process)."""
+    global trace, _tracer
+    exporter_name = settings.TRACING_EXPORTER.strip().lower()
+    if not exporter_name or _tracer is not None:
+        return
+    try:
+        from opentelemetry import trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    except ImportError:
+        print("[tracing] TRACING_EXPORTER is set but opentelemetry-sdk is not installed; tracing is off")
+        return
+    if exporter_name == "file":
+        out = open(settings.TRACING_FILE, "a", encoding="utf-8")
+        exporter = ConsoleSpanExporter(out=out, formatter=lambda span: span.to_json(indent=None) + "\n")
+    elif exporter_name == "console":
+        exporter = ConsoleSpanExporter(out=sys.stdout)
+    else:
+        print(f"[tracing] Unknown TRACING_EXPORTER {settings.TRACING_EXPORTER!r}; tracing is off")
+        return
+    provider = TracerProvider(resource=Resource.create({"service.name": settings.TRACING_SERVICE_NAME}))
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    _tracer = provider.get_tracer("app")
+    event.listen(Engine, "before_cursor_execute", _start_statement_span)
+    event.listen(Engine, "after_cursor_execute", _end_statement_span)
+    event.listen(Engine, "handle_error", _fail_statement_span)
+
+
+def span(name: str, **attributes: Any):
+    """Context manager for a child span of the current one; yields the span, or None when tracing is off."""
+    if _tracer is None:
+        return nullcontext()
+    return _tracer.start_as_current_span(name, attributes=attributes)
+
+
+def statement_target(statement: str) -> tuple[str, str | None]:
+    """("SELECT", "projects") for a statement: its operation and, for DML and simple selects, its table."""
+    match = _SQL_TARGET.match(statement)
+    if match is None:
+        return statement.split(None, 1)[0].upper() if statement.strip() else "SQL", None
+    return match.group(1).split(None, 1)[0].upper(), match.group(2)
+
+
+def _start_statement_span(conn, cursor, statement, parameters, context, executemany) -> None:
+    operation, table = statement_target(statement)
+    context._tracing_span = _tracer.start_span(
+        f"{operation} {table}" if table else operation,
+        attributes={
+            "db.system": conn.dialect.name,
+            "db.operation": operation,
+            "db.sql.table": table or "",
+            "db.statement": statement[:_STATEMENT_MAX_CHARS],
+        },
+    )
+
+
+def _end_statement_span(conn, cursor, statement, parameters, context, executemany) -> None:
+    statement_span = getattr(context, "_tracing_span", None)
+    if statement_span is not None:
+        if cursor.rowcount is not None and cursor.rowcount >= 0:
+            statement_span.set_attribute("db.rowcount", cursor.rowcount)
+        statement_span.end()
+        context._tracing_span = None
+
+
+def _fail_statement_span(exception_context) -> None:
+    context = exception_context.execution_context
+    statement_span = getattr(context, "_tracing_span", None) if context is not None else None
+    if statement_span is not None:
+        statement_span.record_exception(exception_context.original_exception)
+        statement_span.set_status(trace.Status(trace.StatusCode.ERROR))
+        statement_span.end()
+        context._tracing_span = None
+
+
+class TracingMiddleware:
+    """Wrap each HTTP request in a server span named after its route template, unless FastAPI already did."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or _tracer is None or trace.get_current_span().is_recording():
+            # FastAPI releases with built-in telemetry already wrap the request in a server span.
+            await self.app(scope, receive, send)
+            return
+
+        with _tracer.start_as_current_span(
+            f"{scope['method']} {scope['path']}",
+            kind=trace.SpanKind.SERVER,
+            attributes={"http.request.method": scope["method"], "url.path": scope["path"]},
+        ) as request_span:
+
+            async def send_with_status(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    request_span.set_attribute("http.response.status_code", message["status"])
+                    if message["status"] >= 500:
+                        request_span.set_status(trace.Status(trace.StatusCode.ERROR))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = scope.get("route")
+                if route is not None and getattr(route, "path", None):
+                    request_span.update_name(f"{scope['method']} {route.path}")
+                    request_span.set_attribute("http.route", route.path)
@@ -0,0 +1,75 @@
+"""Size and CPU cost of compressed transcript/report columns.
+
+Uses the sample transcripts and reports in ../test_outputs, serialized the way
+the columns store them, and compares raw JSON, plain zlib, and zlib with the
+shipped preset dictionary.
+
+    python -m benchmarks.compression
+"""
+
+import json
+import re
+import time
+import zlib
+from pathlib import Path
+
+from app.models.types import CompressedJSON, CompressedText, compress, decompress
+
+SAMPLES_DIR = Path(__file__).resolve().parent.parent.parent / "test_outputs"
+REPEAT = 50
+
+
+def load_transcripts() -> list[list[dict]]:
+    """Parse the 'Claude: ... / You: ...' transcript dumps into all_messages-style lists."""
+    transcripts = []
+    for path in sorted(SAMPLES_DIR.glob("*conversation_*.txt")):
+        if "summary" in path.name:
+            continue
+        messages = []
+        for block in re.split(r"\n(?=(?:Claude|You): )", path.read_text(encoding="utf-8")):
+            role = "assistant" if block.startswith("Claude: ") else "user" if block.startswith("You: ") else None
+            if role:
+                content = block.split(": ", 1)[1].split("\n=====", 1)[0].strip()
+                messages.append({"role": role, "content": content})
+        if messages:
+            transcripts.append(messages)
+    return transcripts
+
+
+def load_reports() -> list[str]:
+    paths = list(SAMPLES_DIR.glob("*.md")) + list(SAMPLES_DIR.glob("*summary.txt"))
+    return [p.read_text(encoding="utf-8") for p in sorted(paths)]
+
+
+def _time_us(fn, *args) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn(*args)
+    return (time.perf_counter() - start) / REPEAT * 1e6
+
+
+def report(label: str, raw: bytes) -> None:
+    plain = zlib.compress(raw, 6)
+    with_dict = compress(raw)
+    assert decompress(with_dict) == raw
+    print(
+        f"{label:<44} raw={len(raw):>7}B  zlib={len(plain):>6}B ({len(plain) / len(raw):.0%})  "
+        f"zlib+dict={len(with_dict):>6}B ({len(with_dict) / len(raw):.0%})  "
+        f"encode={_time_us(compress, raw):>7.0f}us  decode={_time_us(decompress, with_dict):>6.0f}us"
+    )
+
+
+def main() -> None:
+    json_type, text_type = CompressedJSON(), CompressedText()
+    for i, messages in enumerate(load_transcripts()):
+        raw = json.dumps(messages, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        report(f"transcript {i} ({len(messages)} messages)", raw)
+        blob = json_type.process_bind_param(messages, None)
+        assert json_type.process_result_value(blob, None) == messages
+    for i, text in enumerate(load_reports()):
+        report(f"report/summary {i}", text.encode("utf-8"))
+        assert text_type.process_result_value(text_type.process_bind_param(text, None), None) == text
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Serialization time and bytes on the wire for the largest API responses.
+
+Builds a 300-turn SessionResponse and a consolidated report covering 15
+stakeholders from the sample transcripts and reports in ../test_outputs, then
+compares:
+
+- stdlib: jsonable_encoder + json.dumps, what JSONResponse does for routes
+  without a response model;
+- pydantic: model_dump_json, what FastAPI does for routes with a response model;
+- orjson: orjson.dumps(model_dump()), what ORJSONResponse would do (if installed);
+
+and the body size raw, gzipped and brotli-compressed (if brotli is installed),
+as CompressionMiddleware would send it.
+
+    python -m benchmarks.responses
+"""
+
+import gzip
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+from app.compression import brotli
+from app.schemas.project import ConsolidatedReportResponse
+from app.schemas.session import SessionResponse
+from benchmarks.compression import load_reports, load_transcripts
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+REPEAT = 50
+TURNS = 300
+STAKEHOLDERS = 15
+
+
+def session_response() -> SessionResponse:
+    samples = [m for transcript in load_transcripts() for m in transcript] or [
+        {"role": "assistant", "content": "Tell me about how your team handles month-end close today."},
+        {"role": "user", "content": "We export everything to spreadsheets and reconcile by hand."},
+    ]
+    messages = [samples[i % len(samples)] for i in range(2 * TURNS)]
+    return SessionResponse(
+        id=uuid.uuid4(),
+        current_phase=3,
+        status="IN_PROGRESS",
+        started_at=datetime.now(timezone.utc),
+        completed_at=None,
+        all_messages=messages,
+    )
+
+
+def consolidated_response() -> ConsolidatedReportResponse:
+    reports = load_reports() or ["## Findings\n\n- Manual reconciliation of invoices\n" * 40]
+    sections = [f"## Stakeholder {i + 1}\n\n{reports[i % len(reports)]}" for i in range(STAKEHOLDERS)]
+    return ConsolidatedReportResponse(
+        report_content="# Consolidated discovery report\n\n" + "\n\n".join(sections),
+        generated_at=datetime.now(timezone.utc),
+        stakeholder_count=STAKEHOLDERS,
+    )
+
+
+def _time_us(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn()
+    return (time.perf_counter() - start) / REPEAT * 1e6
+
+
+def report(label: str, model: BaseModel) -> None:
+    encoders = {
+        "stdlib": lambda: json.dumps(
+            jsonable_encoder(model), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8"),
+        "pydantic": model.model_dump_json,
+    }
+    if orjson is not None:
+        encoders["orjson"] = lambda: orjson.dumps(model.model_dump())
+    print(label)
+    for name, encode in encoders.items():
+        print(f"  {name:<9} {_time_us(encode):>8.0f}us")
+
+    raw = model.model_dump_json().encode("utf-8")
+    sizes = {"raw": (len(raw), 0.0)}
+    for level in (6, 9):
+        sizes[f"gzip-{level}"] = (len(gzip.compress(raw, level)), _time_us(lambda: gzip.compress(raw, level)))
+    if brotli is not None:
+        for quality in (4, 11):
+            sizes[f"br-{quality}"] = (
+                len(brotli.compress(raw, quality=quality)),
+                _time_us(lambda: brotli.compress(raw, quality=quality)),
+            )
+    for name, (size, us) in sizes.items():
+        print(f"  {name:<9} {size:>8}B ({size / len(raw):>4.0%})  compress={us:>7.0f}us")
+
+
+def main() -> None:
+    if orjson is None:
+        print("(orjson not installed; skipping it)")
+    if brotli is None:
+        print("(brotli not installed; skipping it)")
+    report(f"SessionResponse, {TURNS} turns", session_response())
+    report(f"ConsolidatedReportResponse, {STAKEHOLDERS} stakeholders", consolidated_response())
+
+
+if __name__ == "__main__":
+    main()
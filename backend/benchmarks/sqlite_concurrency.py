@@ -0,0 +1,111 @@
+"""Concurrent transcript writes against SQLite: default settings vs. production mode.
+
+Each worker thread repeatedly runs a stakeholder "turn": read a session's
+transcript blob, append a message, write it back. The baseline is a plain
+create_engine with the driver defaults (rollback journal, no busy_timeout
+beyond the driver's 5s); production mode is app.database.build_engines with WAL
+pragmas and the serialized writer.
+
+    python -m benchmarks.sqlite_concurrency [THREADS] [TURNS_PER_THREAD]
+"""
+
+import json
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.config import get_settings
+from app.database import RoutingSession, build_engines
+
+SESSIONS = 16
+MESSAGE = "A representative stakeholder answer of a few sentences. " * 8
+
+
+def _setup(url: str) -> None:
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE sessions (id INTEGER PRIMARY KEY, all_messages TEXT NOT NULL)"))
+        for i in range(SESSIONS):
+            conn.execute(text("INSERT INTO sessions (id, all_messages) VALUES (:id, '[]')"), {"id": i})
+    engine.dispose()
+
+
+def _run(session_factory, threads: int, turns: int) -> tuple[float, int, int]:
+    """Run the workload. Returns (elapsed seconds, committed turns, 'database is locked' errors)."""
+    committed = 0
+    locked = 0
+    counter_lock = threading.Lock()
+
+    def worker(worker_id: int) -> None:
+        nonlocal committed, locked
+        for turn in range(turns):
+            session_id = (worker_id + turn) % SESSIONS
+            db = session_factory()
+            try:
+                raw = db.execute(
+                    text("SELECT all_messages FROM sessions WHERE id = :id"), {"id": session_id}
+                ).scalar_one()
+                messages = json.loads(raw)
+                messages.append({"role": "user", "content": MESSAGE})
+                db.execute(
+                    text("UPDATE sessions SET all_messages = :value WHERE id = :id"),
+                    {"value": json.dumps(messages), "id": session_id},
+                )
+                db.commit()
+                with counter_lock:
+                    committed += 1
+            except OperationalError as exc:
+                db.rollback()
+                if "locked" not in str(exc):
+                    raise
+                with counter_lock:
+                    locked += 1
+            finally:
+                db.close()
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return time.perf_counter() - start, committed, locked
+
+
+def main() -> None:
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    turns = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    settings = get_settings()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline_url = f"sqlite:///{Path(tmp) / 'baseline.db'}"
+        _setup(baseline_url)
+        baseline_engine = create_engine(
+            baseline_url, connect_args={"check_same_thread": False}, pool_size=threads
+        )
+        baseline = _run(sessionmaker(bind=baseline_engine), threads, turns)
+        baseline_engine.dispose()
+
+        production_url = f"sqlite:///{Path(tmp) / 'production.db'}"
+        _setup(production_url)
+        engine, writer_engine = build_engines(production_url, settings)
+        production = _run(
+            sessionmaker(class_=RoutingSession, bind=engine, writer=writer_engine), threads, turns
+        )
+        engine.dispose()
+        writer_engine.dispose()
+
+    print(f"{threads} threads x {turns} turns, {SESSIONS} sessions")
+    print(f"{'mode':<12} {'seconds':>8} {'turns/s':>9} {'committed':>10} {'locked':>7}")
+    for name, (elapsed, committed, locked) in (("default", baseline), ("production", production)):
+        print(f"{name:<12} {elapsed:>8.2f} {committed / elapsed:>9.0f} {committed:>10} {locked:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Cold-start cost of the API process.
+
+Runs a fresh interpreter several times and reports the medians of:
+
+- import: `python -X importtime -c "import app.main"`, total and the
+  packages it spends the most time in (self time summed per top-level package);
+- startup: from interpreter start to the lifespan having run (the process
+  answers /health), then to /ready, i.e. the background warm-up finishing.
+
+Uses a temporary SQLite database.
+
+    python -m benchmarks.startup [RUNS]
+"""
+
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+TOP = 12
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+_STARTUP_SCRIPT = """
+import time
+t0 = time.perf_counter()
+from fastapi.testclient import TestClient
+from app.main import app
+imported = time.perf_counter()
+with TestClient(app) as client:
+    live = time.perf_counter()
+    assert client.get("/health").status_code == 200
+    while client.get("/ready").status_code != 200:
+        assert time.perf_counter() - t0 < 60, "not ready after 60s"
+        time.sleep(0.005)
+    ready = time.perf_counter()
+print(imported - t0, live - t0, ready - t0)
+"""
+
+
+def _env(db_dir: Path) -> dict[str, str]:
+    return {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{db_dir / 'startup.db'}",
+        "SECRET_KEY": os.environ.get("SECRET_KEY", "startup-benchmark"),
+        "MIGRATE_ON_STARTUP": "true",
+    }
+
+
+def import_times(env: dict[str, str]) -> tuple[float, dict[str, float]]:
+    """Return (total seconds, {top-level package: self seconds}) for one `import app.main`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    entries = [m.groups() for m in map(_IMPORTTIME_LINE.match, result.stderr.splitlines()) if m]
+    # Modules are listed before the module that imported them, so app.main's imports are
+    # the entries above it that are nested deeper; entries before those are interpreter startup.
+    end = next(i for i, (_, _, _, name) in enumerate(entries) if name == "app.main")
+    depth = len(entries[end][2])
+    start = end
+    while start > 0 and len(entries[start - 1][2]) > depth:
+        start -= 1
+    packages: dict[str, float] = defaultdict(float)
+    for self_us, _, _, name in entries[start:end + 1]:
+        packages[name.split(".")[0]] += int(self_us) / 1e6
+    return int(entries[end][1]) / 1e6, packages
+
+
+def startup_times(env: dict[str, str]) -> tuple[float, float, float]:
+    """Return seconds from interpreter start to (app imported, lifespan done, ready)."""
+    result = subprocess.run(
+        [sys.executable, "-c", _STARTUP_SCRIPT],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imported, live, ready = map(float, result.stdout.split()[-3:])
+    return imported, live, ready
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    with tempfile.TemporaryDirectory() as tmp:
+        env = _env(Path(tmp))
+        # Create the schema once so runs measure a normal start, not the first migration.
+        startup_times(env)
+
+        totals: list[float] = []
+        by_package: dict[str, list[float]] = defaultdict(list)
+        for _ in range(runs):
+            total, packages = import_times(env)
+            totals.append(total)
+            for name, seconds in packages.items():
+                by_package[name].append(seconds)
+        starts = [startup_times(env) for _ in range(runs)]
+
+    print(f"import app.main: {statistics.median(totals) * 1000:.0f}ms (median of {runs})")
+    slowest = sorted(by_package.items(), key=lambda kv: statistics.median(kv[1]), reverse=True)[:TOP]
+    for name, seconds in slowest:
+        print(f"  {name:<24} {statistics.median(seconds) * 1000:>6.0f}ms")
+    for label, index in (("app imported", 0), ("serving /health", 1), ("ready", 2)):
+        print(f"{label + ':':<17} {statistics.median(s[index] for s in starts) * 1000:>6.0f}ms after interpreter start")
+
+
+if __name__ == "__main__":
+    main()
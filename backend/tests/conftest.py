@@ -0,0 +1,12 @@
+"""Test settings: a throwaway SQLite database, set before app.database creates its engines."""
+
+import os
+import tempfile
+from pathlib import Path
+
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(tempfile.mkdtemp()) / 'test.db'}"
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ["PROJECT_EVENTS_POLL_INTERVAL_SECONDS"] = "0.1"
+os.environ["PROJECT_EVENTS_HEARTBEAT_SECONDS"] = "0.1"
+# A write stuck behind the single SQLite writer fails the test in seconds instead of 30.
+os.environ["SQLITE_WRITER_QUEUE_TIMEOUT_SECONDS"] = "2"
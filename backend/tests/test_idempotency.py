@@ -0,0 +1,56 @@
+"""Idempotency-Key handling of requests that fail."""
+
+import time
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import update
+
+from app.database import SessionLocal, engine
+from app.migrations import run_migrations
+from app.models.user import User, UserRole
+from app.services.idempotency import run_idempotent
+
+
+class _Response(BaseModel):
+    ok: bool
+
+
+def _create_user() -> uuid.UUID:
+    run_migrations(engine)
+    db = SessionLocal()
+    try:
+        user = User(email=f"{uuid.uuid4().hex}@example.com", password_hash="x", name="Stakeholder", role=UserRole.STAKEHOLDER)
+        db.add(user)
+        db.commit()
+        return user.id
+    finally:
+        db.close()
+
+
+def test_failed_request_with_key_releases_its_claim_without_waiting_on_the_writer():
+    user_id = _create_user()
+    attempts = []
+
+    def fail_after_writing(db) -> _Response:
+        # Like a handler that wrote before rejecting the request: the request's
+        # transaction now holds the single SQLite writer connection.
+        attempts.append(1)
+        db.execute(update(User).where(User.id == user_id).values(name="changed"))
+        raise HTTPException(status_code=400, detail="No pending summary to approve")
+
+    for _ in range(2):
+        db = SessionLocal()
+        try:
+            started = time.monotonic()
+            with pytest.raises(HTTPException) as raised:
+                run_idempotent(db, user_id, "POST /test", "key-1", "{}", _Response, lambda: fail_after_writing(db))
+            assert raised.value.status_code == 400
+            assert time.monotonic() - started < 1
+        finally:
+            db.close()
+
+    # The claim was released, so the retry ran again instead of getting 409.
+    assert len(attempts) == 2
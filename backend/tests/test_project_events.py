@@ -0,0 +1,65 @@
+"""Live delivery of project events to open SSE streams."""
+
+import asyncio
+import time
+import uuid
+from datetime import date
+
+from app.database import SessionLocal, engine
+from app.migrations import run_migrations
+from app.models.project import Project
+from app.models.user import User, UserRole
+from app.services.project_events import event_stream, record_event
+
+
+def _create_project() -> uuid.UUID:
+    run_migrations(engine)
+    db = SessionLocal()
+    try:
+        user = User(email=f"{uuid.uuid4().hex}@example.com", password_hash="x", name="SA", role=UserRole.SA)
+        db.add(user)
+        db.flush()
+        project = Project(name="P", scope="CRM", start_date=date(2026, 1, 1), end_date=date(2026, 2, 1), created_by=user.id)
+        db.add(project)
+        db.commit()
+        return project.id
+    finally:
+        db.close()
+
+
+def _record(project_id: uuid.UUID, type: str) -> None:
+    db = SessionLocal()
+    try:
+        record_event(db, project_id, type)
+        db.commit()
+    finally:
+        db.close()
+
+
+async def _next_event_type(stream, timeout: float) -> str:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        chunk = await anext(stream)
+        if chunk.startswith("id:"):
+            return chunk.split("\nevent: ", 1)[1].split("\n", 1)[0]
+    raise AssertionError("no event received")
+
+
+def test_event_sent_while_stream_is_open_is_delivered():
+    project_id = _create_project()
+    # Recorded just before the stream opens, so the first poll loads it while it is still
+    # settling; the retention cleanup runs in that same poll.
+    _record(project_id, "before_open")
+
+    async def scenario() -> list[str]:
+        stream = event_stream(project_id, None)
+        try:
+            assert (await anext(stream)).startswith("retry:")
+            received = [await _next_event_type(stream, timeout=5)]
+            await asyncio.to_thread(_record, project_id, "while_open")
+            received.append(await _next_event_type(stream, timeout=5))
+            return received
+        finally:
+            await stream.aclose()
+
+    assert asyncio.run(scenario()) == ["before_open", "while_open"]
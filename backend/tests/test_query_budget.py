@@ -0,0 +1,120 @@
+"""Per-endpoint SQL query budgets for the write paths.
+
+Drives the API in-process with the Claude calls stubbed out and counts the SQL
+statements each request issues; an endpoint over its budget fails with the
+statements it ran.
+"""
+
+import uuid
+from contextlib import contextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, event
+
+from app.database import engine
+from app.main import app
+from app.migrations import run_migrations
+from app.routers import projects as projects_router, sessions as sessions_router
+
+# Maximum statements per request (including auth lookup and COMMIT-time DML, such as the
+# one project_events outbox INSERT of a request that records dashboard events).
+BUDGETS = {
+    "register (invite)": 3,
+    "login": 1,
+    "add stakeholder": 6,
+    "get session (create)": 3,
+    "post_message BEGIN_SESSION": 5,
+    "post_message turn": 3,
+    "post_message next": 3,
+    # One more than the bare minimum: the pending summary is read with a SELECT before the
+    # break-offer LLM call and approved after it, so no write transaction spans the call.
+    "approve-summary": 5,
+    "approve-summary (final)": 7,
+    "project detail": 3,
+    "project list": 2,
+}
+
+_LLM_STUBS = {
+    "get_assistant_reply": lambda system_prompt, messages: "Tell me more.",
+    "detect_out_of_scope": lambda scope, message: None,
+    "generate_phase_summary": lambda phase_num, *args, **kwargs: f"Summary {phase_num}",
+    "generate_phase_break_offer_message": lambda **kwargs: "Take a break?",
+    "generate_final_report": lambda summaries, scope, flagged: "Report",
+    "generate_consolidated_report": lambda scope, data: "Consolidated",
+}
+
+
+@contextmanager
+def count_queries():
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    # On Engine, not one engine: RoutingSession sends flushes and DML to writer_engine.
+    event.listen(Engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture(scope="module")
+def statements_by_endpoint() -> dict[str, list[str]]:
+    """The statements of the costliest request per budget label, from one full discovery session."""
+    run_migrations(engine)
+    results: dict[str, list[str]] = {}
+
+    def call(label, method, url, **kwargs):
+        with count_queries() as statements:
+            response = getattr(client, method)(url, **kwargs)
+        assert response.status_code < 300, (label, response.status_code, response.text)
+        if len(statements) > len(results.get(label, [])):
+            results[label] = statements
+        return response.json()
+
+    sa_email = f"sa-{uuid.uuid4().hex}@example.com"
+    sh_email = f"sh-{uuid.uuid4().hex}@example.com"
+    with pytest.MonkeyPatch.context() as patch:
+        for module in (sessions_router, projects_router):
+            for name, fn in _LLM_STUBS.items():
+                if hasattr(module, name):
+                    patch.setattr(module, name, fn)
+
+        # Query counts don't depend on the response encoding; gzip keeps the test client
+        # independent of whichever brotli package happens to be installed.
+        with TestClient(app, headers={"Accept-Encoding": "gzip"}) as client:
+            client.post("/api/auth/register", json={"email": sa_email, "password": "pw", "name": "SA", "role": "SA"})
+            token = call("login", "post", "/api/auth/login", json={"email": sa_email, "password": "pw"})["access_token"]
+            sa = {"Authorization": f"Bearer {token}"}
+            project = client.post("/api/projects", headers=sa, json={
+                "name": "Budget", "scope": "CRM", "start_date": "2026-01-01", "end_date": "2026-03-01",
+            }).json()
+            invite = call("add stakeholder", "post", f"/api/projects/{project['id']}/users", headers=sa,
+                          json={"email": sh_email, "name": "Stakeholder"})
+            call("register (invite)", "post", "/api/auth/register", json={
+                "email": sh_email, "password": "pw", "name": "", "invite_token": invite["invite_token"],
+            })
+            token = client.post("/api/auth/login", json={"email": sh_email, "password": "pw"}).json()["access_token"]
+            sh = {"Authorization": f"Bearer {token}"}
+
+            call("get session (create)", "get", "/api/session", headers=sh)
+            call("post_message BEGIN_SESSION", "post", "/api/session/message", headers=sh, json={"message": "BEGIN_SESSION"})
+            for phase in range(1, 5):
+                call("post_message turn", "post", "/api/session/message", headers=sh, json={"message": "We use spreadsheets."})
+                call("post_message next", "post", "/api/session/message", headers=sh, json={"message": "next"})
+                label = "approve-summary (final)" if phase == 4 else "approve-summary"
+                call(label, "post", "/api/session/approve-summary", headers=sh, json={"action": "approve"})
+            call("project detail", "get", f"/api/projects/{project['id']}", headers=sa)
+            call("project list", "get", "/api/projects", headers=sa)
+    return results
+
+
+@pytest.mark.parametrize("label", BUDGETS)
+def test_endpoint_stays_within_query_budget(statements_by_endpoint, label):
+    statements = statements_by_endpoint[label]
+    assert len(statements) <= BUDGETS[label], (
+        f"{label}: {len(statements)} statements, budget {BUDGETS[label]}:\n"
+        + "\n".join(statement.split("\n", 1)[0][:120] for statement in statements)
+    )
@@ -0,0 +1,130 @@
+"""Query-plan regression checks for the hot lookups.
+
+Seeds a separate SQLite database with a large dataset, then asserts that the
+EXPLAIN plan of each hot query searches the expected index rather than scanning
+the table. Set QUERY_PLANS_DATABASE_URL to check a Postgres server instead (an
+empty scratch database).
+"""
+
+import os
+import re
+import tempfile
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, func, insert, select, text
+
+from app.migrations import run_migrations
+from app.models.project import Project, ProjectUser, ProjectUserStatus
+from app.models.session import PhaseSummary, PhaseSummaryStatus
+from app.models.user import User, UserRole
+
+NUM_SAS = 200
+PROJECTS_PER_SA = 5
+USERS_PER_PROJECT = 40
+
+# A table read without an index: "SCAN <table>" on SQLite, "Seq Scan" on Postgres.
+_FULL_SCAN = re.compile(r"\bSCAN \w+$|Seq Scan", re.M)
+
+
+def seed(engine) -> dict:
+    """Insert SAs, projects and stakeholders. Returns sample keys for the probe queries."""
+    now = datetime.now(timezone.utc)
+    users, projects, project_users = [], [], []
+    for i in range(NUM_SAS):
+        sa_id = uuid.uuid4()
+        users.append({
+            "id": sa_id, "email": f"sa{i}@example.com", "password_hash": "x",
+            "name": f"SA {i}", "role": UserRole.SA, "assessment_completed": False, "created_at": now,
+        })
+        for j in range(PROJECTS_PER_SA):
+            project_id = uuid.uuid4()
+            projects.append({
+                "id": project_id, "name": f"P{i}-{j}", "scope": "scope", "created_by": sa_id,
+                "start_date": date.today(), "end_date": date.today(), "created_at": now - timedelta(days=j),
+            })
+            for k in range(USERS_PER_PROJECT):
+                user_id = uuid.uuid4() if k % 2 else None
+                if user_id:
+                    users.append({
+                        "id": user_id, "email": f"u{i}-{j}-{k}@Example.com", "password_hash": "x",
+                        "name": "Stakeholder", "role": UserRole.STAKEHOLDER,
+                        "assessment_completed": True, "created_at": now,
+                    })
+                project_users.append({
+                    "id": uuid.uuid4(), "project_id": project_id, "user_id": user_id,
+                    "status": ProjectUserStatus.ACTIVE if user_id else ProjectUserStatus.INVITED,
+                    "invited_email": None if user_id else f"invite{i}-{j}-{k}@example.com",
+                    "invite_token": None if user_id else str(uuid.uuid4()), "invited_at": now,
+                })
+    with engine.begin() as conn:
+        conn.execute(insert(User), users)
+        conn.execute(insert(Project), projects)
+        conn.execute(insert(ProjectUser), project_users)
+        conn.execute(text("ANALYZE"))
+    sample = next(pu for pu in project_users if pu["user_id"])
+    return {
+        "project_id": sample["project_id"],
+        "user_id": sample["user_id"],
+        "sa_id": users[0]["id"],
+        "email": "u0-0-1@example.com",
+        "invited_email": "invite0-0-0@example.com",
+    }
+
+
+def hot_queries(keys: dict) -> dict:
+    """Statements mirroring the hot lookups in routers/sessions.py and services/project.py, by expected index."""
+    return {
+        "ix_project_users_user_id_status": select(ProjectUser).where(
+            ProjectUser.user_id == keys["user_id"],
+            ProjectUser.status.in_([ProjectUserStatus.ACTIVE, ProjectUserStatus.COMPLETED]),
+        ),
+        "ix_project_users_project_id_user_id": select(ProjectUser).where(
+            ProjectUser.project_id == keys["project_id"],
+            ProjectUser.user_id == keys["user_id"],
+        ),
+        "ix_projects_created_by_created_at": select(Project)
+        .where(Project.created_by == keys["sa_id"])
+        .order_by(Project.created_at.desc()),
+        "ix_users_email_lower": select(User).where(
+            func.lower(User.email) == keys["email"]
+        ),
+        "ix_project_users_project_id_invited_email_lower": select(ProjectUser).where(
+            ProjectUser.project_id == keys["project_id"],
+            func.lower(ProjectUser.invited_email) == keys["invited_email"],
+        ),
+        "ix_phase_summaries_session_id_status_phase": select(PhaseSummary.phase).where(
+            PhaseSummary.session_id == uuid.uuid4(),
+            PhaseSummary.status == PhaseSummaryStatus.APPROVED,
+        ),
+    }
+
+
+def explain(conn, stmt) -> str:
+    compiled = stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+    prefix = "EXPLAIN QUERY PLAN" if conn.dialect.name == "sqlite" else "EXPLAIN"
+    rows = conn.execute(text(f"{prefix} {compiled}")).fetchall()
+    return "\n".join(" ".join(str(c) for c in row) for row in rows)
+
+
+@pytest.fixture(scope="module")
+def plans() -> dict[str, str]:
+    """EXPLAIN output of each hot query against the seeded database, by expected index."""
+    url = os.environ.get("QUERY_PLANS_DATABASE_URL") or f"sqlite:///{Path(tempfile.mkdtemp()) / 'query_plans.db'}"
+    engine = create_engine(url)
+    try:
+        run_migrations(engine)
+        keys = seed(engine)
+        with engine.connect() as conn:
+            return {index: explain(conn, stmt) for index, stmt in hot_queries(keys).items()}
+    finally:
+        engine.dispose()
+
+
+@pytest.mark.parametrize("index", list(hot_queries(dict.fromkeys(("project_id", "user_id", "sa_id", "email", "invited_email")))))
+def test_hot_query_uses_its_index(plans, index):
+    plan = plans[index]
+    assert index in plan, plan
+    assert not _FULL_SCAN.search(plan), plan
@@ -0,0 +1,46 @@
+"""Conditional session status transitions."""
+
+import uuid
+from datetime import date
+
+from sqlalchemy import update
+
+from app.database import SessionLocal, engine
+from app.migrations import run_migrations
+from app.models.project import Project, ProjectUser, ProjectUserStatus
+from app.models.session import DiscoverySession, SessionStatus
+from app.models.user import User, UserRole
+from app.services.project import transition_session_status
+
+
+def test_lost_transition_leaves_the_status_another_request_set():
+    run_migrations(engine)
+    db = SessionLocal()
+    try:
+        user = User(email=f"{uuid.uuid4().hex}@example.com", password_hash="x", name="SA", role=UserRole.SA)
+        db.add(user)
+        db.flush()
+        project = Project(name="P", scope="CRM", start_date=date(2026, 1, 1), end_date=date(2026, 2, 1), created_by=user.id)
+        db.add(project)
+        db.flush()
+        project_user = ProjectUser(project_id=project.id, user_id=user.id, status=ProjectUserStatus.ACTIVE)
+        db.add(project_user)
+        db.flush()
+        session = DiscoverySession(project_user_id=project_user.id)
+        db.add(session)
+        db.commit()
+
+        # A concurrent request completes the session after this one loaded it.
+        other = SessionLocal()
+        try:
+            other.execute(
+                update(DiscoverySession).where(DiscoverySession.id == session.id).values(status=SessionStatus.COMPLETED)
+            )
+            other.commit()
+        finally:
+            other.close()
+
+        assert not transition_session_status(db, session, project.id, SessionStatus.IN_PROGRESS)
+        assert session.status == SessionStatus.COMPLETED
+    finally:
+        db.close()